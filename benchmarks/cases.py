@@ -0,0 +1,264 @@
+"""Benchmarks of imports, the schema builder, execution, pubsub and the client DSL
+
+Schemas and data are synthetic and sized to make each operation take from
+microseconds to about a second.
+"""
+import asyncio
+import subprocess
+import sys
+from dataclasses import dataclass, field, make_dataclass
+from typing import Any, List, Optional, cast
+
+from graphql import print_ast
+
+from typegql import ID, Argument, ArgumentList, Connection, Schema
+from typegql.client.dsl import DSLSchema
+from typegql.pubsub import _PubSub
+
+from .suite import benchmark
+
+IMPORTS = {
+    "python": "pass",
+    "typegql": "import typegql",
+    "types": "from typegql import ID, Argument, Connection",
+    "dsl": "from typegql.client.dsl import DSLSchema",
+    "schema": "from typegql import Schema",
+}
+
+for name, statement in IMPORTS.items():
+
+    @benchmark(f"import[{name}]")
+    def setup_import(statement=statement):
+        """A fresh interpreter running `statement`, `python` being the reference"""
+        command = [sys.executable, "-c", statement]
+        return lambda: subprocess.run(command, check=True)
+
+
+def build_schema(size: int) -> type:
+    """The `Query` of `size` dataclasses, each one holding the previous one"""
+    previous: Optional[type] = None
+    fields: List[Any] = []
+    for index in range(size):
+        attributes: List[Any] = [("id", int), ("name", str), ("value", float)]
+        if previous is not None:
+            attributes.append(("child", Optional[previous], field(default=None)))
+        previous = make_dataclass(f"Type{index}", attributes)
+        fields.append((f"type_{index}", Optional[previous], field(default=None)))
+    return make_dataclass("Query", fields)
+
+
+for size in (10, 100, 1000):
+
+    @benchmark(f"schema.build[{size}]")
+    def setup_build(size=size):
+        query = build_schema(size)
+        return lambda: Schema(query)
+
+
+for size in (10, 100):
+
+    @benchmark(f"schema.build_shared[{size}]")
+    def setup_build_shared(size=size):
+        """`size` list and connection fields of the same types"""
+        fields: List[Any] = []
+        for index in range(size):
+            fields.append((f"list_{index}", Optional[List[Flat]], field(default=None)))
+            fields.append(
+                (f"connection_{index}", Optional[Connection[Flat]], field(default=None))
+            )
+        query = make_dataclass("Query", fields)
+        return lambda: Schema(query)
+
+
+@dataclass
+class Flat:
+    id: ID
+    name: str
+    price: float
+    stock: int
+    active: bool
+    sku: str
+    weight: float
+    rating: float
+    views: int
+    category: str
+
+
+FLAT = [
+    Flat(
+        cast(ID, i), f"item {i}", i * 1.5, i, True, f"sku-{i}", 0.5, 4.5, i * 3, "books"
+    )
+    for i in range(1000)
+]
+
+Wide = make_dataclass("Wide", [(f"field_{i}", int) for i in range(100)])
+WIDE = [Wide(*range(100)) for _ in range(100)]
+
+
+@dataclass
+class Node:
+    id: int
+    children: List["Node"]
+
+
+def tree(depth: int, counter: List[int]) -> Node:
+    counter[0] += 1
+    children = [tree(depth - 1, counter) for _ in range(2)] if depth else []
+    return Node(counter[0], children)
+
+
+TREE = tree(9, [0])
+
+
+@dataclass
+class Priced:
+    id: int
+    price: float
+    score: Optional[float] = field(
+        default=None,
+        metadata={
+            "arguments": [
+                Argument[float](name="min_price"),
+                Argument[float](name="max_price"),
+                Argument[float](name="scale_factor"),
+                Argument[int](name="round_digits"),
+                Argument[bool](name="include_tax"),
+                Argument[str](name="currency_code"),
+                ArgumentList[int](name="bonus_points"),
+                ArgumentList[str](name="tag_names"),
+            ]
+        },
+    )
+
+    def resolve_score(self, info, scale_factor=1.0, round_digits=2, **kwargs):
+        return round(self.price * scale_factor, round_digits)
+
+
+PRICED = [Priced(i, i * 1.5) for i in range(500)]
+
+
+@dataclass(init=False)
+class Query:
+    flat: List[Flat]
+    wide: List[Wide]  # type: ignore
+    tree: Node
+    priced: List[Priced]
+    connection: Connection[Flat]
+
+    def resolve_flat(self, info):
+        return FLAT
+
+    def resolve_wide(self, info):
+        return WIDE
+
+    def resolve_tree(self, info):
+        return TREE
+
+    def resolve_priced(self, info):
+        return PRICED
+
+    def resolve_connection(self, info, first=None, **kwargs):
+        items = FLAT[:first]
+        return {
+            "edges": [{"node": item, "cursor": str(item.id)} for item in items],
+            "page_info": {"start_cursor": "0", "end_cursor": str(len(items) - 1)},
+        }
+
+
+FLAT_FIELDS = "id name price stock active sku weight rating views category"
+
+
+def deep_selection(depth: int) -> str:
+    selection = "id"
+    for _ in range(depth):
+        selection = f"id children {{ {selection} }}"
+    return selection
+
+
+QUERIES = {
+    "flat": f"query {{ flat {{ {FLAT_FIELDS} }} }}",
+    "wide": "query { wide { %s } }" % " ".join(f"field{i}" for i in range(100)),
+    "deep": f"query {{ tree {{ {deep_selection(9)} }} }}",
+    "connection": f"""
+        query {{
+          connection(first: 1000) {{
+            edges {{ cursor node {{ {FLAT_FIELDS} }} }}
+            pageInfo {{ startCursor endCursor }}
+          }}
+        }}
+    """,
+    "arguments": """
+        query Score($scale: Float, $tags: [String]) {
+          priced {
+            id
+            score(minPrice: 1, maxPrice: 1000, scaleFactor: $scale, roundDigits: 3,
+                  includeTax: true, currencyCode: "EUR", bonusPoints: [1, 2, 3],
+                  tagNames: $tags)
+          }
+        }
+    """,
+}
+VARIABLES = {"arguments": {"scale": 1.1, "tags": ["a", "b"]}}
+
+for name, text in QUERIES.items():
+
+    @benchmark(f"schema.run[{name}]")
+    def setup_run(text=text, variables=VARIABLES.get(name)):
+        schema = Schema(Query)
+        return lambda: schema.run(text, variables=variables)
+
+
+for name, text in QUERIES.items():
+
+    @benchmark(f"schema.compile[{name}]")
+    def setup_compile(text=text, variables=VARIABLES.get(name)):
+        compiled = Schema(Query).compile(text)
+        return lambda: compiled(variables=variables)
+
+
+for subscribers in (1000, 10000):
+
+    @benchmark(f"pubsub.fanout[{subscribers}]")
+    async def setup_fanout(subscribers=subscribers):
+        pubsub = _PubSub()
+        iterators = [pubsub.subscribe("books") for _ in range(subscribers)]
+
+        async def fanout():
+            pubsub.publish("books", {"title": "The Hobbit"})
+            await asyncio.gather(*[iterator.__anext__() for iterator in iterators])
+
+        return fanout
+
+
+def library_schema() -> Schema:
+    from examples.library.mutation import Mutation
+    from examples.library.query import Query as LibraryQuery
+
+    return Schema(LibraryQuery, mutation=Mutation)
+
+
+def library_document(dsl: DSLSchema):
+    book = [dsl.Book.id, dsl.Book.title, dsl.Book.published]
+    return dsl.query(
+        dsl.Query.books(for_author_name="J.R.R. Tolkien").select(*book),
+        dsl.Query.books_alias.select(*book),
+        dsl.Query.authors.select(
+            dsl.Author.id, dsl.Author.name, dsl.Author.books.select(*book)
+        ),
+        dsl.Query.books_connection(for_authors=["1", "2"], first=10).select(
+            dsl.BookConnection.total_count,
+            dsl.BookConnection.edges.select(dsl.BookEdge.node.select(*book)),
+        ),
+    )
+
+
+@benchmark("dsl.document")
+def setup_dsl_document():
+    dsl = DSLSchema(library_schema())
+    return lambda: library_document(dsl)
+
+
+@benchmark("dsl.print_ast")
+def setup_dsl_print_ast():
+    document = library_document(DSLSchema(library_schema()))
+    return lambda: print_ast(document)
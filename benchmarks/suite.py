@@ -0,0 +1,174 @@
+"""Runs the registered benchmarks and compares them to a stored baseline
+
+Run with `python -m benchmarks`, see `--help` for the options.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import time
+from inspect import isawaitable
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+Operation = Callable[[], Any]
+Setup = Callable[[], Union[Operation, Awaitable[Operation]]]
+
+BASELINE = Path(__file__).parent / "baseline.json"
+
+CASES: Dict[str, Setup] = {}
+
+
+def benchmark(name: str) -> Callable[[Setup], Setup]:
+    """Register a benchmark, whose setup returns the operation to time
+
+    The setup runs once, in the event loop, and may be a coroutine function.
+    The operation is called repeatedly and may return an awaitable.
+    """
+
+    def register(setup: Setup) -> Setup:
+        if name in CASES:
+            raise ValueError(f"Duplicate benchmark {name!r}")
+        CASES[name] = setup
+        return setup
+
+    return register
+
+
+async def call(operation: Operation) -> Any:
+    result = operation()
+    if isawaitable(result):
+        result = await result
+    errors = getattr(result, "errors", None)
+    assert not errors, errors
+    return result
+
+
+async def measure(operation: Operation, rounds: int, min_time: float) -> float:
+    """Best time of one call over `rounds`, in seconds
+
+    Each round repeats the operation until it runs for at least `min_time`.
+    """
+    await call(operation)
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            await call(operation)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2 if elapsed == 0 else max(2, int(min_time / elapsed) + 1)
+    best = elapsed / number
+    for _ in range(rounds - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            await call(operation)
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+async def run(
+    names: List[str], rounds: int, min_time: float
+) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for name in names:
+        operation: Any = CASES[name]()
+        if isawaitable(operation):
+            operation = await operation
+        seconds = await measure(operation, rounds, min_time)
+        results[name] = {"seconds": seconds}
+        print(f"{name:<36} {seconds * 1000:12.4f} ms", flush=True)
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float,
+) -> List[Tuple[str, float]]:
+    """Print the change of every result, returning the regressions"""
+    regressions = []
+    print(f"\n{'benchmark':<36} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            print(f"{name:<36} {'-':>12} {result['seconds'] * 1000:12.4f}")
+            continue
+        ratio = result["seconds"] / reference["seconds"]
+        flag = ""
+        if ratio > 1 + threshold:
+            regressions.append((name, ratio))
+            flag = "  REGRESSION"
+        print(
+            f"{name:<36} {reference['seconds'] * 1000:12.4f}"
+            f" {result['seconds'] * 1000:12.4f} {ratio - 1:+8.1%}{flag}"
+        )
+    return regressions
+
+
+def load_baseline(path: Path) -> Dict[str, Dict[str, float]]:
+    with path.open() as baseline:
+        return json.load(baseline)["results"]
+
+
+def save_baseline(path: Path, results: Dict[str, Dict[str, float]]) -> None:
+    data: Dict[str, Any] = {"results": results}
+    if path.exists():
+        data["results"] = {**load_baseline(path), **results}
+    data["machine"] = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.machine(),
+    }
+    with path.open("w") as baseline:
+        json.dump(data, baseline, indent=2, sort_keys=True)
+        baseline.write("\n")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from . import cases  # noqa: F401 registers the benchmarks
+
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("filters", nargs="*", help="run benchmarks containing these")
+    parser.add_argument("--list", action="store_true", help="list the benchmarks")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.05)
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument(
+        "--save", action="store_true", help="store the results in the baseline"
+    )
+    parser.add_argument(
+        "--compare", action="store_true", help="fail on regressions from the baseline"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="slowdown flagged as a regression, 0.1 for 10%% (default)",
+    )
+    args = parser.parse_args(argv)
+    names = [
+        name
+        for name in CASES
+        if not args.filters or any(text in name for text in args.filters)
+    ]
+    if args.list:
+        print("\n".join(names))
+        return 0
+    results = asyncio.get_event_loop().run_until_complete(
+        run(names, args.rounds, args.min_time)
+    )
+    if args.save:
+        save_baseline(args.baseline, results)
+    if args.compare:
+        regressions = compare(results, load_baseline(args.baseline), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regressions above {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
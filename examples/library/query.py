@@ -7,6 +7,8 @@ from graphql import GraphQLResolveInfo
 from examples.library import db
 from examples.library.types import Author, Book, Category, Gender
 from typegql import ID, Argument, ArgumentList, Connection
+from typegql.pagination import SequenceSource, paginate
+from typegql.selection import Lazy, selected_fields
 
 T = TypeVar("T")
 
@@ -34,7 +36,9 @@ class Query:
         metadata={"arguments": [Argument[str](name="for_author_name")]}
     )
     authors: List[Author]
-    categories: List[Category]
+    categories: List[Category] = field(
+        metadata={"cache": {"ttl": 30, "scope": "global", "max_entries": 100}}
+    )
 
     books_new_name: List[Book] = field(metadata={"alias": "books_alias"})
     books_connection: CustomConnection[Book] = field(
@@ -56,14 +60,6 @@ class Query:
             data = deepcopy(author)
             data["gender"] = Gender(data["gender"])
             authors.append(Author.load(**data))
-
-        for author in authors:
-            author.books = [
-                Book(**book)
-                for book in db.get("books")
-                if book["author_id"] == author.id
-            ]
-
         return authors
 
     async def resolve_books(
@@ -88,10 +84,12 @@ class Query:
 
     async def resolve_books_connection(
         self,
-        _: GraphQLResolveInfo,
+        info: GraphQLResolveInfo,
         for_authors: List[str] = None,
         first: int = None,
         last: int = None,
+        before: str = None,
+        after: str = None,
     ):
         if for_authors:
             data = [
@@ -101,31 +99,20 @@ class Query:
             ]
         else:
             data = [Book(**book) for book in db.get("books")]
-        total = len(data)
-        if first:
-            data = data[:first]
-        if last:
-            data = data[-last:]
-
-        return {
-            "total_count": total,
-            "page_info": {"has_next": False},
-            "edges": [{"node": node} for node in data],
-        }
+        source = SequenceSource(data, key=lambda book: (book.id,))
+        fields = selected_fields(info)
+        page = await paginate(source, first, last, before, after, fields=fields)
+        return {**page, "total_count": Lazy(len, data)}
 
-    async def resolve_authors_connection(self, info, first=None, last=None, **kwargs):
+    async def resolve_authors_connection(
+        self, info, first=None, last=None, before=None, after=None
+    ):
         data = [Author.load(**author) for author in db.get("authors")]
         for a in data:
             if a.gender:
                 a.gender = Gender(a.gender)  # Send gender as Enum not as string
 
-        total = len(data)
-        if first:
-            data = data[:first]
-        if last:
-            data = data[-last:]
-        return {
-            "total_count": total,
-            "page_info": {"has_next": False},
-            "edges": [{"node": node} for node in data],
-        }
+        source = SequenceSource(data, key=lambda author: (author.id,))
+        fields = selected_fields(info)
+        page = await paginate(source, first, last, before, after, fields=fields)
+        return {**page, "total_count": Lazy(len, data)}
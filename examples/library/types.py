@@ -4,7 +4,7 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from decimal import Decimal
 from enum import Enum
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from examples.library import db
 from typegql import ID
@@ -41,6 +41,16 @@ class Author:
         data = {"id": None, "password": "", **data}
         return cls(**data)
 
+    @classmethod
+    async def resolve_many_books(cls, authors: List[Author], info):
+        """Books of every author in a list, fetched at once"""
+        ids = {author.id for author in authors}
+        books: Dict[ID, List[Book]] = {}
+        for book in db.get("books"):
+            if book["author_id"] in ids:
+                books.setdefault(book["author_id"], []).append(Book(**book))
+        return [books.get(author.id, []) for author in authors]
+
 
 @dataclass
 class Category:
@@ -48,6 +58,20 @@ class Category:
     name: str
 
 
+async def load_authors(keys: List[int]) -> List[Author]:
+    """Load every author requested in the same tick with a single query"""
+    rows = {row["id"]: row for row in db.get("authors") if row["id"] in keys}
+    authors = []
+    for key in keys:
+        data = rows[key]
+        author = Author.load(**data)
+        author.gender = Gender(author.gender)
+        if "geo" in data:
+            author.geo = GeoLocation(**data.get("geo"))
+        authors.append(author)
+    return authors
+
+
 @dataclass
 class Book:
     """A book... for reading :|"""
@@ -57,7 +81,12 @@ class Book:
     title: str
     author: Optional[Author] = field(
         default=None,
-        metadata={"description": "The author of this book", "readonly": True},
+        metadata={
+            "description": "The author of this book",
+            "readonly": True,
+            "batch": load_authors,
+            "batch_key": "author_id",
+        },
     )
     categories: Optional[List[Category]] = None
     published: Optional[datetime] = None
@@ -66,15 +95,6 @@ class Book:
     def __post_init__(self):
         self.published = datetime.strptime(self.published, "%Y-%m-%d %H:%M:%S")
 
-    async def resolve_author(self, info):
-        data = filter(lambda x: x["id"] == self.author_id, db.get("authors"))
-        data = next(data)
-        author = Author.load(**data)
-        author.gender = Gender(author.gender)
-        if "geo" in data:
-            author.geo = GeoLocation(**data.get("geo"))
-        return author
-
     async def resolve_categories(self, selections, name=None):
         data = filter(lambda x: x["id"] in self.categories, db.get("categories"))
         for d in data:  # showcasing async generator
@@ -8,16 +8,27 @@ from graphql.pyutils import EventEmitter
 from sanic import Sanic
 from sanic.response import html
 from sanic.response import json as json_response
+from sanic.response import stream, text
 
 from examples.library.mutation import Mutation
 from examples.library.query import Query
 from examples.library.subscription import Subscription
 from examples.library.template import TEMPLATE
+from typegql.encoder import stream_result
+from typegql.incremental import MULTIPART_CONTENT_TYPE, multipart
+from typegql.metrics import Metrics
 from typegql.schema import Schema
+from typegql.tracing import Tracer
 
 logger = logging.getLogger("sanic.error")
 app = Sanic(name="TypeGQL")
-schema = Schema(query=Query, mutation=Mutation, subscription=Subscription)
+metrics = Metrics(slow_threshold=0.5)
+schema = Schema(
+    query=Query,
+    mutation=Mutation,
+    subscription=Subscription,
+    tracer=Tracer(sink=metrics, extension=False),
+)
 channels = {"books": EventEmitter()}
 
 
@@ -26,25 +37,49 @@ async def graphiql(request):
     return html(TEMPLATE)
 
 
+@app.route("/metrics", methods=["GET"])
+async def export_metrics(request):
+    return text(metrics.export(), content_type="text/plain; version=0.0.4")
+
+
 @app.route("/graphql", methods=["POST"])
 async def graphql(request):
+    if isinstance(request.json, list):
+        results = await schema.run_batch(request.json, context={"pubsub": channels})
+        return json_response([result.formatted for result in results])
     query = (
         request.args.get("query")
         if request.method.lower() == "get"
         else request.json.get("query")
     )
     operation_name = request.json.get("operationName")
+    extensions = request.json.get("extensions") or {}
+    persisted = extensions.get("persistedQuery") or {}
     try:
         result = await schema.run(
-            query, operation=operation_name, context={"pubsub": channels}
+            query,
+            operation=operation_name,
+            context={"pubsub": channels},
+            query_hash=persisted.get("sha256Hash"),
         )
     except GraphQLError as e:
         logger.exception(e)
         return json_response({"errors": [e.formatted]})
+    if not isinstance(result, ExecutionResult):
+
+        async def write_parts(response):
+            async for part in multipart(result):
+                await response.write(part)
+
+        return stream(write_parts, content_type=MULTIPART_CONTENT_TYPE)
     if result.errors:
         logger.exception(result.errors)
-        return json_response({"errors": [e.formatted for e in result.errors]})
-    return json_response({"data": result.data})
+
+    async def write(response):
+        async for chunk in stream_result(result):
+            await response.write(chunk)
+
+    return stream(write, content_type="application/json")
 
 
 @app.websocket("/graphql")
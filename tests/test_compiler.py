@@ -0,0 +1,87 @@
+from dataclasses import dataclass
+from typing import List, Optional
+
+from graphql import GraphQLError
+from pytest import raises
+
+QUERIES = [
+    """
+    query Authors {
+      authors {
+        id
+        name
+        gender
+        geo { latitude longitude }
+        books { title published author { name } }
+      }
+    }
+    """,
+    """
+    query BooksConnection($authors: [ID], $withCount: Boolean!) {
+      booksConnection(forAuthors: $authors, first: 2) {
+        totalCount @include(if: $withCount)
+        edges { node { ...BookFields } }
+      }
+    }
+    fragment BookFields on BookNode { id title tags }
+    """,
+    """
+    query {
+      booksAlias { title }
+      first: books(forAuthorName: "J.R.R. Tolkien") { title }
+    }
+    """,
+]
+
+
+async def test__compiled_query_matches_run__ok(schema):
+    variables = {"authors": ["MQ=="], "withCount": True}
+    for query in QUERIES:
+        compiled = schema.compile(query)
+        for values in (variables, {**variables, "withCount": False}):
+            expected = await schema.run(query, variables=values)
+            result = await compiled(variables=values)
+            assert result.errors is None
+            assert result == expected
+
+
+async def test__compiled_query_variables__error(schema):
+    query = QUERIES[1]
+    expected = await schema.run(query, variables={"authors": ["MQ=="]})
+    result = await schema.compile(query)(variables={"authors": ["MQ=="]})
+    assert result.data is expected.data is None
+    assert [e.message for e in result.errors] == [e.message for e in expected.errors]
+    assert result.extensions == expected.extensions
+    assert result.extensions["cost"]
+
+
+async def test__compiled_query_errors__ok(schema_type):
+    @dataclass
+    class Item:
+        name: str
+
+    @dataclass(init=False)
+    class Query:
+        item: Optional[Item]
+        items: Optional[List[Item]]
+
+        def resolve_item(self, info):
+            return Item(name=None)
+
+        async def resolve_items(self, info):
+            raise ValueError("no items")
+
+    schema = schema_type(Query)
+    query = "query { item { name } items { name } }"
+    expected = await schema.run(query)
+    result = await schema.compile(query)()
+    assert result.data == expected.data == {"item": None, "items": None}
+    assert [e.message for e in result.errors] == [e.message for e in expected.errors]
+    assert [e.path for e in result.errors] == [e.path for e in expected.errors]
+
+
+async def test__compile_invalid_query__error(schema):
+    with raises(GraphQLError):
+        schema.compile("query { unknownField }")
+    with raises(GraphQLError):
+        schema.compile("query A { authors { id } } query B { books { id } }")
@@ -0,0 +1,79 @@
+from dataclasses import dataclass, field
+from typing import List
+
+from examples.library.mutation import Mutation
+from examples.library.query import Query
+from typegql import Argument
+
+QUERY = """
+query Authors($first: Int = 2) {
+    authorsConnection(first: $first) {
+        edges { node { name books { title } } }
+    }
+}
+"""
+
+
+async def test__query_cost__ok(schema):
+    result = await schema.run(QUERY)
+    assert result.errors is None
+    assert result.extensions == {"cost": {"depth": 5, "cost": 7}}
+
+    result = await schema.run(QUERY, variables={"first": 10})
+    assert result.extensions == {"cost": {"depth": 5, "cost": 31}}
+
+    result = await schema.run(QUERY, variables={"first": 10})
+    assert result.extensions == {"cost": {"depth": 5, "cost": 31}}
+    assert schema.cost.plans.stats()["hits"] == 2
+    assert len(schema.cost.plans) == 1
+
+
+async def test__query_cost_limits__invalid(schema_type):
+    schema = schema_type(Query, mutation=Mutation, max_depth=4)
+    result = await schema.run(QUERY)
+    assert result.data is None
+    assert result.errors[0].message == "Query depth 5 exceeds the maximum depth of 4"
+    assert result.errors[0].extensions == {"code": "QUERY_TOO_COMPLEX"}
+
+    schema = schema_type(Query, mutation=Mutation, max_cost=10)
+    result = await schema.run(QUERY)
+    assert result.errors is None
+    result = await schema.run(QUERY, variables={"first": 10})
+    assert result.errors[0].message == "Query cost 31 exceeds the maximum cost of 10"
+
+    compiled = schema.compile(QUERY)
+    result = await compiled(variables={"first": 3})
+    assert result.errors is None
+    assert result.extensions == {"cost": {"depth": 5, "cost": 10}}
+    result = await compiled(variables={"first": 4})
+    assert result.data is None
+    assert result.extensions == {"cost": {"depth": 5, "cost": 13}}
+
+
+async def test__query_cost_metadata__ok(schema_type):
+    @dataclass
+    class Item:
+        name: str
+        price: int = field(default=0, metadata={"cost": 5})
+
+    @dataclass(init=False)
+    class Query:
+        items: List[Item] = field(
+            metadata={
+                "cost": 2,
+                "arguments": [Argument[int](name="page_size")],
+                "multipliers": ["page_size"],
+            }
+        )
+
+        def resolve_items(self, info, page_size=1):
+            return [Item(str(i)) for i in range(page_size)]
+
+    schema = schema_type(query=Query)
+    result = await schema.run(
+        """
+        query { items(pageSize: 3) { name price } __schema { types { name } } }
+        """
+    )
+    assert result.errors is None
+    assert result.extensions == {"cost": {"depth": 2, "cost": 17}}
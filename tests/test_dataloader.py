@@ -0,0 +1,172 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import List
+
+import pytest
+
+from examples.library.types import load_authors
+from typegql import InputArgument
+from typegql.dataloader import DataLoader, Loaders, get_loaders
+
+
+class Batches:
+    def __init__(self):
+        self.calls = []
+
+    async def __call__(self, keys, **kwargs):
+        self.calls.append((keys, kwargs))
+        return [
+            ValueError(key) if key < 0 else (key, kwargs.get("scale", 1) * key)
+            for key in keys
+        ]
+
+
+async def test__dataloader__batches_one_tick():
+    batch = Batches()
+    loader = DataLoader(batch)
+    results = await asyncio.gather(loader.load(1), loader.load(2), loader.load(1))
+    assert results == [(1, 1), (2, 2), (1, 1)]
+    assert batch.calls == [([1, 2], {})]
+
+    assert await loader.load(2) == (2, 2)
+    assert await loader.load_many([3, 1]) == [(3, 3), (1, 1)]
+    assert batch.calls == [([1, 2], {}), ([3], {})]
+
+
+async def test__dataloader__errors():
+    batch = Batches()
+    loader = DataLoader(batch)
+    first, second = loader.load(-1), loader.load(1)
+    with pytest.raises(ValueError):
+        await first
+    assert await second == (1, 1)
+
+    async def broken(keys):
+        return keys[:1]
+
+    loader = DataLoader(broken)
+    with pytest.raises(TypeError):
+        await asyncio.gather(loader.load(1), loader.load(2))
+    assert not loader.futures
+
+
+async def test__dataloader__max_batch_size_mapping():
+    calls = []
+
+    async def batch(keys):
+        calls.append(keys)
+        return {key: str(key) for key in keys}
+
+    loader = DataLoader(batch, max_batch_size=2)
+    assert await loader.load_many([1, 2, 3]) == ["1", "2", "3"]
+    assert calls == [[1, 2], [3]]
+
+
+async def test__loaders__ok():
+    batch = Batches()
+    loaders = Loaders()
+    assert loaders.get(batch) is loaders.get(batch)
+    assert loaders.get(batch, scale=2) is not loaders.get(batch)
+    assert await loaders.load(batch, 3, scale=2) == (3, 6)
+
+    context = {}
+    assert get_loaders(context) is context["loaders"]
+    with pytest.raises(TypeError):
+        get_loaders(None)
+
+
+async def test__batch_field__ok(schema):
+    query = """
+    query {
+        books { title author { name } }
+    }
+    """
+    context = {}
+    result = await schema.run(query, context=context)
+    assert result.errors is None
+    names = [book["author"]["name"] for book in result.data["books"]]
+    assert names == ["J.R.R. Tolkien", "J.R.R. Tolkien", "Christopher Hitchens"]
+    loader = get_loaders(context).get(load_authors)
+    assert loader.batches == 1
+    assert list(loader.futures) == [1, 2]
+
+
+async def test__input_object_arguments__ok(schema_type):
+    calls = []
+
+    @dataclass
+    class Filter:
+        tags: List[str]
+
+        @classmethod
+        def load(cls, **data):
+            return cls(**data)
+
+    async def load_counts(keys, filter=None):
+        calls.append(("batch", keys))
+        return [len(filter.tags) * key for key in keys]
+
+    @dataclass
+    class Item:
+        value: int
+        count: int = field(
+            default=0,
+            metadata={
+                "arguments": [InputArgument[Filter](name="filter")],
+                "batch": load_counts,
+                "batch_key": "value",
+            },
+        )
+        label: str = field(
+            default="",
+            metadata={
+                "arguments": [InputArgument[Filter](name="filter")],
+                "cache": {"scope": "request"},
+            },
+        )
+        tagged: bool = field(
+            default=False,
+            metadata={"arguments": [InputArgument[Filter](name="filter")]},
+        )
+
+        def resolve_label(self, info, filter):
+            calls.append(("label", self.value))
+            return ",".join(filter.tags)
+
+        @classmethod
+        def resolve_many_tagged(cls, items, info, filter):
+            calls.append(("many", [item.value for item in items]))
+            return [bool(filter.tags) for _ in items]
+
+    @dataclass(init=False)
+    class Query:
+        items: List[Item]
+
+        def resolve_items(self, info):
+            return [Item(1), Item(2)]
+
+    schema = schema_type(Query)
+    query = """
+    query {
+        items {
+            count(filter: {tags: ["a", "b"]})
+            label(filter: {tags: ["a", "b"]})
+            again: label(filter: {tags: ["a", "b"]})
+            tagged(filter: {tags: ["a"]})
+        }
+    }
+    """
+    result = await schema.run(query)
+    assert result.errors is None
+    assert result.data["items"][1] == {
+        "count": 4,
+        "label": "a,b",
+        "again": "a,b",
+        "tagged": True,
+    }
+    assert sorted(calls) == [
+        ("batch", [1, 2]),
+        ("label", 1),
+        ("label", 2),
+        ("many", [1, 2]),
+    ]
@@ -0,0 +1,28 @@
+from graphql import print_ast
+
+from typegql.client.dsl import DSLSchema
+
+
+async def test__schema_names__ok(schema):
+    names = schema.names
+    assert names.fields.to_python("Query", "booksAlias") == "books_alias"
+    assert names.fields.to_graphql("Query", "books_alias") == "booksAlias"
+    assert names.fields.to_python("BookConnection", "totalCount") == "total_count"
+    assert names.arguments.to_python(("Query", "books"), "forAuthorName") == (
+        "for_author_name"
+    )
+    assert names.inputs.to_python("BookInput", "authorId") == "author_id"
+
+
+async def test__dsl_query__ok(schema):
+    dsl = DSLSchema(schema)
+    query = dsl.Query.books(for_author_name="J.R.R. Tolkien").select(
+        dsl.Book.title, dsl.Book.published
+    )
+    document = print_ast(dsl.query(dsl.Query.books_alias.select(dsl.Book.id), query))
+    assert "booksAlias" in document
+    assert 'books(forAuthorName: "J.R.R. Tolkien")' in document
+
+    result = await schema.run(document)
+    assert result.errors is None
+    assert result.data["books"]
@@ -0,0 +1,47 @@
+import json
+
+from graphql import ExecutionResult, GraphQLError
+
+from typegql.encoder import JSONEncoder, encode_result, json_dumps, stream_result
+from typegql.execution import TGQLExecutionResult
+
+
+async def test__encoder__ok():
+    value = {
+        "a": [1, {"b": [], "c": "ț"}, [None, True]],
+        "d": {"e": 1.5},
+        "f": [],
+    }
+    chunks = list(JSONEncoder(chunk_size=8, backend=json_dumps).encode(value))
+    assert len(chunks) > 1
+    assert all(len(chunk) < 32 for chunk in chunks)
+    assert json.loads(b"".join(chunks)) == value
+
+
+async def test__encode_result__ok(schema):
+    result = await schema.run("query { authors { name books { title } } }")
+    encoded = b"".join(encode_result(result, chunk_size=16))
+    assert json.loads(encoded) == {
+        "data": result.data,
+        "extensions": result.extensions,
+    }
+
+    result = ExecutionResult(None, [GraphQLError("Boom")])
+    encoded = b"".join([chunk async for chunk in stream_result(result)])
+    assert json.loads(encoded) == {
+        "errors": [{"message": "Boom", "locations": None, "path": None}],
+        "data": None,
+    }
+    result = TGQLExecutionResult({"a": 1}, None, {"cost": 1})
+    assert (
+        b"".join(encode_result(result)) == b'{"data":{"a":1},"extensions":{"cost":1}}'
+    )
+
+
+async def test__encoder_nested_connection__chunked():
+    edges = [{"node": {"id": str(i), "title": "x" * 32}} for i in range(1000)]
+    value = {"data": {"books": {"edges": edges, "pageInfo": {"endCursor": None}}}}
+    chunks = list(JSONEncoder(chunk_size=1024).encode(value))
+    assert len(chunks) > 1
+    assert max(len(chunk) for chunk in chunks) < 2048
+    assert json.loads(b"".join(chunks)) == value
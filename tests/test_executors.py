@@ -0,0 +1,145 @@
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import List
+
+from pytest import raises
+
+from typegql import Argument
+from typegql.executors import Executors
+
+# Reached by the three thread resolvers only when they run concurrently
+BARRIER = threading.Barrier(3)
+
+
+@dataclass
+class Item:
+    id: int
+    thread: str = field(default="", metadata={"executor": "thread"})
+    inline: str = ""
+
+    def resolve_thread(self, info):
+        BARRIER.wait(timeout=5)
+        return threading.current_thread().name
+
+    def resolve_inline(self, info):
+        return threading.current_thread().name
+
+
+class SubItem(Item):
+    pass
+
+
+@dataclass(init=False)
+class Query:
+    items: List[Item]
+
+    def resolve_items(self, info):
+        return [Item(1), SubItem(2), Item(3)]
+
+
+@dataclass
+class Job:
+    id: int
+    pid: int = field(
+        default=0,
+        metadata={"executor": "process", "arguments": [Argument[float]("sleep")]},
+    )
+
+    def resolve_pid(self, info, sleep=0):
+        assert info.path == ["jobs", self.id, "pid"]
+        time.sleep(sleep)
+        return os.getpid()
+
+
+class SubJob(Job):
+    pass
+
+
+@dataclass(init=False)
+class Jobs:
+    jobs: List[Job]
+
+    def resolve_jobs(self, info):
+        return [Job(0), SubJob(1)]
+
+
+async def test__thread_executor__ok(schema_type):
+    executors = Executors(max_threads=3)
+    schema = schema_type(query=Query, executors=executors)
+    result = await schema.run("query { items { thread inline } }")
+    assert result.errors is None
+    main = threading.current_thread().name
+    for item in result.data["items"]:
+        assert item["thread"].startswith("typegql")
+        assert item["inline"] == main
+    assert len({item["thread"] for item in result.data["items"]}) == 3
+    assert executors.stats()["thread"]["calls"] == 3
+    executors.shutdown()
+
+
+async def test__default_executor__ok(schema_type):
+    schema = schema_type(query=Query, executor="thread")
+    result = await schema.run("query { items { inline } }")
+    assert result.data["items"][0]["inline"].startswith("typegql")
+    schema.executors.shutdown()
+
+
+async def test__executor__invalid(schema_type):
+    @dataclass(init=False)
+    class Async:
+        name: str = field(metadata={"executor": "thread"})
+
+        async def resolve_name(self, info):
+            return ""
+
+    with raises(TypeError):
+        schema_type(query=Async)
+
+    @dataclass(init=False)
+    class Unknown:
+        name: str = field(metadata={"executor": "gpu"})
+
+    with raises(ValueError):
+        schema_type(query=Unknown)
+
+
+async def test__process_executor__ok(schema_type):
+    executors = Executors(max_processes=2, timeout=0.5)
+    schema = schema_type(query=Jobs, executors=executors)
+    assert executors._processes is not None
+
+    result = await schema.run("query { jobs { pid } }")
+    assert result.errors is None
+    pids = {job["pid"] for job in result.data["jobs"]}
+    assert os.getpid() not in pids
+    assert executors.stats()["process"]["calls"] == 2
+
+    result = await schema.run("query { jobs { pid(sleep: 1) } }")
+    assert result.errors[0].message == ("Job.resolve_pid timed out after 0.5 seconds")
+    executors.shutdown()
+
+
+async def test__process_executor_pickle__invalid(schema_type):
+    @dataclass
+    class Local:
+        value: int = field(default=0, metadata={"executor": "process"})
+
+        def resolve_value(self, info):
+            return 1
+
+    @dataclass(init=False)
+    class Query:
+        local: Local
+
+        def resolve_local(self, info):
+            return Local()
+
+    executors = Executors(max_processes=1)
+    schema = schema_type(query=Query, executors=executors)
+    result = await schema.run("query { local { value } }")
+    assert result.errors[0].message.startswith(
+        "Can not send test__process_executor_pickle__invalid.<locals>"
+    )
+    executors.shutdown()
@@ -0,0 +1,46 @@
+import subprocess
+import sys
+
+import typegql
+
+
+def imported_modules(statement: str) -> set:
+    output = subprocess.run(
+        [sys.executable, "-c", f"{statement}; import sys; print(*sys.modules)"],
+        check=True,
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+    ).stdout
+    return set(output.split())
+
+
+async def test__import_typegql__lazy():
+    modules = imported_modules("import typegql")
+    assert "graphql" not in modules
+    assert "typegql.builder" not in modules
+    assert "typegql.schema" not in modules
+
+    modules = imported_modules("from typegql import Argument, RequiredArgument")
+    assert "graphql" not in modules
+    assert "typegql.builder.base" not in modules
+
+    modules = imported_modules("from typegql.client.dsl import DSLSchema")
+    assert "aiohttp" not in modules
+    assert "typegql.schema" not in modules
+
+
+async def test__lazy_exports__ok():
+    from typegql.builder import Builder
+    from typegql.builder.builder import Builder as BuilderClass
+    from typegql.schema import Schema
+
+    assert typegql.Schema is Schema
+    assert Builder is BuilderClass
+    assert set(typegql.__all__) <= set(dir(typegql))
+    assert "Schema" in vars(typegql)
+    try:
+        typegql.Missing
+    except AttributeError as error:
+        assert str(error) == "module 'typegql' has no attribute 'Missing'"
+    else:  # pragma: no cover
+        assert False
@@ -0,0 +1,166 @@
+import asyncio
+import json
+from dataclasses import dataclass, field
+from typing import List
+
+from graphql import ExecutionResult
+
+from typegql import ID
+from typegql.incremental import multipart
+
+
+async def payloads(result):
+    return [payload.formatted async for payload in result]
+
+
+async def test__defer__ok(schema):
+    query = """
+    query {
+        authors {
+            name
+            ... @defer(label: "books") { books { title } }
+        }
+    }
+    """
+    result = await schema.run(query)
+    assert not isinstance(result, ExecutionResult)
+    initial, *patches = await payloads(result)
+    assert initial["data"] == {
+        "authors": [{"name": "J.R.R. Tolkien"}, {"name": "Christopher Hitchens"}]
+    }
+    assert initial["hasNext"]
+    assert [patch["path"] for patch in patches] == [["authors", 0], ["authors", 1]]
+    assert all(patch["label"] == "books" for patch in patches)
+    assert patches[1]["data"] == {"books": [{"title": "Mortality"}]}
+    assert [patch["hasNext"] for patch in patches] == [True, False]
+
+
+async def test__defer__disabled(schema):
+    query = """
+    query Authors($defer: Boolean!) {
+        authors { name ...Books @defer(if: $defer) }
+    }
+    fragment Books on Author { books { title } }
+    """
+    result = await schema.run(query, variables={"defer": False})
+    (payload,) = await payloads(result)
+    assert payload["data"]["authors"][1] == {
+        "name": "Christopher Hitchens",
+        "books": [{"title": "Mortality"}],
+    }
+    assert not payload["hasNext"]
+
+    compiled = schema.compile(query)
+    result = await compiled(variables={"defer": True})
+    assert isinstance(result, ExecutionResult)
+    assert result.data == payload["data"]
+
+
+async def test__stream__ok(schema):
+    query = "query { books @stream(initialCount: 1) { title } }"
+    initial, *patches = await payloads(await schema.run(query))
+    assert initial["data"] == {"books": [{"title": "Lord of the Rings"}]}
+    assert [patch["items"] for patch in patches] == [
+        [{"title": "The Hobbit"}],
+        [{"title": "Mortality"}],
+    ]
+    assert [patch["path"] for patch in patches] == [["books", 1], ["books", 2]]
+    assert not patches[-1]["hasNext"]
+
+    result = await schema.run("query { books @stream(initialCount: -1) { title } }")
+    (payload,) = await payloads(result)
+    assert payload["data"] is None
+    assert (
+        payload["errors"][0]["message"] == "initialCount must be a non-negative integer"
+    )
+
+
+async def test__defer__errors(schema_type):
+    @dataclass
+    class Item:
+        id: ID
+        name: str = field(default="", metadata={"description": "Fails for odd ids"})
+
+        def resolve_name(self, info):
+            if int(self.id) % 2:
+                raise ValueError(f"Item {self.id} has no name")
+            return f"item {self.id}"
+
+    @dataclass(init=False, repr=False)
+    class Query:
+        items: List[Item]
+
+        async def resolve_items(self, info):
+            return [Item(id=str(i)) for i in range(2)]
+
+    schema = schema_type(Query)
+    query = "query { items { id ... @defer { name } } }"
+    initial, *patches = await payloads(await schema.run(query))
+    assert "errors" not in initial
+    assert patches[0] == {
+        "data": {"name": "item 0"},
+        "path": ["items", 0],
+        "hasNext": True,
+    }
+    assert patches[1]["data"] == {"name": None}
+    assert patches[1]["errors"][0]["message"] == "Item 1 has no name"
+    assert patches[1]["errors"][0]["path"] == ["items", 1, "name"]
+
+
+async def test__multipart__ok(schema):
+    query = "query { books @stream { title } }"
+    body = b"".join([part async for part in multipart(await schema.run(query))])
+    assert body.startswith(b"\r\n---\r\n")
+    assert body.endswith(b"\r\n-----\r\n")
+    start, end = len(b"\r\n---\r\n"), -len(b"\r\n-----\r\n")
+    parts = body[start:end].split(b"\r\n---\r\n")
+    assert len(parts) == 4
+    headers, payload = parts[0].split(b"\r\n\r\n")
+    assert headers == b"Content-Type: application/json; charset=utf-8"
+    assert json.loads(payload)["data"] == {"books": []}
+
+
+async def test__stream_async_iterable__ok(schema_type):
+    @dataclass(init=False)
+    class Query:
+        numbers: List[int]
+
+        async def resolve_numbers(self, info):
+            for number in range(4):
+                yield number
+
+    schema = schema_type(Query)
+    query = "query { numbers @stream(initialCount: 2) }"
+    initial, *patches = await payloads(await schema.run(query))
+    assert initial["data"] == {"numbers": [0, 1]}
+    assert initial["hasNext"]
+    assert [patch["items"] for patch in patches] == [[2], [3]]
+    assert [patch["path"] for patch in patches] == [["numbers", 2], ["numbers", 3]]
+    assert [patch["hasNext"] for patch in patches] == [True, False]
+
+    query = "query { numbers @stream(initialCount: 4) }"
+    (payload,) = await payloads(await schema.run(query))
+    assert payload["data"] == {"numbers": [0, 1, 2, 3]}
+    assert not payload["hasNext"]
+
+
+async def test__stream_async_iterable__error(schema_type):
+    @dataclass(init=False)
+    class Query:
+        numbers: List[int]
+
+        async def resolve_numbers(self, info):
+            for number in (1, 2, 3):
+                yield number
+            raise ValueError("Boom")
+
+    schema = schema_type(Query)
+    result = await schema.run("query { numbers @stream(initialCount: 1) }")
+    initial, *patches = await asyncio.wait_for(payloads(result), timeout=1)
+    assert initial["data"] == {"numbers": [1]}
+    assert [patch["items"] for patch in patches] == [[2], [3], []]
+    assert [patch["hasNext"] for patch in patches] == [True, True, False]
+    assert "errors" not in patches[1]
+    (error,) = patches[2]["errors"]
+    assert error["message"] == "Boom"
+    assert error["path"] == patches[2]["path"] == ["numbers", 3]
@@ -0,0 +1,101 @@
+import logging
+from dataclasses import dataclass, field
+from typing import Optional
+
+from typegql import Argument
+from typegql.metrics import OTHER_OPERATION, Histogram, Metrics, normalize_query
+from typegql.tracing import Tracer
+
+
+async def test__histogram__ok():
+    histogram = Histogram([0.1, 1])
+    for value in (0.05, 0.1, 0.5, 3):
+        histogram.observe(value)
+    assert list(histogram.cumulative()) == [("0.1", 2), ("1.0", 3), ("+Inf", 4)]
+    assert histogram.sum == 3.65
+
+
+async def test__normalize_query__ok():
+    normalized, name = normalize_query(
+        'query Books {\n  book(id: 12) { title(lang: "en") }\n}'
+    )
+    assert normalized == 'query Books { book(id: 0) { title(lang: "") } }'
+    assert name == "Books"
+    assert normalize_query("{ broken") == ("{ broken", None)
+
+
+async def test__metrics__ok(schema_type, caplog):
+    @dataclass(init=False, repr=False)
+    class Query:
+        name: Optional[str] = field(
+            metadata={"arguments": [Argument[bool](name="fail")]}
+        )
+
+        def resolve_name(self, info, fail: bool = False):
+            if fail:
+                raise ValueError("Boom")
+            return "name"
+
+    metrics = Metrics(buckets=[1], slow_threshold=0)
+    schema = schema_type(Query, tracer=Tracer(sink=metrics, extension=False))
+    with caplog.at_level(logging.WARNING, logger="typegql.metrics"):
+        await schema.run("query Name { name }")
+        await schema.run("query Name {\n  name\n}")
+        await schema.run(
+            "query Fail($fail: Boolean) { name(fail: $fail) }",
+            variables={"fail": True},
+        )
+
+    assert metrics.fields[("Query", "name")].count == 3
+    assert metrics.field_errors == {("Query", "name"): 1}
+    assert [key.name for key in metrics.operations] == ["Name", "Fail"]
+    assert [histogram.count for histogram in metrics.operations.values()] == [2, 1]
+    (failed,) = metrics.operation_errors
+
+    slow = metrics.slow[-1]
+    assert slow["operation"] == "Fail"
+    assert slow["fingerprint"] == failed.fingerprint
+    assert slow["query"] == "query Fail($fail: Boolean) { name(fail: $fail) }"
+    assert slow["variables"] == {"fail": "bool"}
+    assert slow["fields"][0]["field"] == "Query.name"
+    assert slow["fields"][0]["calls"] == 1
+    assert len(caplog.records) == 3
+
+    exported = metrics.export()
+    assert "# TYPE typegql_field_duration_seconds histogram" in exported
+    assert (
+        'typegql_field_duration_seconds_bucket{type="Query",field="name",le="+Inf"} 3'
+        in exported
+    )
+    assert 'typegql_field_errors_total{type="Query",field="name"} 1' in exported
+    assert (
+        f'typegql_operation_errors_total{{name="Fail",fingerprint="{failed.fingerprint}"}} 1'
+        in exported
+    )
+    assert exported.endswith("\n")
+
+
+async def test__metrics_max_operations__ok(schema_type):
+    @dataclass(init=False)
+    class Query:
+        name: Optional[str] = field(
+            metadata={"arguments": [Argument[bool](name="fail")]}
+        )
+
+        def resolve_name(self, info, fail: bool = False):
+            if fail:
+                raise ValueError("Boom")
+            return "name"
+
+    metrics = Metrics(slow_threshold=None, max_operations=2)
+    schema = schema_type(Query, tracer=Tracer(sink=metrics, extension=False))
+    for index in range(5):
+        await schema.run(f"query Name{index} {{ name }}")
+    await schema.run("query Fail { name(fail: true) }")
+
+    assert [key.name for key in metrics.operations] == ["Name0", "Name1", "other"]
+    assert metrics.operations[OTHER_OPERATION].count == 4
+    assert metrics.operation_errors == {OTHER_OPERATION: 1}
+    assert 'operation_errors_total{name="other",fingerprint="other"} 1' in (
+        metrics.export()
+    )
@@ -0,0 +1,180 @@
+from dataclasses import dataclass
+from typing import cast
+
+from pytest import raises
+
+from typegql import ID, Connection, PageInfo
+from typegql.pagination import (
+    InvalidPagination,
+    SequenceSource,
+    decode_cursor,
+    encode_cursor,
+    paginate,
+)
+
+
+class CountingSource(SequenceSource):
+    def __init__(self, items, key):
+        super().__init__(items, key)
+        self.calls = []
+
+    async def fetch(self, after, before, limit, reverse):
+        self.calls.append((after, before, limit, reverse))
+        return await super().fetch(after, before, limit, reverse)
+
+
+def nodes(page):
+    return [edge["node"] for edge in page["edges"]]
+
+
+async def test__paginate_forward__ok():
+    source = CountingSource(range(10), key=lambda item: (item,))
+    page = await paginate(source, first=3)
+    assert nodes(page) == [0, 1, 2]
+    assert page["page_info"] == {
+        "start_cursor": encode_cursor((0,)),
+        "end_cursor": encode_cursor((2,)),
+        "has_next_page": True,
+        "has_previous_page": False,
+    }
+
+    page = await paginate(source, first=4, after=page["page_info"]["end_cursor"])
+    assert nodes(page) == [3, 4, 5, 6]
+    assert page["page_info"]["has_previous_page"]
+    assert source.calls[-1] == ((2,), None, 5, False)
+
+    page = await paginate(source, first=3, after=page["page_info"]["end_cursor"])
+    assert nodes(page) == [7, 8, 9]
+    assert not page["page_info"]["has_next_page"]
+
+
+async def test__paginate_backward__ok():
+    source = CountingSource(range(10), key=lambda item: (item,))
+    page = await paginate(source, last=3)
+    assert nodes(page) == [7, 8, 9]
+    assert page["page_info"]["has_previous_page"]
+    assert not page["page_info"]["has_next_page"]
+    assert source.calls[-1] == (None, None, 4, True)
+
+    page = await paginate(source, last=8, before=page["page_info"]["start_cursor"])
+    assert nodes(page) == [0, 1, 2, 3, 4, 5, 6]
+    assert not page["page_info"]["has_previous_page"]
+    assert page["page_info"]["has_next_page"]
+
+    after, before = encode_cursor((2,)), encode_cursor((6,))
+    page = await paginate(source, first=2, last=1, after=after, before=before)
+    assert nodes(page) == [4]
+    assert page["page_info"]["has_next_page"]
+    assert page["page_info"]["has_previous_page"]
+
+
+async def test__paginate_empty__ok():
+    page = await paginate(SequenceSource([], key=lambda item: (item,)), first=2)
+    assert page["edges"] == []
+    assert page["page_info"]["start_cursor"] is None
+    assert not page["page_info"]["has_next_page"]
+
+    source = CountingSource(range(10), key=lambda item: (item,))
+    page = await paginate(source, max_page_size=4)
+    assert nodes(page) == [0, 1, 2, 3]
+    assert page["page_info"]["has_next_page"]
+    assert source.calls[-1] == (None, None, 5, False)
+
+
+async def test__paginate__invalid():
+    source = SequenceSource(range(10), key=lambda item: (item,))
+    with raises(InvalidPagination, match="`first` must be a non-negative integer"):
+        await paginate(source, first=-1)
+    with raises(InvalidPagination, match="Invalid cursor"):
+        await paginate(source, after="not a cursor")
+    with raises(InvalidPagination, match="Invalid cursor"):
+        decode_cursor("e30=")  # an object, not a key
+    assert decode_cursor(encode_cursor(("a", 1))) == ("a", 1)
+    with raises(InvalidPagination, match="Invalid cursor"):
+        await paginate(source, first=1, after=encode_cursor(("x",)))
+
+
+async def test__paginate_before__has_next():
+    source = CountingSource(range(10), key=lambda item: (item,))
+    end = encode_cursor((10,))
+    page = await paginate(source, first=20, before=end)
+    assert len(nodes(page)) == 10
+    assert not page["page_info"]["has_next_page"]
+    page = await paginate(source, last=2, before=end)
+    assert nodes(page) == [8, 9]
+    assert not page["page_info"]["has_next_page"]
+
+    page = await paginate(source, first=20, before=encode_cursor((5,)))
+    assert nodes(page) == [0, 1, 2, 3, 4]
+    assert page["page_info"]["has_next_page"]
+    assert source.calls[-1] == ((4,), None, 1, False)
+
+
+async def test__connection_pages__ok(schema):
+    query = """
+    query Books($after: String) {
+      booksConnection(first: 2, after: $after) {
+        totalCount
+        edges { cursor node { title } }
+        pageInfo { hasNextPage hasPreviousPage startCursor endCursor }
+      }
+    }
+    """
+    result = await schema.run(query)
+    assert result.errors is None
+    connection = result.data["booksConnection"]
+    assert len(connection["edges"]) == 2
+    page_info = connection["pageInfo"]
+    assert page_info["hasNextPage"]
+    assert not page_info["hasPreviousPage"]
+    assert page_info["endCursor"] == connection["edges"][-1]["cursor"]
+
+    result = await schema.run(query, variables={"after": page_info["endCursor"]})
+    assert result.errors is None
+    connection = result.data["booksConnection"]
+    assert len(connection["edges"]) == connection["totalCount"] - 2
+    assert not connection["pageInfo"]["hasNextPage"]
+    assert connection["pageInfo"]["hasPreviousPage"]
+
+    end_cursor = connection["pageInfo"]["endCursor"]
+    result = await schema.run(query, variables={"after": end_cursor})
+    assert result.errors is None
+    connection = result.data["booksConnection"]
+    assert connection["edges"] == []
+    assert connection["pageInfo"]["startCursor"] is None
+    assert not connection["pageInfo"]["hasNextPage"]
+
+    result = await schema.run(query, variables={"after": "?"})
+    assert result.errors[0].message == "Invalid cursor '?'"
+    assert result.errors[0].extensions == {"code": "INVALID_PAGINATION"}
+
+
+async def test__page_info_defaults__ok(schema_type):
+    @dataclass
+    class Item:
+        id: ID
+
+    @dataclass(init=False)
+    class Query:
+        items: Connection[Item]
+        typed: Connection[Item]
+
+        def resolve_items(self, info, **kwargs):
+            page_info = {"start_cursor": "0", "end_cursor": "0"}
+            return {"edges": [{"node": Item(cast(ID, "0"))}], "page_info": page_info}
+
+        def resolve_typed(self, info, **kwargs):
+            return {"edges": [], "page_info": PageInfo("0", "0", has_next_page=True)}
+
+    schema = schema_type(Query)
+    page_info = "pageInfo { startCursor hasNextPage hasPreviousPage }"
+    result = await schema.run(
+        f"query {{ items {{ {page_info} }} typed {{ {page_info} }} }}"
+    )
+    assert result.errors is None
+    assert result.data["items"]["pageInfo"] == {
+        "startCursor": "0",
+        "hasNextPage": False,
+        "hasPreviousPage": False,
+    }
+    assert result.data["typed"]["pageInfo"]["hasNextPage"]
@@ -1,8 +1,12 @@
-from dataclasses import dataclass
+import asyncio
+from dataclasses import dataclass, field
+from typing import List
 
 from graphql import ExecutionResult, GraphQLError
 from pytest import raises
 
+from typegql import Argument
+
 
 async def test__books_connection__ok(schema):
     query = """
@@ -119,3 +123,256 @@ async def test__execution_handles_exceptions__ok(schema_type):
     assert isinstance(result, ExecutionResult)
     assert result.errors
     assert result.errors[0].message == gql_err.message
+
+
+async def test__field_resolvers_compiled__ok(schema):
+    query_type = schema.get_type("Query")
+    for name, field_def in query_type.fields.items():
+        assert field_def.resolve is not None, name
+
+    result = await schema.run("query { booksAlias { title } }")
+    assert result.errors is None
+    assert len(result.data["booksAlias"]) > 0
+
+
+async def test__field_resolver_dispatch__ok(schema_type):
+    @dataclass
+    class Item:
+        name: str
+        label: str = field(default="", metadata={"alias": "title"})
+
+        def resolve_name(self, info):
+            return self.name.upper()
+
+    @dataclass
+    class SpecialItem(Item):
+        def resolve_name(self, info):
+            return "special"
+
+        def resolve_title(self, info):
+            return self.label
+
+    class InheritedItem(Item):
+        pass
+
+    @dataclass(init=False)
+    class Query:
+        items: List[Item]
+
+        def resolve_items(self, info):
+            return [
+                Item("first", "a"),
+                SpecialItem("second", "b"),
+                {"name": "third", "title": "c"},
+                InheritedItem("fourth", "d"),
+            ]
+
+    schema = schema_type(query=Query)
+    result = await schema.run("query { items { name title } }")
+    assert result.errors is None
+    assert result.data["items"] == [
+        {"name": "FIRST", "title": "a"},
+        {"name": "special", "title": "b"},
+        {"name": "third", "title": "c"},
+        {"name": "FOURTH", "title": "d"},
+    ]
+
+
+async def test__arguments_coerced_once_per_field_node__ok(schema_type, monkeypatch):
+    from typegql import execution
+
+    calls = []
+    coerce = execution.coerce_arguments
+
+    def coerce_arguments(*args):
+        calls.append(args[3].name.value)
+        return coerce(*args)
+
+    monkeypatch.setattr(execution, "coerce_arguments", coerce_arguments)
+
+    @dataclass
+    class Item:
+        name: str = field(metadata={"arguments": [Argument[bool](name="upper_case")]})
+
+        def resolve_name(self, info, upper_case=False):
+            return self.name.upper() if upper_case else self.name
+
+    @dataclass(init=False)
+    class Query:
+        items: List[Item]
+
+        def resolve_items(self, info):
+            return [Item("a"), Item("b"), Item("c")]
+
+    schema = schema_type(query=Query)
+    query = "query Items($upper: Boolean) { items { name(upperCase: $upper) } }"
+    result = await schema.run(query, variables={"upper": True})
+    assert result.data["items"] == [{"name": "A"}, {"name": "B"}, {"name": "C"}]
+    assert calls == ["items", "name"]
+
+
+async def test__dict_source_default__ok(schema_type):
+    @dataclass
+    class Item:
+        name: str
+        count: int = 0
+
+    @dataclass(init=False)
+    class Query:
+        items: List[Item]
+
+        def resolve_items(self, info):
+            return [{"name": "a"}, {"name": "b", "count": 2}]
+
+    schema = schema_type(query=Query)
+    result = await schema.run("query { items { name count } }")
+    assert result.errors is None
+    assert result.data["items"] == [
+        {"name": "a", "count": 0},
+        {"name": "b", "count": 2},
+    ]
+
+
+async def test__resolve_many__ok(schema_type):
+    calls = []
+
+    @dataclass
+    class Child:
+        value: int
+        double: int = field(
+            default=0, metadata={"arguments": [Argument[int](name="factor")]}
+        )
+
+        @classmethod
+        def resolve_many_double(cls, items, info, factor=2):
+            calls.append(([item.value for item in items], factor))
+            return [item.value * factor for item in items]
+
+    @dataclass
+    class Item(Child):
+        children: List[Child] = field(default_factory=list)
+
+        def resolve_children(self, info):
+            return [Child(self.value * 10), SpecialChild(self.value * 10 + 1)]
+
+    class SpecialChild(Child):
+        pass
+
+    @dataclass(init=False)
+    class Query:
+        items: List[Item]
+
+        def resolve_items(self, info):
+            return [Item(1), Item(2), Item(3)]
+
+    schema = schema_type(query=Query)
+    query = """
+    query {
+        items { double children { double(factor: 3) } }
+        alias: items { double(factor: 3) }
+    }
+    """
+    result = await schema.run(query)
+    assert result.errors is None
+    assert result.data["items"][0] == {
+        "double": 2,
+        "children": [{"double": 30}, {"double": 33}],
+    }
+    assert [item["double"] for item in result.data["alias"]] == [3, 6, 9]
+    assert sorted(calls) == [
+        ([1, 2, 3], 2),
+        ([1, 2, 3], 3),
+        ([10, 11, 20, 21, 30, 31], 3),
+    ]
+
+
+async def test__resolve_many_batch__ok(schema_type):
+    @dataclass
+    class Item:
+        value: int
+        label: str = ""
+
+        @classmethod
+        def resolve_many_label(cls, items, info):
+            upper = info.variable_values["upper"]
+            return [f"{'B' if upper else 'b'}{item.value}" for item in items]
+
+    @dataclass(init=False)
+    class Query:
+        items: List[Item]
+
+        def resolve_items(self, info):
+            return [Item(1), Item(2)]
+
+    schema = schema_type(query=Query)
+    query = (
+        "query Items($upper: Boolean!) { items { label __typename @skip(if: $upper) } }"
+    )
+    results = await schema.run_batch(
+        [
+            {"query": query, "variables": {"upper": False}},
+            {"query": query, "variables": {"upper": True}},
+        ]
+    )
+    assert [result.data["items"][1]["label"] for result in results] == ["b2", "B2"]
+
+
+async def test__resolve_many_authors_books__ok(schema):
+    result = await schema.run("query { authors { name books { title } } }")
+    assert result.errors is None
+    books = [len(author["books"]) for author in result.data["authors"]]
+    assert books == [2, 1]
+
+
+async def test__async_iterable_list__ok(schema_type):
+    counts = {"produced": 0, "completed": 0, "closed": 0}
+    in_flight = []
+
+    @dataclass
+    class Item:
+        value: int
+        double: int = 0
+
+        async def resolve_double(self, info):
+            in_flight.append(counts["produced"] - counts["completed"])
+            await asyncio.sleep(0)
+            counts["completed"] += 1
+            return self.value * 2
+
+    @dataclass(init=False)
+    class Query:
+        items: List[Item] = field(metadata={"arguments": [Argument[bool](name="fail")]})
+
+        async def resolve_items(self, info, fail=False):
+            try:
+                for value in range(10):
+                    counts["produced"] += 1
+                    yield Item(value)
+                if fail:
+                    raise ValueError("Boom")
+            finally:
+                counts["closed"] += 1
+
+    schema = schema_type(query=Query, max_buffered_items=3)
+    query = "query Items($fail: Boolean) { items(fail: $fail) { value double } }"
+    result = await schema.run(query)
+    assert result.errors is None
+    assert [item["double"] for item in result.data["items"]] == list(range(0, 20, 2))
+    assert max(in_flight) == 3
+    assert counts["closed"] == 1
+
+    compiled = schema.compile(query)
+    assert await compiled() == result
+
+    result = await schema.run(query, variables={"fail": True})
+    assert result.data is None
+    assert result.errors[0].message == "Boom"
+
+    with raises(ValueError, match="max_buffered_items must be a positive integer"):
+        schema_type(query=Query, max_buffered_items=0)
+
+
+async def test__async_generator_resolver__ok(schema):
+    result = await schema.run("query { books { title categories { name } } }")
+    assert result.errors is None
+    assert result.data["books"][2]["categories"] == [{"name": "Biography"}]
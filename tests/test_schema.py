@@ -0,0 +1,333 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import List
+
+import pytest
+
+from examples.library.query import Query
+from typegql import Argument
+from typegql import cache as cache_module
+from typegql import persisted
+from typegql.cache import MISSING, LRUCache, MemoryCache
+from typegql.persisted import FileQueryStore, query_hash
+
+
+async def test__lru_cache_eviction__ok():
+    cache = LRUCache(2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert "b" not in cache
+    assert cache.get("b") is None
+    assert cache.stats() == {"size": 2, "hits": 1, "misses": 1, "evictions": 1}
+
+
+async def test__document_cache__ok(schema):
+    query = "query { authors { name } }"
+    first = await schema.run(query)
+    second = await schema.run(query)
+    assert first == second
+    assert schema.documents.hits == 1
+    assert schema.documents.misses == 1
+
+
+async def test__document_cache_invalid_query__ok(schema):
+    query = "query { unknownField }"
+    for _ in range(2):
+        result = await schema.run(query)
+        assert result.data is None
+        assert result.errors
+    assert schema.documents.hits == 1
+
+    result = await schema.run("query {")
+    assert result.errors
+    assert "Syntax Error" in result.errors[0].message
+
+
+async def test__persisted_query__ok(schema):
+    query = "query { authors { name } }"
+    key = query_hash(query)
+
+    result = await schema.run(query_hash=key)
+    assert result.data is None
+    assert result.errors[0].message == "PersistedQueryNotFound"
+    assert result.errors[0].extensions["code"] == "PERSISTED_QUERY_NOT_FOUND"
+
+    registered = await schema.run(query, query_hash=key)
+    assert registered.errors is None
+
+    result = await schema.run(query_hash=key)
+    assert result == registered
+
+
+async def test__persisted_query_mismatch__error(schema):
+    result = await schema.run("query { authors { name } }", query_hash="0" * 64)
+    assert result.errors[0].extensions["code"] == "PERSISTED_QUERY_HASH_MISMATCH"
+    assert schema.query_store.get("0" * 64) is None
+
+
+async def test__persisted_query_file_store__ok(schema_type, tmp_path):
+    query = "query { authors { name } }"
+    key = query_hash(query)
+    schema = schema_type(Query, query_store=FileQueryStore(str(tmp_path)))
+    await schema.run(query, query_hash=key)
+
+    restarted = schema_type(Query, query_store=FileQueryStore(str(tmp_path)))
+    result = await restarted.run(query_hash=key)
+    assert result.errors is None
+    assert result.data["authors"]
+    assert FileQueryStore(str(tmp_path)).get("../" + key) is None
+
+
+async def test__persisted_query_file_store__write_error(tmp_path, monkeypatch):
+    def replace(source, destination):
+        raise OSError("Disk full")
+
+    store = FileQueryStore(str(tmp_path))
+    monkeypatch.setattr(persisted.os, "replace", replace)
+    query = "query { authors { name } }"
+    with pytest.raises(OSError, match="Disk full"):
+        store.set(query_hash(query), query)
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test__persisted_query_register__error(schema_type, tmp_path, monkeypatch):
+    def replace(source, destination):
+        raise OSError("Disk full")
+
+    monkeypatch.setattr(persisted.os, "replace", replace)
+    query = "query { authors { name } }"
+    key = query_hash(query)
+    schema = schema_type(Query, query_store=FileQueryStore(str(tmp_path)))
+    results = await asyncio.gather(
+        schema.run(query, query_hash=key), schema.run(query, query_hash=key)
+    )
+    for result in results:
+        assert result.errors is None
+        assert result.data["authors"]
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test__memory_cache_ttl__ok(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(cache_module, "monotonic", lambda: now[0])
+    cache = MemoryCache(10)
+    cache.set("a", None, ttl=5)
+    cache.set("b", 2)
+    assert cache.get("a") is None
+    now[0] += 10
+    assert cache.get("a") is MISSING
+    assert cache.get("b") == 2
+    assert cache.stats() == {
+        "size": 1,
+        "hits": 2,
+        "misses": 1,
+        "evictions": 0,
+        "expirations": 1,
+    }
+
+
+async def test__resolver_cache__ok(schema_type):
+    calls = []
+
+    @dataclass
+    class Item:
+        id: int
+        total: int = field(
+            default=0,
+            metadata={
+                "cache": {"scope": "request"},
+                "arguments": [Argument[int](name="factor")],
+            },
+        )
+
+        def resolve_total(self, info, factor=1):
+            calls.append((self.id, factor))
+            return self.id * factor
+
+    @dataclass(init=False)
+    class Query:
+        items: List[Item] = field(metadata={"cache": {"ttl": 60}})
+
+        async def resolve_items(self, info):
+            calls.append("items")
+            await asyncio.sleep(0)
+            return [Item(1), Item(2), Item(1)]
+
+    schema = schema_type(query=Query)
+    query = "query { items { total } again: items { total(factor: 2) } }"
+    results = await asyncio.gather(schema.run(query), schema.run(query))
+    for result in results:
+        assert result.errors is None
+        assert result.data == {
+            "items": [{"total": 1}, {"total": 2}, {"total": 1}],
+            "again": [{"total": 2}, {"total": 4}, {"total": 2}],
+        }
+    assert calls.count("items") == 1
+    assert sorted(call for call in calls if call != "items") == [
+        (1, 1),
+        (1, 1),
+        (1, 2),
+        (1, 2),
+        (2, 1),
+        (2, 1),
+        (2, 2),
+        (2, 2),
+    ]
+    stats = schema.cache_stats()["Query.items"]
+    assert stats["shared"] == 3
+    assert stats["size"] == 1
+
+
+async def test__resolver_cache_unkeyed_parent__ok(schema_type):
+    calls = []
+
+    @dataclass
+    class Item:
+        name: str
+        label: str = field(default="", metadata={"cache": True})
+
+        def resolve_label(self, info):
+            calls.append(self.name)
+            return self.name.upper()
+
+    @dataclass(init=False)
+    class Query:
+        items: List[Item]
+
+        def resolve_items(self, info):
+            return [Item("a"), Item("b")]
+
+    schema = schema_type(query=Query)
+    for _ in range(2):
+        result = await schema.run("query { items { label } }")
+        assert result.data == {"items": [{"label": "A"}, {"label": "B"}]}
+    assert calls == ["a", "b", "a", "b"]
+    assert schema.cache_stats()["Item.label"]["size"] == 0
+
+
+async def test__run_batch__ok(schema):
+    from examples.library.types import load_authors
+    from typegql.dataloader import get_loaders
+
+    books = "query Books { books { author { name } } }"
+    context = {}
+    results = await schema.run_batch(
+        [
+            {"query": books, "operationName": "Books"},
+            {"query": "query { authors { name } }"},
+            {"query": books},
+            {"query": "query { unknown }"},
+            {"extensions": {"persistedQuery": {"sha256Hash": query_hash(books)}}},
+        ],
+        context=context,
+        max_concurrency=2,
+    )
+    assert [result.errors is None for result in results] == [
+        True,
+        True,
+        True,
+        False,
+        False,
+    ]
+    assert results[0] == results[2]
+    assert results[1].data["authors"][0]["name"] == "J.R.R. Tolkien"
+    assert results[4].errors[0].message == "PersistedQueryNotFound"
+    assert get_loaders(context).get(load_authors).batches == 1
+    assert schema.documents.hits == 1
+
+
+async def test__builder_memoized__ok(schema_type, monkeypatch):
+    from typegql import ID, Connection
+    from typegql.builder import base
+
+    inspected: List[type] = []
+
+    def get_type_hints(source):
+        inspected.append(source)
+        return hints(source)
+
+    hints = base.get_type_hints
+    monkeypatch.setattr(base, "get_type_hints", get_type_hints)
+
+    @dataclass
+    class Item:
+        id: ID
+        name: str
+
+    @dataclass(init=False)
+    class Query:
+        items: List[Item]
+        more_items: List[Item]
+        connection: Connection[Item]
+        other_connection: Connection[Item]
+
+    schema = schema_type(Query)
+    assert len(inspected) == len(set(inspected))
+    fields = schema.query_type.fields
+    assert fields["items"].type.of_type is fields["moreItems"].type.of_type
+    connection = fields["connection"].type.of_type
+    assert connection is fields["otherConnection"].type.of_type
+    edge = connection.fields["edges"].type.of_type.of_type
+    assert edge is schema.type_map["ItemEdge"]
+    assert schema.build_stats["Query"].fields == 4
+    assert schema.build_stats["ItemConnection"].fields == 2
+    assert schema.build_stats["ItemEdge"].fields == 2
+    assert schema.build_stats["ItemNode"].fields == 2
+
+
+async def test__custom_resolver__ok(schema_type):
+    @dataclass
+    class Item:
+        name: str
+
+    @dataclass(init=False)
+    class Query:
+        name: str
+        items: List[Item]
+
+        def resolve_name(self, info):
+            return "query"
+
+        def resolve_items(self, info):
+            return [Item("item")]
+
+    @dataclass(init=False)
+    class Subscription:
+        name: str
+
+    def resolver(source, info, **kwargs):
+        if info.field_name == "items":
+            return [Item("item")]
+        return f"custom {info.field_name}"
+
+    async def subscription_resolver(source, info, **kwargs):
+        yield {"name": "event"}
+
+    schema = schema_type(Query, subscription=Subscription)
+    query = "query { __typename name items { name } }"
+    expected = {
+        "__typename": "Query",
+        "name": "custom name",
+        "items": [{"name": "custom name"}],
+    }
+    result = await schema.run(query, resolver=resolver)
+    assert result.data == expected
+    assert (await schema.compile(query, resolver=resolver)()).data == expected
+    assert (await schema.run(query)).data["name"] == "query"
+
+    result = await schema.run(
+        "query { name ... @defer { items { name } } }", resolver=resolver
+    )
+    initial, deferred = [payload async for payload in result]
+    assert initial.data == {"name": "custom name"}
+    assert deferred.data == {"items": [{"name": "custom name"}]}
+
+    subscription = await schema.subscribe(
+        "subscription { name }",
+        subscription_resolver=subscription_resolver,
+        resolver=resolver,
+    )
+    result = await subscription.__anext__()
+    assert result.data == {"name": "custom name"}
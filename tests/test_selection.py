@@ -0,0 +1,137 @@
+from dataclasses import dataclass, field
+from typing import Generic, List, Optional, TypeVar, cast
+
+from typegql import ID, Connection
+from typegql.pagination import SequenceSource, paginate
+from typegql.selection import Lazy, info_fields, selected_fields
+
+T = TypeVar("T")
+
+
+async def test__selected_fields__ok(schema_type):
+    selections = []
+
+    @dataclass
+    class Book:
+        title: str
+        page_count: int = field(default=0, metadata={"alias": "pages"})
+        isbn: Optional[str] = None
+
+    @dataclass(init=False)
+    class Query:
+        books: List[Book]
+
+        def resolve_books(self, info):
+            selections.append(selected_fields(info))
+            return [Book("The Hobbit")]
+
+    schema = schema_type(Query)
+    query = """
+    query Books($isbn: Boolean!) {
+      books { title ...Details __typename }
+      books { ... on Book { isbn @include(if: $isbn) } }
+    }
+    fragment Details on Book { pages }
+    """
+    for isbn in (True, False, True):
+        result = await schema.run(query, variables={"isbn": isbn})
+        assert result.errors is None
+    assert selections[0] == {"title", "page_count", "isbn"}
+    assert selections[1] == {"title", "page_count"}
+    assert selections[2] is selections[0]
+
+
+async def test__connection_lazy_fields__ok(schema_type):
+    calls = []
+
+    @dataclass
+    class Item:
+        id: ID
+
+    @dataclass
+    class CountedConnection(Connection, Generic[T]):
+        total_count: Optional[int] = None
+
+    class CountingSource(SequenceSource):
+        async def fetch(self, *args):
+            calls.append("fetch")
+            return await super().fetch(*args)
+
+    async def count(items):
+        calls.append("count")
+        return len(items)
+
+    @dataclass(init=False)
+    class Query:
+        items: CountedConnection[Item]
+
+        async def resolve_items(self, info, first=None, **kwargs):
+            items = [Item(str(i)) for i in range(5)]
+            source = CountingSource(items, key=lambda item: (item.id,))
+            page = await paginate(source, first, fields=selected_fields(info))
+            return {**page, "total_count": Lazy(count, items)}
+
+    schema = schema_type(Query)
+    result = await schema.run("query { items(first: 2) { edges { node { id } } } }")
+    assert result.errors is None
+    assert len(result.data["items"]["edges"]) == 2
+    assert calls == ["fetch"]
+
+    calls.clear()
+    result = await schema.run("query { items { totalCount } }")
+    assert result.data == {"items": {"totalCount": 5}}
+    assert calls == ["count"]
+
+
+async def test__info_fields__ok(schema_type):
+    projections = []
+
+    @dataclass
+    class Author:
+        name: str
+        birth_year: Optional[int] = None
+
+    @dataclass
+    class Book:
+        id: ID
+        title: str
+        author: Author
+        page_count: int = field(default=0, metadata={"alias": "pages"})
+
+    @dataclass(init=False)
+    class Query:
+        books: List[Book]
+        books_connection: Connection[Book]
+
+        def resolve_books(self, info):
+            projections.append(info_fields(info))
+            return [Book(cast(ID, "1"), "The Hobbit", Author("J.R.R. Tolkien"))]
+
+        def resolve_books_connection(self, info, **kwargs):
+            projections.append(info_fields(info))
+            return {"edges": []}
+
+    schema = schema_type(Query)
+    query = """
+    query Books($year: Boolean!) {
+      books { title pages author { name } }
+      ...Years
+      booksConnection { edges { node { title } } }
+    }
+    fragment Years on Query { books { author { birthYear @include(if: $year) } } }
+    """
+    for year in (True, False, True):
+        result = await schema.run(query, variables={"year": year})
+        assert result.errors is None
+    books, connection = projections[:2]
+    assert list(books.paths()) == [
+        ("title",),
+        ("page_count",),
+        ("author", "name"),
+        ("author", "birth_year"),
+    ]
+    assert "author" in books
+    assert set(books["author"]) == {"name", "birth_year"}
+    assert set(projections[2]["author"]) == {"name"}
+    assert projections[4] is books
+    assert list(connection.paths()) == [("edges", "node", "title")]
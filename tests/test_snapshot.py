@@ -0,0 +1,90 @@
+import json
+from dataclasses import dataclass
+
+from graphql import print_schema
+
+from examples.library.mutation import Mutation
+from examples.library.query import Query
+from examples.library.subscription import Subscription
+from typegql import snapshot
+
+QUERY = """
+query Library {
+  books { id title published author { id name gender } }
+  booksConnection(first: 2) {
+    totalCount
+    edges { node { id title } }
+  }
+  authorsConnection { edges { node { id name gender books { title } } } }
+}
+"""
+
+MUTATION = """
+mutation AuthorsMutation {
+  createAuthors(authors: [
+    {name: "Ursula K. Le Guin", gender: FEMALE, geo: {latitude: 40, longitude: "-74.17"}}
+  ])
+}
+"""
+
+
+async def test__schema_snapshot__ok(schema_type, tmp_path):
+    path = tmp_path / "schema.json"
+    built = schema_type(Query, mutation=Mutation, snapshot=path)
+    assert not built.from_snapshot
+    assert path.exists()
+
+    restored = schema_type(Query, mutation=Mutation, snapshot=path)
+    assert restored.from_snapshot
+    assert print_schema(restored) == print_schema(built)
+
+    expected = await built.run(QUERY)
+    assert expected.errors is None
+    result = await restored.run(QUERY)
+    assert result.errors is None
+    assert result.data == expected.data
+    assert result.extensions == expected.extensions
+
+    expected = await built.run(MUTATION)
+    result = await restored.run(MUTATION)
+    assert result.errors is None
+    assert result.data == expected.data
+
+
+async def test__schema_snapshot_stale__rebuilt(schema_type, tmp_path):
+    path = tmp_path / "schema.json"
+    schema_type(Query, mutation=Mutation, snapshot=path)
+
+    schema = schema_type(Query, mutation=Mutation, camelcase=False, snapshot=path)
+    assert not schema.from_snapshot
+    schema = schema_type(Query, snapshot=path)
+    assert not schema.from_snapshot
+
+    data = json.loads(path.read_text())
+    data["fingerprint"] = "stale"
+    path.write_text(json.dumps(data))
+    schema = schema_type(Query, snapshot=path)
+    assert not schema.from_snapshot
+    assert schema_type(Query, snapshot=path).from_snapshot
+
+
+async def test__schema_snapshot_local_class__not_saved(schema_type, tmp_path):
+    @dataclass
+    class Query:
+        name: str
+
+    path = tmp_path / "schema.json"
+    schema = schema_type(Query, subscription=Subscription, snapshot=path)
+    assert not schema.from_snapshot
+    assert not path.exists()
+
+
+async def test__schema_snapshot_write__error(schema_type, tmp_path, monkeypatch):
+    def dump(data, output, **kwargs):
+        output.write("{")
+        raise TypeError("Object of type Decimal is not JSON serializable")
+
+    monkeypatch.setattr(snapshot.json, "dump", dump)
+    schema = schema_type(Query, snapshot=tmp_path / "schema.json")
+    assert not schema.from_snapshot
+    assert list(tmp_path.iterdir()) == []
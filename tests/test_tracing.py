@@ -0,0 +1,78 @@
+from dataclasses import dataclass
+from typing import List, Optional
+
+from typegql.tracing import Trace, Tracer
+
+QUERY = "query { authors { name books { title } } }"
+
+
+async def test__tracer__extension(schema_type):
+    from examples.library.query import Query
+
+    traces: List[Trace] = []
+    schema = schema_type(Query, tracer=Tracer(sink=traces.append))
+    result = await schema.run(QUERY)
+    assert not result.errors
+    tracing = result.extensions["tracing"]
+    assert tracing["version"] == 1
+    assert tracing["startTime"] <= tracing["endTime"]
+    phases = [tracing[name] for name in ("parsing", "validation", "execution")]
+    for phase, following in zip(phases, phases[1:]):
+        assert phase["startOffset"] + phase["duration"] <= following["startOffset"]
+    assert phases[-1]["startOffset"] + phases[-1]["duration"] <= tracing["duration"]
+
+    resolvers = tracing["execution"]["resolvers"]
+    authors = next(item for item in resolvers if item["path"] == ["authors"])
+    assert authors["parentType"] == "Query"
+    assert authors["returnType"] == "[Author]!"
+    assert {tuple(item["path"]) for item in resolvers} >= {
+        ("authors", 1, "books", 0, "title")
+    }
+    assert all(item["duration"] >= 0 for item in resolvers)
+
+    (trace,) = traces
+    assert trace.query == QUERY
+    assert trace.formatted["execution"]["resolvers"] == resolvers
+
+    result = await schema.run(QUERY)
+    assert result.extensions["tracing"]["validation"]["duration"] == 0
+    assert len(traces) == 2
+
+
+async def test__tracer__sampling(schema_type):
+    from examples.library.query import Query
+
+    traces: List[Trace] = []
+    schema = schema_type(Query, tracer=Tracer(0, sink=traces.append))
+    for _ in range(10):
+        result = await schema.run(QUERY)
+        assert "tracing" not in result.extensions
+    assert not traces
+
+    schema = schema_type(Query, tracer=Tracer(sink=traces.append, extension=False))
+    result = await schema.run("query { authors { missing } }")
+    assert "tracing" not in (getattr(result, "extensions", None) or {})
+    (trace,) = traces
+    assert trace.errors == result.errors
+    assert not trace.resolvers
+
+
+async def test__tracer__errors(schema_type):
+    @dataclass(init=False, repr=False)
+    class Query:
+        name: Optional[str]
+        names: Optional[List[str]]
+
+        def resolve_name(self, info):
+            raise ValueError("Boom")
+
+        async def resolve_names(self, info):
+            raise ValueError("Boom")
+
+    traces: List[Trace] = []
+    schema = schema_type(Query, tracer=Tracer(sink=traces.append))
+    result = await schema.run("query { name names }")
+    assert len(result.errors) == 2
+    (trace,) = traces
+    assert [timing.failed for timing in trace.resolvers] == [True, True]
+    assert {timing.field_name for timing in trace.resolvers} == {"name", "names"}
@@ -1,23 +1,28 @@
-from .builder.arguments import (
-    Argument,
-    ArgumentList,
-    InputArgument,
-    ListInputArgument,
-    RequiredArgument,
-    RequiredArgumentList,
-    RequiredInputArgument,
-    RequiredListInputArgument,
-)
-from .builder.connection import (
-    Connection,
-    IConnection,
-    IEdge,
-    INode,
-    IPageInfo,
-    PageInfo,
-)
-from .builder.types import ID, DateTime, Decimal, Dictionary
-from .schema import Schema
+from typing import TYPE_CHECKING
+
+from .lazy import lazy_exports
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .builder.arguments import (
+        Argument,
+        ArgumentList,
+        InputArgument,
+        ListInputArgument,
+        RequiredArgument,
+        RequiredArgumentList,
+        RequiredInputArgument,
+        RequiredListInputArgument,
+    )
+    from .builder.connection import (
+        Connection,
+        IConnection,
+        IEdge,
+        INode,
+        IPageInfo,
+        PageInfo,
+    )
+    from .builder.types import ID, DateTime, Decimal, Dictionary
+    from .schema import Schema
 
 __all__ = (
     "Argument",
@@ -40,3 +45,28 @@ __all__ = (
     "Dictionary",
     "Decimal",
 )
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "Argument": ".builder.arguments",
+        "ArgumentList": ".builder.arguments",
+        "InputArgument": ".builder.arguments",
+        "ListInputArgument": ".builder.arguments",
+        "RequiredInputArgument": ".builder.arguments",
+        "RequiredListInputArgument": ".builder.arguments",
+        "RequiredArgument": ".builder.arguments",
+        "RequiredArgumentList": ".builder.arguments",
+        "IConnection": ".builder.connection",
+        "IPageInfo": ".builder.connection",
+        "IEdge": ".builder.connection",
+        "INode": ".builder.connection",
+        "Connection": ".builder.connection",
+        "PageInfo": ".builder.connection",
+        "Schema": ".schema",
+        "ID": ".builder.types",
+        "DateTime": ".builder.types",
+        "Dictionary": ".builder.types",
+        "Decimal": ".builder.types",
+    },
+)
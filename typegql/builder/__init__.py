@@ -1,22 +1,41 @@
-from __future__ import annotations
+from typing import TYPE_CHECKING
 
-from typing import Optional
+from ..lazy import lazy_exports
 
-from .base import BuilderBase, GraphQLEnumMap, GraphQLInterfaceMap, GraphQLScalarMap
-from .mutation import GraphQLInputObjectTypeMap, MutationBuilder
-from .query import GraphQLObjectTypeMap, QueryBuilder
+if TYPE_CHECKING:  # pragma: no cover
+    from .base import (
+        BuilderBase,
+        GraphQLEnumMap,
+        GraphQLInterfaceMap,
+        GraphQLScalarMap,
+    )
+    from .builder import Builder
+    from .mutation import GraphQLInputObjectTypeMap, MutationBuilder
+    from .query import GraphQLObjectTypeMap, QueryBuilder
 
+__all__ = (
+    "Builder",
+    "BuilderBase",
+    "MutationBuilder",
+    "QueryBuilder",
+    "GraphQLEnumMap",
+    "GraphQLInputObjectTypeMap",
+    "GraphQLInterfaceMap",
+    "GraphQLObjectTypeMap",
+    "GraphQLScalarMap",
+)
 
-class Builder(QueryBuilder, MutationBuilder):
-    def __init__(
-        self,
-        camelcase: bool = True,
-        scalars: Optional[GraphQLScalarMap] = None,
-        enums: Optional[GraphQLEnumMap] = None,
-        interfaces: Optional[GraphQLInterfaceMap] = None,
-        query_types: Optional[GraphQLObjectTypeMap] = None,
-        mutation_types: Optional[GraphQLInputObjectTypeMap] = None,
-    ):
-        BuilderBase.__init__(self, camelcase, scalars, enums, interfaces)
-        QueryBuilder.__init__(self, types=query_types)
-        MutationBuilder.__init__(self, types=mutation_types)
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "Builder": ".builder",
+        "BuilderBase": ".base",
+        "GraphQLEnumMap": ".base",
+        "GraphQLInterfaceMap": ".base",
+        "GraphQLScalarMap": ".base",
+        "GraphQLInputObjectTypeMap": ".mutation",
+        "MutationBuilder": ".mutation",
+        "GraphQLObjectTypeMap": ".query",
+        "QueryBuilder": ".query",
+    },
+)
@@ -3,14 +3,18 @@ from __future__ import annotations
 from abc import ABCMeta
 from dataclasses import Field, dataclass, fields, is_dataclass
 from functools import partial
+from time import perf_counter
 from typing import (
     Any,
+    Callable,
     Dict,
-    Generator,
+    List,
     Mapping,
     Optional,
     Sequence,
+    Tuple,
     Type,
+    TypeVar,
     Union,
     get_type_hints,
 )
@@ -31,9 +35,9 @@ from graphql import (
     GraphQLType,
     GraphQLWrappingType,
 )
-from graphql.pyutils import snake_to_camel
 
 from .arguments import Argument, ArgumentList
+from .names import NameMap, rename, to_camel
 from .types import (
     EnumType,
     GraphQLDateTime,
@@ -41,7 +45,7 @@ from .types import (
     GraphQLDictionary,
     GraphQLID,
 )
-from .utils import is_enum, is_optional, is_sequence, load, to_snake
+from .utils import is_enum, is_optional, is_sequence, load
 
 GraphQLEnumMap = Dict[str, GraphQLEnumType]
 GraphQLInputObjectTypeMap = Dict[str, GraphQLInputObjectType]
@@ -51,6 +55,19 @@ GraphQLIntersection = Union[
 ]
 GraphQLObjectTypeMap = Dict[str, GraphQLObjectType]
 GraphQLScalarMap = Mapping[str, GraphQLScalarType]
+FieldMap = TypeVar("FieldMap", GraphQLFieldMap, GraphQLInputFieldMap)
+
+
+def input_loader(
+    source: Type[Any], names: Optional[Mapping[str, str]]
+) -> Optional[Callable[[Dict[str, Any]], Any]]:
+    """Converts the input values of `source`, using its `load` method if any"""
+    load_method = getattr(source, "load", None)
+    if load_method:
+        return partial(load, callback=load_method, names=names)
+    if names is not None:
+        return partial(rename, names)
+    return None
 
 
 @dataclass
@@ -60,16 +77,33 @@ class BuildType:
     metadata: Mapping[str, Any]
 
 
+@dataclass
+class TypeStats:
+    """Fields of a GraphQL type and the time spent building them
+
+    The time includes the types built eagerly with the fields, such as
+    connections.
+    """
+
+    fields: int = 0
+    seconds: float = 0.0
+
+
 class Helper:
-    def __init__(self, source: Type[Any], builder: BuilderBase):
+    def __init__(self, source: Type[Any], builder: BuilderBase, name: str):
         self.source = source
         self.builder = builder
+        self.name = name
 
     def query_fields(self) -> GraphQLFieldMap:
-        return self.builder.query_fields(self.source)
+        return self.builder.timed(
+            self.name, partial(self.builder.query_fields, self.source, self.name)
+        )
 
     def input_fields(self) -> GraphQLInputFieldMap:
-        return self.builder.input_fields(self.source)
+        return self.builder.timed(
+            self.name, partial(self.builder.input_fields, self.source, self.name)
+        )
 
 
 class BuilderBase(metaclass=ABCMeta):
@@ -97,12 +131,22 @@ class BuilderBase(metaclass=ABCMeta):
         self.scalars = default_scalars
         self.enums: GraphQLEnumMap = enums or {}
         self.interfaces = interfaces or {}
+        self.names = NameMap()
+        # Python class of every object, input and enum type, by GraphQL name
+        self.sources: Dict[str, Type[Any]] = {}
+        # Memoized by class, every class is inspected once per schema
+        self.hints: Dict[Type[Any], Dict[str, Any]] = {}
+        self.build_types: Dict[Type[Any], List[BuildType]] = {}
+        self.sequences: Dict[Tuple[Type[Any], bool], Optional[GraphQLList]] = {}
+        self.stats: Dict[str, TypeStats] = {}
 
         # These are foor mypy only
         self.query_types: GraphQLObjectTypeMap = {}
         self.mutation_types: GraphQLInputObjectTypeMap = {}
 
-    def arguments(self, definition: Optional[Dict]) -> Optional[GraphQLArgumentMap]:
+    def arguments(
+        self, definition: Optional[Dict], scope: Optional[Tuple[str, str]] = None
+    ) -> Optional[GraphQLArgumentMap]:
         result: GraphQLArgumentMap = dict()
         if not definition or not isinstance(definition, (list, tuple)):
             return None
@@ -113,18 +157,23 @@ class BuilderBase(metaclass=ABCMeta):
             mapped_type = self.map_input(arg.type)
             if arg.required:
                 mapped_type = graphql.GraphQLNonNull(mapped_type)
-            arg_name = snake_to_camel(arg.name, False) if self.camelcase else arg.name
+            arg_name = to_camel(arg.name) if self.camelcase else arg.name
             result[arg_name] = graphql.GraphQLArgument(
                 mapped_type, description=arg.description
             )
+            if scope:
+                self.names.arguments.add(scope, arg_name, arg.name)
         return result
 
     def field_name(self, field: Field) -> str:
-        field_name = field.metadata.get("alias", field.name)
+        field_name = self.python_name(field)
         if self.camelcase:
-            field_name = snake_to_camel(field_name, upper=False)
+            field_name = to_camel(field_name)
         return field_name
 
+    def python_name(self, field: Field) -> str:
+        return field.metadata.get("alias", field.name)
+
     def type_name(self, source: Type[Any]) -> str:
         try:
             return source.__name__
@@ -150,6 +199,7 @@ class BuilderBase(metaclass=ABCMeta):
             return self.enums[name]
         enum_type = EnumType(name, source)
         self.enums[name] = enum_type
+        self.sources[name] = source
         return enum_type
 
     def map_sequence(
@@ -157,15 +207,18 @@ class BuilderBase(metaclass=ABCMeta):
     ) -> Optional[GraphQLList]:
         if not is_sequence(source):
             return None
+        key = (source, is_input)
+        if key in self.sequences:
+            return self.sequences[key]
 
         inner: GraphQLType
         if is_input:
             inner = self.map_input(source.__args__[0])
         else:
             inner = self.map_output(source.__args__[0])
-        if inner:
-            return GraphQLList(inner)
-        return None
+        result = GraphQLList(inner) if inner else None
+        self.sequences[key] = result
+        return result
 
     def map_type(
         self,
@@ -177,7 +230,7 @@ class BuilderBase(metaclass=ABCMeta):
         if name in self.query_types:
             return self.query_types[name]
         description = self.type_description(source)
-        helper = Helper(source, self)
+        helper = Helper(source, self, name)
         _type = graphql.GraphQLObjectType(
             name,
             description=description,
@@ -185,6 +238,7 @@ class BuilderBase(metaclass=ABCMeta):
             interfaces=interfaces,
         )
         self.query_types[name] = _type
+        self.sources[name] = source
         return _type
 
     def map_intersection(
@@ -227,27 +281,31 @@ class BuilderBase(metaclass=ABCMeta):
         if name in self.mutation_types:
             return self.mutation_types[name]
 
-        load_method = getattr(source, "load", None)
-        if load_method:
-            load_method = partial(load, callback=load_method, camelcase=self.camelcase)
-        elif self.camelcase:
-            load_method = to_snake
-
-        helper = Helper(source, self)
+        names = self.names.inputs.scope(name) if self.camelcase else None
+        helper = Helper(source, self, name)
         result = graphql.GraphQLInputObjectType(
             name,
             description=source.__doc__,
             fields=helper.input_fields,
-            out_type=load_method,
+            out_type=input_loader(source, names),
         )
         self.mutation_types[name] = result
+        self.sources[name] = source
         return result
 
-    def build_type(self, source: Type[Any]) -> Generator[BuildType, None, None]:
+    def type_hints(self, source: Type[Any]) -> Dict[str, Any]:
+        if source not in self.hints:
+            self.hints[source] = get_type_hints(source)
+        return self.hints[source]
+
+    def build_type(self, source: Type[Any]) -> List[BuildType]:
+        if source in self.build_types:
+            return self.build_types[source]
         if not is_dataclass(source):
             raise TypeError(f"Expected dataclass for {source}")
 
-        hints = get_type_hints(source)
+        hints = self.type_hints(source)
+        result = []
         for field in fields(source):
             metadata = field.metadata
             if field.name.startswith("_") or metadata.get("skip") is True:
@@ -256,10 +314,25 @@ class BuilderBase(metaclass=ABCMeta):
             if is_optional(_type):
                 _type = _type.__args__[0]
 
-            yield BuildType(_type, field, metadata)
+            result.append(BuildType(_type, field, metadata))
+        self.build_types[source] = result
+        return result
+
+    def timed(self, name: str, build: Callable[[], FieldMap]) -> FieldMap:
+        """Build the fields of the type `name`, recording its stats"""
+        start = perf_counter()
+        result = build()
+        stats = self.stats.setdefault(name, TypeStats())
+        stats.fields = len(result)
+        stats.seconds += perf_counter() - start
+        return result
 
-    def query_fields(self, source: Type[Any]) -> GraphQLFieldMap:
+    def query_fields(
+        self, source: Type[Any], name: Optional[str] = None
+    ) -> GraphQLFieldMap:
         pass
 
-    def input_fields(self, source: Type[Any]) -> GraphQLInputFieldMap:
+    def input_fields(
+        self, source: Type[Any], name: Optional[str] = None
+    ) -> GraphQLInputFieldMap:
         pass
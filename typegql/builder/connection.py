@@ -26,8 +26,18 @@ class IEdge(Generic[T]):
 class IPageInfo:
     """Relay pagination interface"""
 
-    start_cursor: str = field(metadata={"description": "Pagination start cursor"})
-    end_cursor: str = field(metadata={"description": "Pagination end cursor"})
+    start_cursor: Optional[str] = field(
+        default=None, metadata={"description": "Pagination start cursor"}
+    )
+    end_cursor: Optional[str] = field(
+        default=None, metadata={"description": "Pagination end cursor"}
+    )
+    has_next_page: bool = field(
+        default=False, metadata={"description": "Whether more nodes follow this page"}
+    )
+    has_previous_page: bool = field(
+        default=False, metadata={"description": "Whether more nodes precede this page"},
+    )
 
 
 @dataclass
@@ -17,14 +17,18 @@ class MutationBuilder(BuilderBase):
     def __init__(self, types: Optional[GraphQLInputObjectTypeMap] = None):
         self.mutation_types = types or {}
 
-    def input_fields(self, source: Type[Any]) -> GraphQLInputFieldMap:
+    def input_fields(
+        self, source: Type[Any], name: Optional[str] = None
+    ) -> GraphQLInputFieldMap:
         result: GraphQLInputFieldMap = {}
+        scope = name or f"{self.type_name(source)}Input"
 
         for build_type in self.build_type(source):
             if build_type.metadata.get("readonly") is True:
                 continue
 
             field_name = self.field_name(build_type.field)
+            self.names.inputs.add(scope, field_name, self.python_name(build_type.field))
             description = build_type.metadata.get("description", "")
             mapped_type = self.map_input(build_type.source)
 
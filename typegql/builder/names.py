@@ -0,0 +1,100 @@
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, Hashable, Mapping
+
+from graphql.pyutils import camel_to_snake, snake_to_camel
+
+__all__ = ("NameMap", "NameScope", "rename", "to_camel", "to_python")
+
+EMPTY: Mapping[str, str] = MappingProxyType({})
+
+
+@lru_cache(maxsize=4096)
+def to_camel(name: str) -> str:
+    return snake_to_camel(name, upper=False)
+
+
+@lru_cache(maxsize=4096)
+def to_python(name: str) -> str:
+    return camel_to_snake(name)
+
+
+class NameScope:
+    """GraphQL to python names, and back, grouped by scope
+
+    The scope is the GraphQL type name for fields and input fields, and a
+    `(type name, field name)` tuple for arguments.
+    """
+
+    def __init__(self):
+        self._python: Dict[Hashable, Dict[str, str]] = {}
+        self._graphql: Dict[Hashable, Dict[str, str]] = {}
+        self.python: Mapping[Hashable, Mapping[str, str]] = self._python
+        self.graphql: Mapping[Hashable, Mapping[str, str]] = self._graphql
+        self.frozen = False
+
+    def scope(self, scope: Hashable) -> Mapping[str, str]:
+        """GraphQL to python names of `scope`, created if missing"""
+        if self.frozen:
+            return self.get(scope)
+        self._graphql.setdefault(scope, {})
+        return self._python.setdefault(scope, {})
+
+    def get(self, scope: Hashable) -> Mapping[str, str]:
+        return self.python.get(scope, EMPTY)
+
+    def add(self, scope: Hashable, graphql_name: str, python_name: str) -> None:
+        if self.frozen:
+            raise TypeError("Can not add names to a frozen scope")
+        self._python.setdefault(scope, {})[graphql_name] = python_name
+        self._graphql.setdefault(scope, {})[python_name] = graphql_name
+
+    def to_python(self, scope: Hashable, name: str) -> str:
+        names = self.python.get(scope)
+        if names is not None:
+            python_name = names.get(name)
+            if python_name is not None:
+                return python_name
+        return to_python(name)
+
+    def to_graphql(self, scope: Hashable, name: str) -> str:
+        names = self.graphql.get(scope)
+        if names is not None:
+            graphql_name = names.get(name)
+            if graphql_name is not None:
+                return graphql_name
+        return to_camel(name)
+
+    def freeze(self) -> None:
+        self.python = MappingProxyType(
+            {k: MappingProxyType(v) for k, v in self._python.items()}
+        )
+        self.graphql = MappingProxyType(
+            {k: MappingProxyType(v) for k, v in self._graphql.items()}
+        )
+        self.frozen = True
+
+
+class NameMap:
+    """Every field, argument and input field name known to the builder"""
+
+    def __init__(self):
+        self.fields = NameScope()
+        self.arguments = NameScope()
+        self.inputs = NameScope()
+
+    def freeze(self) -> None:
+        self.fields.freeze()
+        self.arguments.freeze()
+        self.inputs.freeze()
+
+
+def rename(names: Mapping[str, str], data: Dict[str, Any]) -> Dict[str, Any]:
+    """Rename the keys of `data` using `names`, converting unknown keys"""
+    if not isinstance(data, dict) or not data:
+        return data
+    result = dict()
+    for key, value in data.items():
+        name = names.get(key)
+        result[name if name is not None else to_python(key)] = value
+    return result
@@ -1,8 +1,10 @@
-from typing import Any, Optional, Type
+from functools import partial
+from typing import Any, Dict, NamedTuple, Optional, Set, Type
 
 from graphql import (
     GraphQLField,
     GraphQLFieldMap,
+    GraphQLFieldResolver,
     GraphQLInterfaceType,
     GraphQLList,
     GraphQLNonNull,
@@ -10,32 +12,56 @@ from graphql import (
     GraphQLOutputType,
 )
 
-from .base import BuilderBase, GraphQLObjectTypeMap
+from .base import BuilderBase, BuildType, GraphQLObjectTypeMap
 from .connection import IConnection, IEdge, INode, IPageInfo, T
+from .names import to_camel
+from .resolvers import build_resolver
 from .utils import is_connection, is_required, is_sequence
 
 
+class FieldBinding(NamedTuple):
+    """The dataclass field a GraphQL field is resolved from"""
+
+    source: Type[Any]
+    build_type: BuildType
+
+
 class QueryBuilder(BuilderBase):
-    def __init__(self, types: Optional[GraphQLObjectTypeMap] = None):
+    def __init__(
+        self,
+        types: Optional[GraphQLObjectTypeMap] = None,
+        executor: Optional[str] = None,
+    ):
         self.query_types = types or {}
+        self.executor = executor
+        self.pools: Set[str] = set()
+        self.bindings: Dict[str, Dict[str, FieldBinding]] = {}
 
-    def query_fields(self, source: Type[Any]) -> GraphQLFieldMap:
+    def query_fields(
+        self, source: Type[Any], name: Optional[str] = None
+    ) -> GraphQLFieldMap:
         result: GraphQLFieldMap = {}
+        scope = name or self.type_name(source)
 
         for build_type in self.build_type(source):
             if build_type.metadata.get("inputonly") is True:
                 continue
 
             field_name = self.field_name(build_type.field)
+            self.names.fields.add(scope, field_name, self.python_name(build_type.field))
             description = build_type.metadata.get("description", "")
             if not is_connection(build_type.source):
                 mapped_type = self.map_output(build_type.source)
             else:
                 mapped_type = self.build_connection(build_type.source)
             if mapped_type:
-                args = self.arguments(build_type.metadata.get("arguments"))
+                args = self.arguments(
+                    build_type.metadata.get("arguments"), (scope, field_name)
+                )
                 if is_connection(build_type.source):
-                    pagination_args = self.arguments(build_type.source.page_arguments())
+                    pagination_args = self.arguments(
+                        build_type.source.page_arguments(), (scope, field_name)
+                    )
                     if not args:
                         args = pagination_args
                     elif pagination_args:
@@ -44,18 +70,93 @@ class QueryBuilder(BuilderBase):
                 if is_required(build_type.field):
                     mapped_type = GraphQLNonNull(mapped_type)
                 result[field_name] = GraphQLField(
-                    mapped_type, description=description, args=args
+                    mapped_type,
+                    description=description,
+                    args=args,
+                    resolve=self.field_resolver(source, build_type),
+                    extensions=self.field_extensions(build_type),
                 )
+                self.bind(scope, field_name, source, build_type)
         return result
 
+    def field_extensions(self, build_type: BuildType) -> Optional[Dict[str, Any]]:
+        """Cost of a field, and the arguments multiplying the cost of its selections
+
+        Connections are multiplied by their `first` and `last` page arguments.
+        """
+        metadata = build_type.metadata
+        multipliers = metadata.get("multipliers")
+        if multipliers is None and is_connection(build_type.source):
+            multipliers = [
+                arg.name
+                for arg in build_type.source.page_arguments()
+                if arg.name in ("first", "last")
+            ]
+        extensions: Dict[str, Any] = {}
+        if "cost" in metadata:
+            extensions["cost"] = metadata["cost"]
+        if multipliers:
+            extensions["multipliers"] = tuple(
+                to_camel(name) if self.camelcase else name for name in multipliers
+            )
+        return extensions or None
+
+    def field_resolver(
+        self, source: Type[Any], build_type: BuildType
+    ) -> GraphQLFieldResolver:
+        field = build_type.field
+        resolver = build_resolver(
+            source,
+            build_type.source,
+            field.name,
+            field.metadata.get("alias", field.name),
+            build_type.metadata,
+            self.executor,
+        )
+        pool = getattr(resolver, "executor", None)
+        if pool is not None:
+            self.pools.add(pool)
+        return resolver
+
+    def bind(
+        self, scope: str, field_name: str, source: Type[Any], build_type: BuildType
+    ) -> None:
+        """Record the source of a field, to rebind its resolver from a snapshot"""
+        self.bindings.setdefault(scope, {})[field_name] = FieldBinding(
+            source, build_type
+        )
+
     def build_connection(self, source: Type[Any]) -> GraphQLObjectType:
-        fields: GraphQLFieldMap = {}
+        wrapped = getattr(source, "__args__")[0]
+        name = self.type_name(wrapped)
+        connection_name = f"{name}Connection"
+        if connection_name in self.query_types:
+            return self.query_types[connection_name]
         self.build_connection_interface()
         connection_class = getattr(source, "__origin__")
-        wrapped = getattr(source, "__args__")[0]
+        result = GraphQLObjectType(
+            connection_name,
+            description=f"{name} relay connection",
+            fields=self.timed(
+                connection_name,
+                partial(
+                    self.connection_fields, connection_class, wrapped, connection_name
+                ),
+            ),
+            interfaces=(self.interfaces["IConnection"],),
+        )
+        self.query_types[connection_name] = result
+        return result
 
+    def connection_fields(
+        self, connection_class: Type[Any], wrapped: Type[Any], connection_name: str
+    ) -> GraphQLFieldMap:
+        fields: GraphQLFieldMap = {}
         for build_type in self.build_type(connection_class):
             field_name = self.field_name(build_type.field)
+            self.names.fields.add(
+                connection_name, field_name, self.python_name(build_type.field)
+            )
             description = build_type.metadata.get("description", "")
             if (
                 is_sequence(build_type.source)
@@ -74,33 +175,46 @@ class QueryBuilder(BuilderBase):
                 else:
                     mapped_type = self.map_output(build_type.source)
             if mapped_type:
-                args = self.arguments(build_type.metadata.get("arguments"))
+                args = self.arguments(
+                    build_type.metadata.get("arguments"), (connection_name, field_name)
+                )
                 if is_required(build_type.field):
                     mapped_type = GraphQLNonNull(mapped_type)
                 fields[field_name] = GraphQLField(
-                    mapped_type, description=description, args=args
+                    mapped_type,
+                    description=description,
+                    args=args,
+                    resolve=self.field_resolver(connection_class, build_type),
                 )
-        name = self.type_name(wrapped)
-        connection_name = f"{name}Connection"
-        if connection_name in self.query_types:
-            return self.query_types[connection_name]
-        result = GraphQLObjectType(
-            connection_name,
-            description=f"{name} relay connection",
-            fields=fields,
-            interfaces=(self.interfaces["IConnection"],),
-        )
-        self.query_types[connection_name] = result
-        return result
+                self.bind(connection_name, field_name, connection_class, build_type)
+        return fields
 
     def build_connection_edge(
         self, source: Type[IEdge], inner: Type[Any]
     ) -> GraphQLObjectType:
+        edge_name = f"{self.type_name(inner)}Edge"
+        if edge_name in self.query_types:
+            return self.query_types[edge_name]
+        result = GraphQLObjectType(
+            edge_name,
+            fields=self.timed(
+                edge_name, partial(self.edge_fields, source, inner, edge_name)
+            ),
+            interfaces=(self.interfaces["IEdge"],),
+        )
+        self.query_types[edge_name] = result
+        return result
+
+    def edge_fields(
+        self, source: Type[IEdge], inner: Type[Any], edge_name: str
+    ) -> GraphQLFieldMap:
         fields: GraphQLFieldMap = {}
-        name = self.type_name(inner)
-        node_name = f"{name}Node"
+        node_name = f"{self.type_name(inner)}Node"
         for build_type in self.build_type(source):
             field_name = self.field_name(build_type.field)
+            self.names.fields.add(
+                edge_name, field_name, self.python_name(build_type.field)
+            )
             description = build_type.metadata.get("description", "")
             if build_type.source is not INode[T]:
                 mapped_type = self.map_output(build_type.source)
@@ -111,14 +225,17 @@ class QueryBuilder(BuilderBase):
             if mapped_type:
                 if is_required(build_type.field):
                     mapped_type = GraphQLNonNull(mapped_type)
-                args = self.arguments(build_type.metadata.get("arguments"))
+                args = self.arguments(
+                    build_type.metadata.get("arguments"), (edge_name, field_name)
+                )
                 fields[field_name] = GraphQLField(
-                    mapped_type, description=description, args=args
+                    mapped_type,
+                    description=description,
+                    args=args,
+                    resolve=self.field_resolver(source, build_type),
                 )
-        result = GraphQLObjectType(
-            f"{name}Edge", fields=fields, interfaces=(self.interfaces["IEdge"],)
-        )
-        return result
+                self.bind(edge_name, field_name, source, build_type)
+        return fields
 
     def build_connection_interface(self):
         if "INode" not in self.interfaces:
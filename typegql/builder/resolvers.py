@@ -0,0 +1,367 @@
+import inspect
+import logging
+from dataclasses import MISSING
+from functools import partial
+from operator import attrgetter
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple, Type, Union, cast
+
+from graphql import GraphQLFieldResolver, GraphQLResolveInfo, OperationType
+
+from ..cache import ResolverCache
+from ..dataloader import BatchFunction, DataLoader, context_value, freeze, get_loaders
+from ..executors import EXECUTORS, default_executors
+from .utils import is_connection
+
+logger = logging.getLogger(__name__)
+
+
+def resolve_field(
+    source: Any, info: GraphQLResolveInfo, name: str, kwargs: Dict[str, Any]
+) -> Any:
+    """Generic resolution of the python attribute `name` on `source`"""
+    if info.operation.operation is OperationType.MUTATION:
+        mutation = getattr(source, f"mutate_{name}", None)
+        if mutation:
+            return mutation(info, **kwargs)
+
+    dataclass_fields = getattr(source.__class__, "__dataclass_fields__", None)
+    if dataclass_fields is not None:
+        field = dataclass_fields.get(name)
+        if field is not None and is_connection(field.type):
+            func = getattr(field.type, "resolve", None)
+            if func and inspect.ismethod(func):
+                return func(source, name, field.type.__args__[0], info, **kwargs)
+            else:
+                logger.error(f"Expected {func} to be a method. Ignoring")
+
+    if isinstance(source, dict):
+        value = source.get(name)
+    else:
+        many = getattr(source, f"resolve_many_{name}", None)
+        if many is not None:
+            return resolve_one(many, source, info, kwargs)
+        value = getattr(source, f"resolve_{name}", None)
+        if value is None:
+            value = getattr(source, name, None)
+    if callable(value):
+        return value(info, **kwargs)
+    return value
+
+
+def resolve_one(
+    many: Callable, source: Any, info: GraphQLResolveInfo, kwargs: Dict[str, Any]
+) -> Any:
+    """Resolve a single parent with its type's `resolve_many_<name>`"""
+    values = many([source], info, **kwargs)
+    if inspect.isawaitable(values):
+        return first_awaited(values)
+    return values[0]
+
+
+async def first_awaited(values: Any) -> Any:
+    return (await values)[0]
+
+
+def response_path(info: GraphQLResolveInfo) -> Tuple[str, ...]:
+    """The path of the field being resolved, without list indices"""
+    keys = []
+    path = info.path
+    while path is not None:
+        if isinstance(path.key, str):
+            keys.append(path.key)
+        path = path.prev
+    return tuple(keys)
+
+
+def field_default(source: Type[Any], attribute: str) -> Any:
+    """The default value of the dataclass field `attribute`, if it has a plain one"""
+    field = getattr(source, "__dataclass_fields__", {}).get(attribute)
+    if field is None or field.default is MISSING:
+        return None
+    return field.default
+
+
+def inherits(source: Type[Any], *attributes: str) -> Callable[[Any], bool]:
+    """Whether a parent is an instance of `source` sharing its `attributes`
+
+    Subclasses that override any of them resolve through the fallback instead.
+    Each class is checked once.
+    """
+    values = [inspect.getattr_static(source, name, None) for name in attributes]
+    classes: Dict[type, bool] = {source: True}
+
+    def check(parent: Any) -> bool:
+        cls = parent.__class__
+        shared = classes.get(cls)
+        if shared is None:
+            shared = classes[cls] = issubclass(cls, source) and all(
+                inspect.getattr_static(cls, name, None) is value
+                for name, value in zip(attributes, values)
+            )
+        return shared
+
+    return check
+
+
+def fallback_resolver(name: str) -> GraphQLFieldResolver:
+    def resolve(source, info, **kwargs):
+        return resolve_field(source, info, name, kwargs)
+
+    return resolve
+
+
+def attribute_resolver(
+    source: Type[Any], name: str, attribute: str, default: Any = None
+) -> GraphQLFieldResolver:
+    """Read `attribute` of `source` instances, or `name` of dicts
+
+    Dicts without `name` resolve to `default`, the default of the dataclass field.
+    """
+    fallback = fallback_resolver(name)
+    check = inherits(source, f"resolve_{name}", f"resolve_many_{name}")
+
+    def resolve(parent, info, **kwargs):
+        if parent.__class__ is source:
+            value = getattr(parent, attribute, None)
+        elif parent.__class__ is dict:
+            value = parent.get(name, default)
+        elif check(parent):
+            value = getattr(parent, attribute, None)
+        else:
+            return fallback(parent, info, **kwargs)
+        if callable(value):
+            return value(info, **kwargs)
+        return value
+
+    return resolve
+
+
+def method_resolver(
+    source: Type[Any], name: str, method: Callable
+) -> GraphQLFieldResolver:
+    fallback = fallback_resolver(name)
+    check = inherits(source, f"resolve_{name}", f"resolve_many_{name}")
+
+    def resolve(parent, info, **kwargs):
+        if parent.__class__ is not source and not check(parent):
+            return fallback(parent, info, **kwargs)
+        return method(parent, info, **kwargs)
+
+    return resolve
+
+
+def many_resolver(source: Type[Any], name: str, many: Callable) -> GraphQLFieldResolver:
+    """Resolve the parents at the same path with one call of `many`
+
+    `many` is called with the list of parents, the `info` of the first one and
+    the field arguments, and returns the value of each parent in order.
+    Parents are only batched within an execution, identified by the
+    `execution` token of the resolve info.
+    """
+    fallback = fallback_resolver(name)
+    check = inherits(source, f"resolve_many_{name}")
+
+    def resolve(parent, info, **kwargs):
+        if parent.__class__ is not source and not check(parent):
+            return fallback(parent, info, **kwargs)
+        execution = getattr(info, "execution", None)
+        key = (many, execution, response_path(info), freeze(kwargs))
+        loader = get_loaders(info.context).setdefault(
+            key, lambda: DataLoader(partial(many, info=info, **kwargs), cache=False)
+        )
+        return loader.load(parent)
+
+    return resolve
+
+
+def executor_resolver(
+    source: Type[Any], name: str, method: Callable, executor: str
+) -> GraphQLFieldResolver:
+    """Run the synchronous `method` in the schema's `executor` pool"""
+    fallback = fallback_resolver(name)
+    check = inherits(source, f"resolve_{name}", f"resolve_many_{name}")
+
+    def resolve(parent, info, **kwargs):
+        if parent.__class__ is not source and not check(parent):
+            return fallback(parent, info, **kwargs)
+        executors = getattr(info.schema, "executors", default_executors)
+        return executors.submit(executor, method, parent, info, kwargs)
+
+    resolve.executor = executor  # type: ignore
+    return resolve
+
+
+def connection_resolver(
+    source: Type[Any], name: str, connection: Type[Any]
+) -> GraphQLFieldResolver:
+    fallback = fallback_resolver(name)
+    func = connection.resolve
+    wrapped = connection.__args__[0]
+
+    def resolve(parent, info, **kwargs):
+        if parent.__class__ is not source:
+            return fallback(parent, info, **kwargs)
+        return func(parent, name, wrapped, info, **kwargs)
+
+    return resolve
+
+
+def mutation_resolver(
+    source: Type[Any], name: str, resolver: GraphQLFieldResolver, mutation: Callable
+) -> GraphQLFieldResolver:
+    fallback = fallback_resolver(name)
+
+    def resolve(parent, info, **kwargs):
+        if info.operation.operation is not OperationType.MUTATION:
+            return resolver(parent, info, **kwargs)
+        if parent.__class__ is not source:
+            return fallback(parent, info, **kwargs)
+        return mutation(parent, info, **kwargs)
+
+    return resolve
+
+
+async def load_awaited(value: Any, loader: DataLoader) -> Any:
+    return await load_value(await value, loader)
+
+
+def load_value(value: Any, loader: DataLoader) -> Any:
+    if value is None:
+        return None
+    if isinstance(value, (list, tuple)):
+        return loader.load_many(value)
+    return loader.load(value)
+
+
+def batch_resolver(
+    resolver: GraphQLFieldResolver,
+    batch: BatchFunction,
+    key: Union[str, Callable[[Any], Any], None] = None,
+) -> GraphQLFieldResolver:
+    """Route the keys of a field through the request's `DataLoader` of `batch`
+
+    The keys are the value `resolver` returns, or `key(parent)` when given. A list
+    of keys loads a list of values. Field arguments are passed on to `batch`.
+    """
+    get_key = attrgetter(key) if isinstance(key, str) else key
+
+    def resolve(parent, info, **kwargs):
+        loader = get_loaders(info.context).get(batch, **kwargs)
+        if get_key is not None:
+            value = get_key(parent)
+        else:
+            value = resolver(parent, info, **kwargs)
+            if inspect.isawaitable(value):
+                return load_awaited(value, loader)
+        return load_value(value, loader)
+
+    return resolve
+
+
+def offloadable(method: Callable) -> bool:
+    return not (
+        inspect.iscoroutinefunction(method) or inspect.isasyncgenfunction(method)
+    )
+
+
+CACHE_SCOPES = ("global", "request")
+
+
+def cached_resolver(
+    resolver: GraphQLFieldResolver, name: str, options: Mapping[str, Any]
+) -> GraphQLFieldResolver:
+    """Cache the values of `resolver` by parent and arguments
+
+    `options` are the `ResolverCache` arguments and a `scope`: `global` shares
+    the cache between requests, `request` keeps one in each request context,
+    which also caches parents without a key by their `id`.
+    """
+    options = dict(options)
+    scope = options.pop("scope", "global")
+    if scope not in CACHE_SCOPES:
+        raise ValueError(f"Unknown cache scope {scope!r} of {name}")
+
+    if scope == "global":
+        cache = ResolverCache(name, **options)
+
+        def resolve(parent, info, **kwargs):
+            return cache.resolve(resolver, parent, info, kwargs, freeze(kwargs))
+
+        resolve.cache = cache  # type: ignore
+        return resolve
+
+    def resolve_request(parent, info, **kwargs):
+        caches = context_value(info.context, "caches", dict)
+        cache = caches.get(resolve_request)
+        if cache is None:
+            cache = caches[resolve_request] = ResolverCache(
+                name, **{"by_id": True, **options}
+            )
+        return cache.resolve(resolver, parent, info, kwargs, freeze(kwargs))
+
+    return resolve_request
+
+
+def build_resolver(
+    source: Type[Any],
+    field_type: Any,
+    attribute: str,
+    name: Optional[str] = None,
+    metadata: Optional[Mapping[str, Any]] = None,
+    executor: Optional[str] = None,
+) -> GraphQLFieldResolver:
+    """Precompute the dispatch plan of a dataclass field
+
+    `name` is the python name the field is exposed under (its alias, if any), and
+    `attribute` the dataclass attribute holding the value. Sources of any other
+    class than `source`, or of a subclass overriding the resolver method, fall
+    back to the generic `resolve_field`.
+    A `resolve_many_<name>` classmethod takes precedence over `resolve_<name>`.
+    Synchronous `resolve_<name>` methods run in the `executor` pool of the
+    field's metadata, or the default `executor` when it has none.
+    """
+    name = name or attribute
+    metadata = metadata or {}
+    executor = metadata.get("executor", executor)
+    if executor is not None and executor not in EXECUTORS:
+        raise ValueError(f"Unknown executor {executor!r} of {name}")
+    method = inspect.getattr_static(source, f"resolve_{name}", None)
+    many = inspect.getattr_static(source, f"resolve_many_{name}", None)
+    resolver: GraphQLFieldResolver
+    if is_connection(field_type) and inspect.ismethod(
+        getattr(field_type, "resolve", None)
+    ):
+        resolver = connection_resolver(source, name, field_type)
+    elif isinstance(many, (classmethod, staticmethod)):
+        resolver = many_resolver(source, name, getattr(source, f"resolve_many_{name}"))
+    elif inspect.isfunction(method):
+        if executor in (None, "inline"):
+            resolver = method_resolver(source, name, method)
+        elif offloadable(method):
+            resolver = executor_resolver(source, name, method, cast(str, executor))
+        elif "executor" in metadata:
+            raise TypeError(f"Can not run the coroutine resolve_{name} in a pool")
+        else:
+            resolver = method_resolver(source, name, method)
+    elif method is not None:
+        resolver = fallback_resolver(name)
+    else:
+        resolver = attribute_resolver(
+            source, name, attribute, field_default(source, attribute)
+        )
+
+    mutation = inspect.getattr_static(source, f"mutate_{name}", None)
+    if inspect.isfunction(mutation):
+        resolver = mutation_resolver(source, name, resolver, mutation)
+    elif mutation is not None:
+        resolver = fallback_resolver(name)
+
+    batch = metadata.get("batch")
+    if batch is not None:
+        resolver = batch_resolver(resolver, batch, metadata.get("batch_key"))
+    cache = metadata.get("cache")
+    if cache is not None:
+        resolver = cached_resolver(
+            resolver, f"{source.__name__}.{name}", {} if cache is True else cache
+        )
+    return resolver
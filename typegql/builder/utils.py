@@ -1,10 +1,21 @@
 from dataclasses import MISSING, Field
 from enum import Enum
-from typing import Any, Callable, Dict, List, MutableSequence, Sequence, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    MutableSequence,
+    Optional,
+    Sequence,
+    Union,
+)
 
 from graphql.pyutils import camel_to_snake
 
 from .connection import IConnection
+from .names import rename
 
 
 def is_sequence(_type: Any) -> bool:
@@ -70,6 +81,10 @@ def to_snake(arguments: Dict) -> Dict[str, Any]:
     return result
 
 
-def load(data: Dict[str, Any], callback: Callable[..., Any], camelcase: bool) -> Any:
-    data = data if not camelcase else to_snake(data)
+def load(
+    data: Dict[str, Any],
+    callback: Callable[..., Any],
+    names: Optional[Mapping[str, str]] = None,
+) -> Any:
+    data = data if names is None else rename(names, data)
     return callback(**data)
@@ -0,0 +1,197 @@
+import asyncio
+from abc import ABCMeta, abstractmethod
+from collections import OrderedDict
+from functools import partial
+from inspect import isawaitable
+from time import monotonic
+from typing import Any, Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+__all__ = ("CacheBackend", "LRUCache", "MemoryCache", "ResolverCache")
+
+V = TypeVar("V")
+MISSING = object()
+
+
+class LRUCache(Generic[V]):
+    """Bounded mapping evicting the least recently used entry when full
+
+    A `maxsize` of `0` disables caching, `None` makes the cache unbounded.
+    """
+
+    def __init__(self, maxsize: Optional[int] = 128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: "OrderedDict[Hashable, V]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def get(self, key: Hashable, default: Optional[V] = None) -> Optional[V]:
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: V) -> None:
+        if self.maxsize == 0:
+            return
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if self.maxsize is not None and len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: Hashable, default: Optional[V] = None) -> Optional[V]:
+        return self._data.pop(key, default)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class CacheBackend(metaclass=ABCMeta):
+    """Storage of `ResolverCache` values
+
+    `get` returns `MISSING` for unknown or expired keys.
+    """
+
+    @abstractmethod
+    def get(self, key: Hashable) -> Any:
+        pass
+
+    @abstractmethod
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        pass
+
+    def stats(self) -> Dict[str, int]:
+        return {}
+
+
+class MemoryCache(CacheBackend):
+    """In process LRU backend, expiring entries after their `ttl` in seconds"""
+
+    def __init__(self, maxsize: Optional[int] = 10000):
+        self.entries: LRUCache[Tuple[Optional[float], Any]] = LRUCache(maxsize)
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Any:
+        entry = self.entries.get(key)
+        if entry is None:
+            return MISSING
+        expires, value = entry
+        if expires is not None and expires <= monotonic():
+            self.entries.pop(key)
+            self.entries.hits -= 1
+            self.entries.misses += 1
+            self.expirations += 1
+            return MISSING
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        expires = monotonic() + ttl if ttl is not None else None
+        self.entries.set(key, (expires, value))
+
+    def stats(self) -> Dict[str, int]:
+        return {**self.entries.stats(), "expirations": self.expirations}
+
+
+def identity(parent: Any) -> Optional[Hashable]:
+    """Cache key of a parent: itself when hashable, else its class and `id`"""
+    try:
+        hash(parent)
+    except TypeError:
+        pass
+    else:
+        return parent
+    key = getattr(parent, "id", None)
+    if key is not None:
+        return parent.__class__, key
+    return None
+
+
+class ResolverCache:
+    """Caches the values of a field by parent and arguments
+
+    Parents are identified by `key(parent)`, by default themselves when hashable
+    or their class and `id` attribute. Parents of the root type share a single
+    entry. Other parents without a key are only cached when `by_id` is true, by
+    their `id`, which suits caches that live no longer than a request.
+    Concurrent misses of an async resolver share the same pending call.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttl: Optional[float] = None,
+        max_entries: Optional[int] = 10000,
+        backend: Optional[CacheBackend] = None,
+        key: Optional[Callable[[Any], Optional[Hashable]]] = None,
+        by_id: bool = False,
+    ):
+        self.name = name
+        self.ttl = ttl
+        self.backend = backend or MemoryCache(max_entries)
+        self.key = key or identity
+        self.by_id = by_id
+        self.pending: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self.shared = 0
+
+    def resolve(
+        self,
+        resolver: Callable[..., Any],
+        parent: Any,
+        info: Any,
+        kwargs: Dict[str, Any],
+        arguments: Hashable,
+    ) -> Any:
+        parent_key = self.key(parent)
+        alive = None
+        if parent_key is None:
+            if info.path.prev is None:
+                parent_key = parent.__class__
+            elif self.by_id:
+                parent_key, alive = ("id", id(parent)), parent
+            else:
+                return resolver(parent, info, **kwargs)
+        key = (self.name, parent_key, arguments)
+        entry = self.backend.get(key)
+        if entry is not MISSING:
+            value, owner = entry
+            if owner is alive:
+                return value
+        pending = self.pending.get(key)
+        if pending is not None:
+            self.shared += 1
+            return pending
+        value = resolver(parent, info, **kwargs)
+        if not isawaitable(value):
+            self.backend.set(key, (value, alive), self.ttl)
+            return value
+        future = asyncio.ensure_future(value)
+        self.pending[key] = future
+        future.add_done_callback(partial(self.store, key, alive))
+        return future
+
+    def store(self, key: Hashable, alive: Any, future: "asyncio.Future[Any]"):
+        self.pending.pop(key, None)
+        if not future.cancelled() and future.exception() is None:
+            self.backend.set(key, (future.result(), alive), self.ttl)
+
+    def stats(self) -> Dict[str, int]:
+        return {**self.backend.stats(), "shared": self.shared}
@@ -1,3 +1,10 @@
-from .client import Client
+from typing import TYPE_CHECKING
+
+from ..lazy import lazy_exports
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .client import Client
 
 __all__ = ("Client",)
+
+__getattr__, __dir__ = lazy_exports(__name__, {"Client": ".client"})
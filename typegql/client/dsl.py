@@ -15,15 +15,18 @@ from graphql import (
     print_ast,
 )
 from graphql.language import ast
-from graphql.pyutils import FrozenList, snake_to_camel
+from graphql.pyutils import FrozenList
+
+from typegql.builder.names import to_camel
 
 
 class DSLField:
-    def __init__(self, name, f, camelcase=True):
+    def __init__(self, name, f, camelcase=True, argument_names=None):
         self.field = f
         self.ast_field = ast.FieldNode(name=ast.NameNode(value=name), arguments=[])
         self.selection_set = None
         self.camelcase = camelcase
+        self.argument_names = argument_names or {}
 
     def select(self, *fields):
         selection_nodes = list(selections(*fields))
@@ -48,7 +51,7 @@ class DSLField:
 
     def args(self, **kwargs):
         if self.camelcase:
-            self.args_to_camelcase(kwargs)
+            self.args_to_camelcase(kwargs, self.argument_names)
         argument_nodes = list()
         for name, value in kwargs.items():
             arg = self.field.args.get(name)
@@ -65,15 +68,16 @@ class DSLField:
         self.ast_field.arguments = FrozenList(argument_nodes)
         return self
 
-    def args_to_camelcase(self, arguments):
+    def args_to_camelcase(self, arguments, names=None):
         if not isinstance(arguments, dict):
             return
+        names = names or {}
         keys = [k for k in arguments.keys()]
         for key in keys:
             if isinstance(arguments[key], list):
                 for arg in arguments[key]:
                     self.args_to_camelcase(arg)
-            arguments[snake_to_camel(key, upper=False)] = arguments.pop(key)
+            arguments[names.get(key) or to_camel(key)] = arguments.pop(key)
 
     @property
     def ast(self):
@@ -85,30 +89,50 @@ class DSLField:
 
 
 class DSLType(object):
-    def __init__(self, _type, camelcase=True):
+    def __init__(self, _type, camelcase=True, names=None):
         self.type = _type
         self.camelcase = camelcase
+        self.names = names
 
     def __getattr__(self, name):
         formatted_name, field_def = self.get_field(name)
-        return DSLField(formatted_name, field_def, camelcase=self.camelcase)
+        argument_names = None
+        if self.names:
+            scope = self.type.name, formatted_name
+            argument_names = self.names.arguments.graphql.get(scope)
+        return DSLField(
+            formatted_name,
+            field_def,
+            camelcase=self.camelcase,
+            argument_names=argument_names,
+        )
 
     def get_field(self, name):
         if self.camelcase:
-            name = snake_to_camel(name, upper=False)
+            if self.names:
+                name = self.names.fields.to_graphql(self.type.name, name)
+            else:
+                name = to_camel(name)
         if name in self.type.fields:
             return name, self.type.fields[name]
         raise KeyError("Field {} doesnt exist in type {}.".format(name, self.type.name))
 
 
 class DSLSchema(object):
-    def __init__(self, schema, camelcase=True):
+    """Query builder for `schema`
+
+    `names` is the `NameMap` of a typegql `Schema`, and is picked up from the
+    schema itself when not given. Without it names are converted to camelcase.
+    """
+
+    def __init__(self, schema, camelcase=True, names=None):
         self.schema = schema
         self.camelcase = camelcase
+        self.names = names or getattr(schema, "names", None)
 
     def __getattr__(self, name):
         type_def = self.schema.get_type(name)
-        return DSLType(type_def, self.camelcase)
+        return DSLType(type_def, self.camelcase, self.names)
 
     def query(self, *fields, operation=OperationType.QUERY) -> ast.DocumentNode:
         return ast.DocumentNode(
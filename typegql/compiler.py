@@ -0,0 +1,749 @@
+from asyncio import gather
+from collections.abc import Iterable
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple, cast
+
+from graphql import (
+    DocumentNode,
+    ExecutionResult,
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    GraphQLAbstractType,
+    GraphQLError,
+    GraphQLField,
+    GraphQLFieldResolver,
+    GraphQLIncludeDirective,
+    GraphQLLeafType,
+    GraphQLList,
+    GraphQLNonNull,
+    GraphQLObjectType,
+    GraphQLOutputType,
+    GraphQLResolveInfo,
+    GraphQLSchema,
+    GraphQLSkipDirective,
+    InlineFragmentNode,
+    Node,
+    OperationDefinitionNode,
+    OperationType,
+    SelectionNode,
+    SelectionSetNode,
+    VariableNode,
+    get_operation_root_type,
+    is_abstract_type,
+    is_leaf_type,
+    is_list_type,
+    is_non_null_type,
+    is_object_type,
+    located_error,
+    type_from_ast,
+)
+from graphql.execution.execute import (
+    default_field_resolver,
+    default_type_resolver,
+    get_field_def,
+    get_field_entry_key,
+    invalid_return_type_error,
+)
+from graphql.execution.values import get_directive_values, get_variable_values
+from graphql.pyutils import FrozenList, Path, Undefined, inspect
+from graphql.pyutils import is_awaitable as default_is_awaitable
+
+from .cost import CostAnalyzer
+from .execution import (
+    MAX_BUFFERED_ITEMS,
+    TGQLExecutionResult,
+    TGQLResolveInfo,
+    coerce_arguments,
+    complete_async_items,
+    is_async_iterable,
+    is_introspection_field,
+)
+
+__all__ = ("CompiledQuery",)
+
+Completer = Callable[["Execution", GraphQLResolveInfo, Path, Any], Any]
+
+
+def has_variables(node: Node) -> bool:
+    if isinstance(node, VariableNode):
+        return True
+    for key in node.keys:
+        value = getattr(node, key, None)
+        if isinstance(value, Node):
+            if has_variables(value):
+                return True
+        elif isinstance(value, (list, tuple)):
+            if any(isinstance(v, Node) and has_variables(v) for v in value):
+                return True
+    return False
+
+
+def directive_variables(node: Node, result: Set[str]) -> Set[str]:
+    """Names of the variables `@skip` and `@include` depend on"""
+    for directive in getattr(node, "directives", None) or ():
+        if directive.name.value in ("skip", "include"):
+            for argument in directive.arguments or ():
+                if isinstance(argument.value, VariableNode):
+                    result.add(argument.value.name.value)
+    selection_set = getattr(node, "selection_set", None)
+    if selection_set:
+        for selection in selection_set.selections:
+            directive_variables(selection, result)
+    return result
+
+
+class FieldPlan:
+    __slots__ = (
+        "response_key",
+        "field_name",
+        "field_nodes",
+        "field_def",
+        "parent_type",
+        "return_type",
+        "resolve",
+        "arguments",
+        "complete",
+    )
+
+    def __init__(
+        self,
+        query: "CompiledQuery",
+        parent_type: GraphQLObjectType,
+        response_key: str,
+        field_nodes: List[FieldNode],
+        field_def: GraphQLField,
+    ):
+        self.response_key = response_key
+        self.field_name = field_nodes[0].name.value
+        self.field_nodes = field_nodes
+        self.field_def = field_def
+        self.parent_type = parent_type
+        self.return_type = field_def.type
+        self.resolve = field_def.resolve or query.field_resolver
+        if query.resolver is not None and not is_introspection_field(
+            parent_type, self.field_name
+        ):
+            self.resolve = query.resolver
+        self.arguments: Optional[Dict[str, Any]] = None
+        if not has_variables(field_nodes[0]):
+            try:
+                self.arguments = coerce_arguments(
+                    query.schema, parent_type, field_def, field_nodes[0], {}
+                )
+            except Exception:  # nosec - raised again on execution
+                pass
+        self.complete = query.completer(field_def.type, field_nodes)
+
+
+class SelectionPlan:
+    """Fields collected for an object type, per set of `@skip`/`@include` values"""
+
+    __slots__ = ("query", "parent_type", "selection_sets", "plans")
+
+    def __init__(
+        self,
+        query: "CompiledQuery",
+        parent_type: GraphQLObjectType,
+        selection_sets: Sequence[SelectionSetNode],
+    ):
+        self.query = query
+        self.parent_type = parent_type
+        self.selection_sets = selection_sets
+        self.plans: Dict[Tuple, List[FieldPlan]] = {}
+
+    def fields(self, execution: "Execution") -> List[FieldPlan]:
+        plans = self.plans.get(execution.signature)
+        if plans is None:
+            plans = self.plans[execution.signature] = self.collect(execution)
+        return plans
+
+    def collect(self, execution: "Execution") -> List[FieldPlan]:
+        fields: Dict[str, List[FieldNode]] = {}
+        visited: Set[str] = set()
+        for selection_set in self.selection_sets:
+            self.query.collect_fields(
+                self.parent_type, selection_set, fields, visited, execution.variables
+            )
+        plans = []
+        for response_key, field_nodes in fields.items():
+            field_def = get_field_def(
+                self.query.schema, self.parent_type, field_nodes[0].name.value
+            )
+            if field_def:
+                plans.append(
+                    FieldPlan(
+                        self.query,
+                        self.parent_type,
+                        response_key,
+                        field_nodes,
+                        field_def,
+                    )
+                )
+        return plans
+
+
+class CompiledQuery:
+    """A single operation compiled into specialized executor closures
+
+    Field definitions, resolvers, static arguments and leaf serializers are looked
+    up once, the first time a selection is reached, and reused for every call.
+    `resolver`, when given, resolves every field but introspection ones, in
+    place of their own resolvers.
+    """
+
+    def __init__(
+        self,
+        schema: GraphQLSchema,
+        document: DocumentNode,
+        operation_name: Optional[str] = None,
+        field_resolver: Optional[GraphQLFieldResolver] = None,
+        root_factory: Optional[Callable[[], Any]] = None,
+        cost: Optional[CostAnalyzer] = None,
+        resolver: Optional[GraphQLFieldResolver] = None,
+    ):
+        operation: Optional[OperationDefinitionNode] = None
+        self.fragments: Dict[str, FragmentDefinitionNode] = {}
+        for definition in document.definitions:
+            if isinstance(definition, OperationDefinitionNode):
+                if operation_name is None:
+                    if operation:
+                        raise GraphQLError(
+                            "Must provide operation name"
+                            " if query contains multiple operations."
+                        )
+                    operation = definition
+                elif definition.name and definition.name.value == operation_name:
+                    operation = definition
+            elif isinstance(definition, FragmentDefinitionNode):
+                self.fragments[definition.name.value] = definition
+        if not operation:
+            if operation_name is not None:
+                raise GraphQLError(f"Unknown operation named '{operation_name}'.")
+            raise GraphQLError("Must provide an operation.")
+        if operation.operation == OperationType.SUBSCRIPTION:
+            raise GraphQLError("Subscriptions can not be compiled.")
+
+        self.schema = schema
+        self.document = document
+        self.operation = operation
+        self.field_resolver = field_resolver or default_field_resolver
+        self.resolver = resolver
+        self.root_factory = root_factory
+        self.cost = cost
+        self.serial = operation.operation == OperationType.MUTATION
+        self.root_type = get_operation_root_type(schema, operation)
+        self.root = SelectionPlan(self, self.root_type, [operation.selection_set])
+
+        variables: Set[str] = set()
+        directive_variables(operation, variables)
+        for fragment in self.fragments.values():
+            directive_variables(fragment, variables)
+        self.directive_variables = tuple(sorted(variables))
+
+    async def __call__(
+        self,
+        root: Any = None,
+        context: Any = None,
+        variables: Optional[Dict[str, Any]] = None,
+    ) -> ExecutionResult:
+        coerced = get_variable_values(
+            self.schema,
+            self.operation.variable_definitions or FrozenList(),
+            variables or {},
+            max_errors=50,
+        )
+        extensions = None
+        if self.cost:
+            name = self.operation.name.value if self.operation.name else None
+            values = (variables or {}) if isinstance(coerced, list) else coerced
+            cost = self.cost.analyze(self, self.document, name, values)
+            extensions = {"cost": cost._asdict()}
+            errors = self.cost.validate(cost)
+            if errors:
+                return TGQLExecutionResult(None, errors, extensions)
+        if isinstance(coerced, list):
+            return TGQLExecutionResult(None, coerced, extensions)
+        if root is None and self.root_factory:
+            root = self.root_factory()
+        if context is None:
+            context = {}
+        execution = Execution(self, root, context, coerced)
+        data = execution.execute_operation()
+        if default_is_awaitable(data):
+            data = await data
+        return TGQLExecutionResult(data, execution.errors or None, extensions)
+
+    def collect_fields(
+        self,
+        runtime_type: GraphQLObjectType,
+        selection_set: SelectionSetNode,
+        fields: Dict[str, List[FieldNode]],
+        visited_fragment_names: Set[str],
+        variables: Dict[str, Any],
+    ) -> Dict[str, List[FieldNode]]:
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                if not self.should_include_node(selection, variables):
+                    continue
+                name = get_field_entry_key(selection)
+                fields.setdefault(name, []).append(selection)
+            elif isinstance(selection, InlineFragmentNode):
+                if not self.should_include_node(
+                    selection, variables
+                ) or not self.does_fragment_condition_match(selection, runtime_type):
+                    continue
+                self.collect_fields(
+                    runtime_type,
+                    selection.selection_set,
+                    fields,
+                    visited_fragment_names,
+                    variables,
+                )
+            elif isinstance(selection, FragmentSpreadNode):
+                frag_name = selection.name.value
+                if frag_name in visited_fragment_names or not self.should_include_node(
+                    selection, variables
+                ):
+                    continue
+                visited_fragment_names.add(frag_name)
+                fragment = self.fragments.get(frag_name)
+                if not fragment or not self.does_fragment_condition_match(
+                    fragment, runtime_type
+                ):
+                    continue
+                self.collect_fields(
+                    runtime_type,
+                    fragment.selection_set,
+                    fields,
+                    visited_fragment_names,
+                    variables,
+                )
+        return fields
+
+    @staticmethod
+    def should_include_node(node: SelectionNode, variables: Dict[str, Any]) -> bool:
+        if not getattr(node, "directives", None):
+            return True
+        skip = get_directive_values(GraphQLSkipDirective, node, variables)
+        if skip and skip["if"]:
+            return False
+        include = get_directive_values(GraphQLIncludeDirective, node, variables)
+        if include and not include["if"]:
+            return False
+        return True
+
+    def does_fragment_condition_match(
+        self, fragment: Any, type_: GraphQLObjectType,
+    ) -> bool:
+        type_condition_node = fragment.type_condition
+        if not type_condition_node:
+            return True
+        conditional_type = type_from_ast(self.schema, type_condition_node)
+        if conditional_type is type_:
+            return True
+        if is_abstract_type(conditional_type):
+            return self.schema.is_sub_type(
+                cast(GraphQLAbstractType, conditional_type), type_
+            )
+        return False
+
+    def completer(
+        self, return_type: GraphQLOutputType, field_nodes: List[FieldNode]
+    ) -> Completer:
+        """Build the function completing values of `return_type`"""
+        if is_non_null_type(return_type):
+            return self.non_null_completer(
+                cast(GraphQLNonNull, return_type), field_nodes
+            )
+        if is_list_type(return_type):
+            return self.list_completer(cast(GraphQLList, return_type), field_nodes)
+        if is_leaf_type(return_type):
+            return self.leaf_completer(cast(GraphQLLeafType, return_type))
+        if is_abstract_type(return_type):
+            return self.abstract_completer(
+                cast(GraphQLAbstractType, return_type), field_nodes
+            )
+        if is_object_type(return_type):
+            return self.object_completer(
+                cast(GraphQLObjectType, return_type), field_nodes
+            )
+        raise TypeError(  # pragma: no cover
+            "Cannot complete value of unexpected output type:"
+            f" '{inspect(return_type)}'."
+        )
+
+    def non_null_completer(
+        self, return_type: GraphQLNonNull, field_nodes: List[FieldNode]
+    ) -> Completer:
+        inner = self.completer(return_type.of_type, field_nodes)
+
+        def check(info, completed):
+            if completed is None:
+                raise TypeError(
+                    "Cannot return null for non-nullable field"
+                    f" {info.parent_type.name}.{info.field_name}."
+                )
+            return completed
+
+        def complete(execution, info, path, result):
+            completed = inner(execution, info, path, result)
+            if default_is_awaitable(completed):
+
+                async def await_completed():
+                    return check(info, await completed)
+
+                return await_completed()
+            return check(info, completed)
+
+        return complete
+
+    def list_completer(
+        self, return_type: GraphQLList, field_nodes: List[FieldNode]
+    ) -> Completer:
+        item_type = return_type.of_type
+        complete_item = self.completer(item_type, field_nodes)
+        max_buffered = getattr(self.schema, "max_buffered_items", MAX_BUFFERED_ITEMS)
+
+        def complete(execution, info, path, result):
+            if result is None or result is Undefined:
+                return None
+            if is_async_iterable(result):
+                return complete_async_items(
+                    result,
+                    lambda index, item: execution.complete_catching(
+                        complete_item,
+                        item_type,
+                        field_nodes,
+                        info,
+                        path.add_key(index),
+                        item,
+                    ),
+                    max_buffered,
+                )
+            if not isinstance(result, Iterable) or isinstance(result, str):
+                raise GraphQLError(
+                    "Expected Iterable, but did not find one for field"
+                    f" '{info.parent_type.name}.{info.field_name}'."
+                )
+            complete_catching = execution.complete_catching
+            awaitable_indices: List[int] = []
+            completed_results: List[Any] = []
+            for index, item in enumerate(result):
+                completed = complete_catching(
+                    complete_item,
+                    item_type,
+                    field_nodes,
+                    info,
+                    path.add_key(index),
+                    item,
+                )
+                if default_is_awaitable(completed):
+                    awaitable_indices.append(index)
+                completed_results.append(completed)
+            if not awaitable_indices:
+                return completed_results
+
+            async def get_completed_results():
+                values = await gather(
+                    *(completed_results[index] for index in awaitable_indices)
+                )
+                for index, value in zip(awaitable_indices, values):
+                    completed_results[index] = value
+                return completed_results
+
+            return get_completed_results()
+
+        return complete
+
+    @staticmethod
+    def leaf_completer(return_type: GraphQLLeafType) -> Completer:
+        serialize = return_type.serialize
+
+        def complete(execution, info, path, result):
+            if result is None or result is Undefined:
+                return None
+            serialized = serialize(result)
+            if serialized is Undefined:
+                raise TypeError(
+                    f"Expected a value of type '{inspect(return_type)}'"
+                    f" but received: {inspect(result)}"
+                )
+            return serialized
+
+        return complete
+
+    def object_completer(
+        self, return_type: GraphQLObjectType, field_nodes: List[FieldNode]
+    ) -> Completer:
+        selection = SelectionPlan(
+            self,
+            return_type,
+            [node.selection_set for node in field_nodes if node.selection_set],
+        )
+        is_type_of = return_type.is_type_of
+
+        def complete(execution, info, path, result):
+            if result is None or result is Undefined:
+                return None
+            if is_type_of:
+                matches = is_type_of(result, info)
+                if default_is_awaitable(matches):
+
+                    async def await_is_type_of():
+                        if not await matches:
+                            raise invalid_return_type_error(
+                                return_type, result, field_nodes
+                            )
+                        value = execution.execute_fields(selection, result, path)
+                        if default_is_awaitable(value):
+                            return await value
+                        return value
+
+                    return await_is_type_of()
+                if not matches:
+                    raise invalid_return_type_error(return_type, result, field_nodes)
+            return execution.execute_fields(selection, result, path)
+
+        return complete
+
+    def abstract_completer(
+        self, return_type: GraphQLAbstractType, field_nodes: List[FieldNode]
+    ) -> Completer:
+        completers: Dict[str, Completer] = {}
+        resolve_type = return_type.resolve_type or default_type_resolver
+
+        def complete_runtime(execution, info, path, result, runtime_type):
+            runtime_type = self.ensure_valid_runtime_type(
+                runtime_type, return_type, field_nodes, info, result
+            )
+            complete_object = completers.get(runtime_type.name)
+            if complete_object is None:
+                complete_object = completers[runtime_type.name] = self.object_completer(
+                    runtime_type, field_nodes
+                )
+            return complete_object(execution, info, path, result)
+
+        def complete(execution, info, path, result):
+            if result is None or result is Undefined:
+                return None
+            runtime_type = resolve_type(result, info, return_type)
+            if default_is_awaitable(runtime_type):
+
+                async def await_runtime_type():
+                    value = complete_runtime(
+                        execution, info, path, result, await runtime_type
+                    )
+                    if default_is_awaitable(value):
+                        return await value
+                    return value
+
+                return await_runtime_type()
+            return complete_runtime(execution, info, path, result, runtime_type)
+
+        return complete
+
+    def ensure_valid_runtime_type(
+        self,
+        runtime_type_or_name: Any,
+        return_type: GraphQLAbstractType,
+        field_nodes: List[FieldNode],
+        info: GraphQLResolveInfo,
+        result: Any,
+    ) -> GraphQLObjectType:
+        runtime_type = (
+            self.schema.get_type(runtime_type_or_name)
+            if isinstance(runtime_type_or_name, str)
+            else runtime_type_or_name
+        )
+        if not is_object_type(runtime_type):
+            raise GraphQLError(
+                f"Abstract type '{return_type.name}' must resolve"
+                " to an Object type at runtime"
+                f" for field '{info.parent_type.name}.{info.field_name}'"
+                f" with value {inspect(result)}, received '{inspect(runtime_type)}'."
+                f" Either the '{return_type.name}' type should provide"
+                " a 'resolve_type' function or each possible type should"
+                " provide an 'is_type_of' function.",
+                field_nodes,
+            )
+        runtime_type = cast(GraphQLObjectType, runtime_type)
+        if not self.schema.is_sub_type(return_type, runtime_type):
+            raise GraphQLError(
+                f"Runtime Object type '{runtime_type.name}' is not a possible"
+                f" type for '{return_type.name}'.",
+                field_nodes,
+            )
+        return runtime_type
+
+
+class Execution:
+    """State of a single call of a `CompiledQuery`"""
+
+    __slots__ = (
+        "query",
+        "root",
+        "context",
+        "variables",
+        "signature",
+        "errors",
+        "arguments",
+    )
+
+    def __init__(
+        self, query: CompiledQuery, root: Any, context: Any, variables: Dict[str, Any],
+    ):
+        self.query = query
+        self.root = root
+        self.context = context
+        self.variables = variables
+        self.signature = tuple(
+            variables.get(name) for name in query.directive_variables
+        )
+        self.errors: List[GraphQLError] = []
+        self.arguments: Dict[int, Dict[str, Any]] = {}
+
+    def execute_operation(self) -> Any:
+        query = self.query
+        try:
+            if query.serial:
+                result = self.execute_fields_serially(query.root, self.root, None)
+            else:
+                result = self.execute_fields(query.root, self.root, None)
+        except GraphQLError as error:
+            self.errors.append(error)
+            return None
+        if default_is_awaitable(result):
+
+            async def await_result():
+                try:
+                    return await result
+                except GraphQLError as error:
+                    self.errors.append(error)
+
+            return await_result()
+        return result
+
+    def execute_fields(
+        self, selection: SelectionPlan, source: Any, path: Optional[Path]
+    ) -> Any:
+        results = {}
+        awaitable_fields: List[str] = []
+        for plan in selection.fields(self):
+            result = self.execute_field(plan, source, Path(path, plan.response_key))
+            results[plan.response_key] = result
+            if default_is_awaitable(result):
+                awaitable_fields.append(plan.response_key)
+        if not awaitable_fields:
+            return results
+
+        async def get_results():
+            values = await gather(*(results[key] for key in awaitable_fields))
+            results.update(zip(awaitable_fields, values))
+            return results
+
+        return get_results()
+
+    def execute_fields_serially(
+        self, selection: SelectionPlan, source: Any, path: Optional[Path]
+    ) -> Any:
+        async def get_results():
+            results = {}
+            for plan in selection.fields(self):
+                result = self.execute_field(plan, source, Path(path, plan.response_key))
+                if default_is_awaitable(result):
+                    result = await result
+                results[plan.response_key] = result
+            return results
+
+        return get_results()
+
+    def execute_field(self, plan: FieldPlan, source: Any, path: Path) -> Any:
+        query = self.query
+        info = TGQLResolveInfo(
+            plan.field_name,
+            plan.field_nodes,
+            plan.return_type,
+            plan.parent_type,
+            path,
+            query.schema,
+            query.fragments,
+            self.root,
+            query.operation,
+            self.variables,
+            self.context,
+            default_is_awaitable,
+        )
+        info.execution = self
+        try:
+            arguments = plan.arguments
+            if arguments is None:
+                arguments = self.arguments.get(id(plan))
+            if arguments is None:
+                arguments = self.arguments[id(plan)] = coerce_arguments(
+                    query.schema,
+                    plan.parent_type,
+                    plan.field_def,
+                    plan.field_nodes[0],
+                    self.variables,
+                )
+            result = plan.resolve(source, info, **arguments)
+        except Exception as error:
+            result = error
+        return self.complete_catching(
+            plan.complete, plan.return_type, plan.field_nodes, info, path, result
+        )
+
+    def complete_catching(
+        self,
+        complete: Completer,
+        return_type: GraphQLOutputType,
+        field_nodes: List[FieldNode],
+        info: GraphQLResolveInfo,
+        path: Path,
+        result: Any,
+    ) -> Any:
+        try:
+            if default_is_awaitable(result):
+
+                async def await_result():
+                    try:
+                        value = await result
+                    except Exception as error:
+                        value = error
+                    if isinstance(value, Exception):
+                        raise value
+                    completed = complete(self, info, path, value)
+                    if default_is_awaitable(completed):
+                        return await completed
+                    return completed
+
+                completed = await_result()
+            else:
+                if isinstance(result, Exception):
+                    raise result
+                completed = complete(self, info, path, result)
+            if default_is_awaitable(completed):
+
+                async def await_completed():
+                    try:
+                        return await completed
+                    except Exception as error:
+                        self.handle_field_error(error, field_nodes, path, return_type)
+
+                return await_completed()
+            return completed
+        except Exception as error:
+            self.handle_field_error(error, field_nodes, path, return_type)
+            return None
+
+    def handle_field_error(
+        self,
+        raw_error: Exception,
+        field_nodes: List[FieldNode],
+        path: Path,
+        return_type: GraphQLOutputType,
+    ) -> None:
+        error = located_error(raw_error, field_nodes, path.as_list())
+        if is_non_null_type(return_type):
+            raise error
+        self.errors.append(error)
@@ -0,0 +1,214 @@
+from typing import Any, Dict, Hashable, List, NamedTuple, Optional, Set, Tuple
+
+from graphql import (
+    DocumentNode,
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    GraphQLError,
+    GraphQLSchema,
+    InlineFragmentNode,
+    IntValueNode,
+    OperationDefinitionNode,
+    SelectionSetNode,
+    VariableNode,
+    get_named_type,
+    get_operation_root_type,
+    is_composite_type,
+)
+
+from .cache import LRUCache
+
+__all__ = ("CostAnalyzer", "QueryCost", "QueryTooComplex")
+
+# Costs computed for distinct variable values of a single document
+MAX_VARIANTS = 64
+
+
+class QueryCost(NamedTuple):
+    depth: int
+    cost: int
+
+
+class QueryTooComplex(GraphQLError):
+    def __init__(self, message: str, node: Optional[Any] = None):
+        super().__init__(message, node, extensions={"code": "QUERY_TOO_COMPLEX"})
+
+
+class CostPlan(NamedTuple):
+    variables: Tuple[str, ...]
+    costs: Dict[Hashable, QueryCost]
+
+
+class CostWalker:
+    """Computes the depth and cost of one operation
+
+    Every field costs its `cost` extension, which defaults to `1` for objects
+    and `0` for scalars. The cost of its selections is multiplied by the
+    largest value given to its `multipliers` arguments. Introspection fields
+    are free. Conditional selections are counted, making the cost an upper bound.
+    """
+
+    def __init__(
+        self,
+        schema: GraphQLSchema,
+        fragments: Dict[str, FragmentDefinitionNode],
+        variables: Dict[str, Any],
+        defaults: Dict[str, Any],
+    ):
+        self.schema = schema
+        self.fragments = fragments
+        self.variables = variables
+        self.defaults = defaults
+        self.used: Set[str] = set()
+
+    def selection_set(
+        self, parent_type: Any, selection_set: SelectionSetNode, depth: int
+    ) -> QueryCost:
+        max_depth, total = depth, 0
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                cost = self.field(parent_type, selection, depth + 1)
+            elif isinstance(selection, InlineFragmentNode):
+                fragment_type = parent_type
+                if selection.type_condition:
+                    name = selection.type_condition.name.value
+                    fragment_type = self.schema.get_type(name)
+                cost = self.selection_set(fragment_type, selection.selection_set, depth)
+            elif isinstance(selection, FragmentSpreadNode):
+                fragment = self.fragments.get(selection.name.value)
+                if fragment is None:
+                    continue
+                fragment_type = self.schema.get_type(fragment.type_condition.name.value)
+                cost = self.selection_set(fragment_type, fragment.selection_set, depth)
+            else:
+                continue
+            max_depth = max(max_depth, cost.depth)
+            total += cost.cost
+        return QueryCost(max_depth, total)
+
+    def field(self, parent_type: Any, node: FieldNode, depth: int) -> QueryCost:
+        name = node.name.value
+        fields = getattr(parent_type, "fields", None)
+        if name.startswith("__") or not fields or name not in fields:
+            return QueryCost(0, 0)
+        field_def = fields[name]
+        field_type = get_named_type(field_def.type)
+        extensions = field_def.extensions or {}
+        cost = extensions.get("cost", 1 if is_composite_type(field_type) else 0)
+        if not node.selection_set:
+            return QueryCost(depth, cost)
+        selections = self.selection_set(field_type, node.selection_set, depth)
+        multiplier = self.multiplier(node, extensions.get("multipliers"))
+        return QueryCost(selections.depth, cost + multiplier * selections.cost)
+
+    def multiplier(self, node: FieldNode, names: Optional[Tuple[str, ...]]) -> int:
+        if not names:
+            return 1
+        result = 1
+        for argument in node.arguments or ():
+            if argument.name.value not in names:
+                continue
+            value: Any = None
+            if isinstance(argument.value, VariableNode):
+                variable = argument.value.name.value
+                self.used.add(variable)
+                value = self.variables.get(variable, self.defaults.get(variable))
+            elif isinstance(argument.value, IntValueNode):
+                value = int(argument.value.value)
+            if isinstance(value, int) and value > result:
+                result = value
+        return result
+
+
+class CostAnalyzer:
+    """Rejects operations deeper or costlier than the configured limits
+
+    The cost of a document is cached, for the values of the variables its
+    multipliers depend on, so repeated queries are nearly free to analyze.
+    """
+
+    def __init__(
+        self,
+        schema: GraphQLSchema,
+        max_depth: Optional[int] = None,
+        max_cost: Optional[int] = None,
+        cache_size: Optional[int] = 512,
+    ):
+        self.schema = schema
+        self.max_depth = max_depth
+        self.max_cost = max_cost
+        self.plans: LRUCache[CostPlan] = LRUCache(cache_size)
+
+    def analyze(
+        self,
+        key: Hashable,
+        document: DocumentNode,
+        operation_name: Optional[str] = None,
+        variables: Optional[Dict[str, Any]] = None,
+    ) -> QueryCost:
+        """Cost of an operation of `document`, cached under `key` (its query)"""
+        variables = variables or {}
+        plan = self.plans.get((key, operation_name))
+        if plan is not None:
+            values = tuple(variables.get(name) for name in plan.variables)
+            cost = plan.costs.get(values)
+            if cost is not None:
+                return cost
+        walker, cost = self.walk(document, operation_name, variables)
+        if plan is None:
+            plan = CostPlan(tuple(sorted(walker.used)), {})
+            self.plans.set((key, operation_name), plan)
+        if len(plan.costs) >= MAX_VARIANTS:
+            plan.costs.clear()
+        plan.costs[tuple(variables.get(name) for name in plan.variables)] = cost
+        return cost
+
+    def walk(
+        self,
+        document: DocumentNode,
+        operation_name: Optional[str],
+        variables: Dict[str, Any],
+    ) -> Tuple[CostWalker, QueryCost]:
+        operation: Optional[OperationDefinitionNode] = None
+        fragments: Dict[str, FragmentDefinitionNode] = {}
+        for definition in document.definitions:
+            if isinstance(definition, OperationDefinitionNode):
+                if operation_name is None or (
+                    definition.name and definition.name.value == operation_name
+                ):
+                    operation = definition
+            elif isinstance(definition, FragmentDefinitionNode):
+                fragments[definition.name.value] = definition
+        defaults = {}
+        if operation is not None:
+            for variable in operation.variable_definitions or ():
+                if isinstance(variable.default_value, IntValueNode):
+                    name = variable.variable.name.value
+                    defaults[name] = int(variable.default_value.value)
+        walker = CostWalker(self.schema, fragments, variables, defaults)
+        if operation is None:
+            return walker, QueryCost(0, 0)
+        try:
+            root_type = get_operation_root_type(self.schema, operation)
+        except GraphQLError:
+            return walker, QueryCost(0, 0)
+        return walker, walker.selection_set(root_type, operation.selection_set, 0)
+
+    def validate(self, cost: QueryCost) -> List[GraphQLError]:
+        errors: List[GraphQLError] = []
+        if self.max_depth is not None and cost.depth > self.max_depth:
+            errors.append(
+                QueryTooComplex(
+                    f"Query depth {cost.depth} exceeds the maximum depth"
+                    f" of {self.max_depth}"
+                )
+            )
+        if self.max_cost is not None and cost.cost > self.max_cost:
+            errors.append(
+                QueryTooComplex(
+                    f"Query cost {cost.cost} exceeds the maximum cost"
+                    f" of {self.max_cost}"
+                )
+            )
+        return errors
@@ -0,0 +1,200 @@
+import asyncio
+from dataclasses import fields, is_dataclass
+from inspect import isawaitable
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+__all__ = ("BatchFunction", "DataLoader", "Loaders", "get_loaders")
+
+K = TypeVar("K")
+V = TypeVar("V")
+BatchFunction = Callable[..., Union[Awaitable[Any], Any]]
+
+
+class DataLoader(Generic[K, V]):
+    """Collects the keys loaded during one event loop tick into a single batch
+
+    `batch_load` is called with a list of keys and must return, or resolve to,
+    either a sequence of values in the same order or a mapping of keys to
+    values. Exceptions in place of a value are raised by the `load` call of
+    their key only.
+    Results are cached by key for the lifetime of the loader.
+    """
+
+    def __init__(
+        self,
+        batch_load: BatchFunction,
+        max_batch_size: Optional[int] = None,
+        cache: bool = True,
+        **kwargs: Any,
+    ):
+        self.batch_load = batch_load
+        self.max_batch_size = max_batch_size
+        self.cache = cache
+        self.kwargs = kwargs
+        self.futures: Dict[Hashable, "asyncio.Future[V]"] = {}
+        self.queue: List[Tuple[K, "asyncio.Future[V]"]] = []
+        self.batches = 0
+
+    def load(self, key: K) -> "asyncio.Future[V]":
+        if self.cache:
+            future = self.futures.get(key)
+            if future is not None:
+                return future
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        if self.cache:
+            self.futures[key] = future
+        if not self.queue:
+            loop.call_soon(self.dispatch)
+        self.queue.append((key, future))
+        return future
+
+    def load_many(self, keys: Iterable[K]) -> "asyncio.Future[List[V]]":
+        return asyncio.gather(*[self.load(key) for key in keys])
+
+    def prime(self, key: K, value: V) -> None:
+        """Cache `value` for `key`, unless it is already loaded or being loaded"""
+        if not self.cache or key in self.futures:
+            return
+        future = asyncio.get_event_loop().create_future()
+        future.set_result(value)
+        self.futures[key] = future
+
+    def clear(self, key: K) -> None:
+        if self.cache:
+            self.futures.pop(key, None)
+
+    def clear_all(self) -> None:
+        self.futures.clear()
+
+    def dispatch(self) -> None:
+        queue, self.queue = self.queue, []
+        size = self.max_batch_size or len(queue)
+        for start in range(0, len(queue), size):
+            end = start + size
+            batch = queue[start:end]
+            self.batches += 1
+            asyncio.ensure_future(self.dispatch_batch(batch))
+
+    async def dispatch_batch(self, batch: List[Tuple[K, "asyncio.Future[V]"]]):
+        keys = [key for key, _ in batch]
+        try:
+            values: Any = self.batch_load(keys, **self.kwargs)
+            if isawaitable(values):
+                values = await values
+            if isinstance(values, Mapping):
+                values = [values.get(key) for key in keys]
+            elif len(values) != len(keys):
+                name = getattr(self.batch_load, "__name__", self.batch_load)
+                raise TypeError(
+                    f"{name} returned {len(values)} values for {len(keys)} keys"
+                )
+        except Exception as error:
+            for key, future in batch:
+                self.clear(key)
+                if not future.done():
+                    future.set_exception(error)
+            return
+        for (key, future), value in zip(batch, values):
+            if future.done():
+                continue
+            if isinstance(value, Exception):
+                self.clear(key)
+                future.set_exception(value)
+            else:
+                future.set_result(value)
+
+
+def freeze(value: Any) -> Hashable:
+    """A hashable key equal for equal argument values
+
+    Unhashable objects, such as input objects loaded into dataclasses, are
+    keyed by their class and attributes.
+    """
+    if isinstance(value, Mapping):
+        return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(freeze(v) for v in value)
+    try:
+        hash(value)
+    except TypeError:
+        if is_dataclass(value):
+            attributes = {
+                field.name: getattr(value, field.name) for field in fields(value)
+            }
+        else:
+            attributes = getattr(value, "__dict__", None)
+        if attributes is None:
+            return value.__class__, repr(value)
+        return value.__class__, freeze(attributes)
+    return value
+
+
+class Loaders:
+    """The `DataLoader` of every batch function used during a request
+
+    Loaders are created on first use, one per batch function and set of
+    keyword arguments, which are passed on to the batch function.
+    """
+
+    def __init__(self, max_batch_size: Optional[int] = None):
+        self.max_batch_size = max_batch_size
+        self.loaders: Dict[Hashable, DataLoader] = {}
+
+    def __len__(self) -> int:
+        return len(self.loaders)
+
+    def get(self, batch_load: BatchFunction, **kwargs: Any) -> DataLoader:
+        key = (batch_load, freeze(kwargs)) if kwargs else batch_load
+        return self.setdefault(
+            key, lambda: DataLoader(batch_load, self.max_batch_size, **kwargs)
+        )
+
+    def setdefault(self, key: Hashable, factory: Callable[[], DataLoader]):
+        """The loader registered under `key`, created by `factory` if missing"""
+        loader = self.loaders.get(key)
+        if loader is None:
+            loader = self.loaders[key] = factory()
+        return loader
+
+    def load(self, batch_load: BatchFunction, key: Any, **kwargs: Any):
+        return self.get(batch_load, **kwargs).load(key)
+
+
+def context_value(context: Any, name: str, factory: Callable[[], Any]) -> Any:
+    """Request state kept in `context` under `name`, created by `factory`"""
+    if isinstance(context, dict):
+        value = context.get(name)
+        if value is None:
+            value = context[name] = factory()
+        return value
+    value = getattr(context, name, None)
+    if value is None:
+        value = factory()
+        try:
+            setattr(context, name, value)
+        except AttributeError:
+            raise TypeError(
+                f"Can not keep {name} in a {type(context).__name__} context,"
+                f" use a dict or an object with a `{name}` attribute"
+            ) from None
+    return value
+
+
+def get_loaders(context: Any) -> Loaders:
+    """The loaders of a request, kept in its `context` under `loaders`"""
+    return context_value(context, "loaders", Loaders)
@@ -0,0 +1,99 @@
+import asyncio
+import json
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional
+
+from graphql import ExecutionResult
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+__all__ = ("JSONEncoder", "dumps", "encode_result", "stream_result")
+
+Dumps = Callable[[Any], bytes]
+
+
+def json_dumps(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+dumps: Dumps = orjson.dumps if orjson is not None else json_dumps
+
+
+class JSONEncoder:
+    """Encodes responses into chunks of about `chunk_size` bytes
+
+    Lists and dicts holding lists or dicts are walked, everything else is
+    encoded at once by `backend`, `orjson.dumps` when installed. Memory used
+    besides the result is bounded by the chunk size and the largest dict of
+    scalars.
+    """
+
+    def __init__(self, chunk_size: int = 65536, backend: Optional[Dumps] = None):
+        self.chunk_size = chunk_size
+        self.dumps = backend or dumps
+
+    def encode(self, value: Any) -> Iterator[bytes]:
+        buffer: List[bytes] = []
+        size = 0
+        for part in self.parts(value):
+            buffer.append(part)
+            size += len(part)
+            if size >= self.chunk_size:
+                yield b"".join(buffer)
+                buffer, size = [], 0
+        if buffer:
+            yield b"".join(buffer)
+
+    def parts(self, value: Any) -> Iterator[bytes]:
+        if isinstance(value, list):
+            if not value:
+                yield b"[]"
+                return
+            separator = b"["
+            for item in value:
+                yield separator
+                yield from self.parts(item)
+                separator = b","
+            yield b"]"
+        elif isinstance(value, dict) and any(
+            isinstance(item, (dict, list)) for item in value.values()
+        ):
+            separator = b"{"
+            for key, item in value.items():
+                yield separator
+                yield self.dumps(key)
+                yield b":"
+                yield from self.parts(item)
+                separator = b","
+            yield b"}"
+        else:
+            yield self.dumps(value)
+
+
+def response(result: ExecutionResult) -> Dict[str, Any]:
+    formatted: Dict[str, Any] = {}
+    if result.errors is not None:
+        formatted["errors"] = [error.formatted for error in result.errors]
+    formatted["data"] = result.data
+    extensions = getattr(result, "extensions", None)
+    if extensions:
+        formatted["extensions"] = extensions
+    return formatted
+
+
+def encode_result(
+    result: ExecutionResult, chunk_size: int = 65536, backend: Optional[Dumps] = None
+) -> Iterator[bytes]:
+    """The JSON response of `result`, in chunks of about `chunk_size` bytes"""
+    return JSONEncoder(chunk_size, backend).encode(response(result))
+
+
+async def stream_result(
+    result: ExecutionResult, chunk_size: int = 65536, backend: Optional[Dumps] = None
+) -> AsyncIterator[bytes]:
+    """`encode_result`, yielding to the event loop between chunks"""
+    for chunk in encode_result(result, chunk_size, backend):
+        yield chunk
+        await asyncio.sleep(0)
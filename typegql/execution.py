@@ -1,20 +1,235 @@
-from typing import Any, Sequence, Union
+from asyncio import ensure_future, gather
+from inspect import isawaitable
+from typing import (
+    Any,
+    AsyncIterable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 from graphql import (
     ExecutionContext,
+    ExecutionResult,
     FieldNode,
     GraphQLError,
     GraphQLField,
     GraphQLFieldResolver,
+    GraphQLList,
+    GraphQLNamedType,
+    GraphQLObjectType,
+    GraphQLOutputType,
     GraphQLResolveInfo,
+    GraphQLSchema,
     is_introspection_type,
 )
+from graphql.execution import Middleware, MiddlewareManager
 from graphql.execution.values import get_argument_values
+from graphql.pyutils import Path
 
+from typegql.builder.names import rename
 from typegql.builder.utils import to_snake
 
 
+def coerce_arguments(
+    schema: GraphQLSchema,
+    parent_type: GraphQLNamedType,
+    field_def: GraphQLField,
+    field_node: FieldNode,
+    variable_values: Dict[str, Any],
+) -> Dict[str, Any]:
+    arguments = get_argument_values(field_def, field_node, variable_values)
+    if arguments and getattr(schema, "camelcase", False):
+        if is_introspection_type(parent_type):
+            return arguments
+        names = getattr(schema, "names", None)
+        if names is None:
+            return to_snake(arguments=arguments)
+        scope = parent_type.name, field_node.name.value
+        arguments = rename(names.arguments.get(scope), arguments)
+    return arguments
+
+
+def is_introspection_field(parent_type: GraphQLNamedType, field_name: str) -> bool:
+    return field_name.startswith("__") or is_introspection_type(parent_type)
+
+
+def resolver_middleware(resolver: GraphQLFieldResolver) -> Callable[..., Any]:
+    """Middleware resolving the fields of the schema with `resolver`
+
+    Built fields have their own resolver, which the field resolver of an
+    execution does not replace, so a custom one is applied as the innermost
+    middleware. Introspection fields keep their resolvers.
+    """
+
+    def middleware(next_, source, info, **kwargs):
+        if is_introspection_field(info.parent_type, info.field_name):
+            return next_(source, info, **kwargs)
+        return resolver(source, info, **kwargs)
+
+    return middleware
+
+
+def with_resolver(
+    resolver: Optional[GraphQLFieldResolver], middleware: Middleware
+) -> Middleware:
+    """`middleware`, resolving every field with `resolver` when given"""
+    if resolver is None:
+        return middleware
+    if isinstance(middleware, MiddlewareManager):
+        middlewares = list(middleware.middlewares)
+    else:
+        middlewares = list(middleware or ())
+    return [resolver_middleware(resolver), *middlewares]
+
+
+# Items of an async iterable list completed concurrently, by default
+MAX_BUFFERED_ITEMS = 100
+
+
+def is_async_iterable(value: Any) -> bool:
+    return hasattr(value, "__aiter__")
+
+
+async def aclose(items: Any) -> None:
+    close = getattr(items, "aclose", None)
+    if close is not None:
+        await close()
+
+
+async def complete_async_items(
+    items: AsyncIterable[Any],
+    complete_item: Callable[[int, Any], Any],
+    max_buffered: int = MAX_BUFFERED_ITEMS,
+) -> List[Any]:
+    """Complete the items of an async iterable list as they are produced
+
+    Items completing asynchronously run concurrently, up to `max_buffered` of
+    them: the iterable is not advanced until they are all complete, so a slow
+    consumer holds back the producer instead of piling up items in memory.
+    Only the completed values are kept.
+    """
+    completed: List[Any] = []
+    pending: List[int] = []
+
+    async def complete_pending():
+        indexes = pending[:]
+        pending.clear()
+        values = await gather(*(completed[index] for index in indexes))
+        for index, value in zip(indexes, values):
+            completed[index] = value
+
+    try:
+        async for item in items:
+            value = complete_item(len(completed), item)
+            if isawaitable(value):
+                value = ensure_future(value)
+                pending.append(len(completed))
+            completed.append(value)
+            if len(pending) >= max_buffered:
+                await complete_pending()
+        if pending:
+            await complete_pending()
+    except BaseException:
+        # let the items in flight settle rather than leave them running
+        await gather(*(completed[index] for index in pending), return_exceptions=True)
+        raise
+    finally:
+        await aclose(items)
+    return completed
+
+
+class TGQLExecutionResult(ExecutionResult):
+    """`ExecutionResult` with the `extensions` entry of the response
+
+    It still compares and unpacks as a `(data, errors)` tuple.
+    """
+
+    extensions: Optional[Dict[str, Any]]
+
+    def __new__(
+        cls,
+        data: Optional[Dict[str, Any]] = None,
+        errors: Optional[List[GraphQLError]] = None,
+        extensions: Optional[Dict[str, Any]] = None,
+    ):
+        result = super().__new__(cls, data, errors)  # type: ignore
+        result.extensions = extensions
+        return result
+
+    @property
+    def formatted(self) -> Dict[str, Any]:
+        response: Dict[str, Any] = {"data": self.data}
+        if self.errors is not None:
+            response["errors"] = [error.formatted for error in self.errors]
+        if self.extensions:
+            response["extensions"] = self.extensions
+        return response
+
+
+class TGQLResolveInfo(GraphQLResolveInfo):
+    """`GraphQLResolveInfo` carrying a token of the execution it belongs to
+
+    State kept in a context shared by several executions, such as the loaders
+    of `resolve_many_<field>` methods, is keyed by `execution`.
+    """
+
+    execution: Any
+
+
 class TGQLExecutionContext(ExecutionContext):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.arguments: Dict[Tuple[int, int], Dict[str, Any]] = {}
+        self.execution = object()
+
+    def build_resolve_info(
+        self,
+        field_def: GraphQLField,
+        field_nodes: List[FieldNode],
+        parent_type: GraphQLObjectType,
+        path: Path,
+    ) -> GraphQLResolveInfo:
+        info = TGQLResolveInfo(
+            field_nodes[0].name.value,
+            field_nodes,
+            field_def.type,
+            parent_type,
+            path,
+            self.schema,
+            self.fragments,
+            self.root_value,
+            self.operation,
+            self.variable_values,
+            self.context_value,
+            self.is_awaitable,
+        )
+        info.execution = self.execution
+        return info
+
+    def field_arguments(
+        self,
+        parent_type: GraphQLNamedType,
+        field_def: GraphQLField,
+        field_node: FieldNode,
+    ) -> Dict[str, Any]:
+        """Coerced arguments of a field, computed once per operation
+
+        Every resolution of the same field node, such as the items of a list,
+        shares the same arguments.
+        """
+        key = id(field_def), id(field_node)
+        arguments = self.arguments.get(key)
+        if arguments is None:
+            arguments = self.arguments[key] = coerce_arguments(
+                self.schema, parent_type, field_def, field_node, self.variable_values
+            )
+        return arguments
+
     def resolve_field_value_or_error(
         self,
         field_def: GraphQLField,
@@ -24,16 +239,38 @@ class TGQLExecutionContext(ExecutionContext):
         info: GraphQLResolveInfo,
     ) -> Union[Exception, Any]:
         try:
-            is_introspection = is_introspection_type(info.parent_type)
-            camelcase = getattr(info.schema, "camelcase", False)
-            arguments = get_argument_values(
-                field_def, field_nodes[0], self.variable_values
+            arguments = self.field_arguments(
+                info.parent_type, field_def, field_nodes[0]
             )
-            if camelcase and not is_introspection:
-                arguments = to_snake(arguments=arguments)
             result = resolve_fn(source, info, **arguments)
             return result
         except GraphQLError as e:
             return e
         except Exception as e:
             return e
+
+    def complete_list_value(
+        self,
+        return_type: GraphQLList[GraphQLOutputType],
+        field_nodes: List[FieldNode],
+        info: GraphQLResolveInfo,
+        path: Path,
+        result: Any,
+    ):
+        """Complete a list, which may also be an async iterable or generator"""
+        if not is_async_iterable(result):
+            return super().complete_list_value(
+                return_type, field_nodes, info, path, result
+            )
+        item_type = return_type.of_type
+
+        def complete_item(index: int, item: Any) -> Any:
+            return self.complete_value_catching_error(
+                item_type, field_nodes, info, path.add_key(index), item
+            )
+
+        return complete_async_items(
+            result,
+            complete_item,
+            getattr(self.schema, "max_buffered_items", MAX_BUFFERED_ITEMS),
+        )
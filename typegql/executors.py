@@ -0,0 +1,172 @@
+import asyncio
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from threading import Lock
+from time import perf_counter
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Union
+
+__all__ = ("EXECUTORS", "Executors", "QueueWait", "RemoteInfo")
+
+EXECUTORS = ("inline", "thread", "process")
+
+
+class RemoteInfo(NamedTuple):
+    """The `info` given to resolvers running in a process"""
+
+    field_name: str
+    path: List[Union[str, int]]
+    operation_name: Optional[str]
+    variable_values: Dict[str, Any]
+
+
+def run_pickled(payload: bytes):
+    """Run a pickled resolver call in a worker process"""
+    started = time.time()
+    method, parent, info, kwargs = pickle.loads(payload)
+    result = method(parent, info, **kwargs)
+    try:
+        return started, pickle.dumps(result)
+    except Exception as error:
+        raise TypeError(
+            f"Can not pickle the result of {method.__qualname__}: {error}"
+        ) from None
+
+
+class QueueWait:
+    """Time resolvers spent waiting for a free worker, in seconds"""
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.lock = Lock()
+
+    def record(self, wait: float) -> None:
+        with self.lock:
+            self.calls += 1
+            self.total += wait
+            if wait > self.max:
+                self.max = wait
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "calls": self.calls,
+            "wait": self.total,
+            "max_wait": self.max,
+            "mean_wait": self.total / self.calls if self.calls else 0.0,
+        }
+
+
+class Executors:
+    """Pools running synchronous resolvers off the event loop
+
+    Fields marked with `field(metadata={"executor": "thread"})` run in a
+    `ThreadPoolExecutor` of `max_threads` workers, created on first use.
+
+    Fields marked with `"process"` run in a `ProcessPoolExecutor` of
+    `max_processes` workers. Their method, parent and arguments are pickled,
+    and `info` is replaced by a `RemoteInfo`. Calls taking longer than
+    `timeout` seconds fail, although the worker finishes them.
+    """
+
+    def __init__(
+        self,
+        max_threads: Optional[int] = None,
+        max_processes: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ):
+        self.max_threads = max_threads
+        self.max_processes = max_processes or os.cpu_count() or 1
+        self.timeout = timeout
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self.waits = {"thread": QueueWait(), "process": QueueWait()}
+
+    @property
+    def threads(self) -> ThreadPoolExecutor:
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(
+                self.max_threads, thread_name_prefix="typegql"
+            )
+        return self._threads
+
+    @property
+    def processes(self) -> ProcessPoolExecutor:
+        if self._processes is None:
+            self._processes = ProcessPoolExecutor(self.max_processes)
+        return self._processes
+
+    def warm_up(self) -> None:
+        """Start every worker process, rather than on the first calls"""
+        futures = [self.processes.submit(os.getpid) for _ in range(self.max_processes)]
+        wait(futures)
+
+    def submit(
+        self,
+        executor: str,
+        method: Callable,
+        parent: Any,
+        info: Any,
+        kwargs: Dict[str, Any],
+    ) -> Awaitable[Any]:
+        if executor == "thread":
+            return self.run_in_thread(method, parent, info, kwargs)
+        if executor == "process":
+            return self.run_in_process(method, parent, info, kwargs)
+        raise ValueError(f"Unknown executor {executor!r}")
+
+    def run_in_thread(
+        self, method: Callable, parent: Any, info: Any, kwargs: Dict[str, Any]
+    ) -> Awaitable[Any]:
+        queued = perf_counter()
+        wait = self.waits["thread"]
+
+        def call():
+            wait.record(perf_counter() - queued)
+            return method(parent, info, **kwargs)
+
+        return asyncio.get_event_loop().run_in_executor(self.threads, call)
+
+    async def run_in_process(
+        self, method: Callable, parent: Any, info: Any, kwargs: Dict[str, Any]
+    ) -> Any:
+        remote = RemoteInfo(
+            info.field_name,
+            info.path.as_list(),
+            info.operation.name.value if info.operation.name else None,
+            info.variable_values,
+        )
+        try:
+            payload = pickle.dumps((method, parent, remote, kwargs))
+        except Exception as error:
+            raise TypeError(
+                f"Can not send {method.__qualname__} to a process: {error}"
+            ) from None
+        queued = time.time()
+        future = asyncio.get_event_loop().run_in_executor(
+            self.processes, run_pickled, payload
+        )
+        try:
+            started, result = await asyncio.wait_for(future, self.timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(
+                f"{method.__qualname__} timed out after {self.timeout} seconds"
+            ) from None
+        self.waits["process"].record(max(started - queued, 0.0))
+        return pickle.loads(result)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return {name: wait.stats() for name, wait in self.waits.items()}
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._threads is not None:
+            self._threads.shutdown(wait)
+            self._threads = None
+        if self._processes is not None:
+            self._processes.shutdown(wait)
+            self._processes = None
+
+
+default_executors = Executors()
@@ -0,0 +1,531 @@
+import asyncio
+from collections.abc import Iterable
+from copy import copy
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Coroutine,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from graphql import (
+    DirectiveLocation,
+    DocumentNode,
+    FieldNode,
+    FragmentSpreadNode,
+    GraphQLArgument,
+    GraphQLBoolean,
+    GraphQLDirective,
+    GraphQLError,
+    GraphQLInt,
+    GraphQLList,
+    GraphQLNonNull,
+    GraphQLObjectType,
+    GraphQLOutputType,
+    GraphQLResolveInfo,
+    GraphQLString,
+    InlineFragmentNode,
+    Node,
+    OperationDefinitionNode,
+    OperationType,
+    SelectionNode,
+    SelectionSetNode,
+    get_operation_root_type,
+    located_error,
+)
+from graphql.execution.execute import get_field_entry_key
+from graphql.execution.values import get_directive_values
+from graphql.pyutils import Path
+
+from .encoder import dumps
+from .execution import TGQLExecutionContext, aclose, is_async_iterable
+
+__all__ = (
+    "GraphQLDeferDirective",
+    "GraphQLStreamDirective",
+    "IncrementalExecutionContext",
+    "IncrementalResult",
+    "MULTIPART_CONTENT_TYPE",
+    "multipart",
+    "uses_incremental",
+)
+
+MULTIPART_CONTENT_TYPE = 'multipart/mixed; boundary="-"; deferSpec=20220824'
+
+GraphQLDeferDirective = GraphQLDirective(
+    name="defer",
+    locations=[DirectiveLocation.FRAGMENT_SPREAD, DirectiveLocation.INLINE_FRAGMENT],
+    args={
+        "if": GraphQLArgument(
+            GraphQLNonNull(GraphQLBoolean),
+            description="Deferred when true or undefined.",
+            default_value=True,
+        ),
+        "label": GraphQLArgument(GraphQLString, description="Unique name"),
+    },
+    description="Directs the executor to defer this fragment"
+    " when the `if` argument is true or undefined.",
+)
+
+GraphQLStreamDirective = GraphQLDirective(
+    name="stream",
+    locations=[DirectiveLocation.FIELD],
+    args={
+        "if": GraphQLArgument(
+            GraphQLNonNull(GraphQLBoolean),
+            description="Stream when true or undefined.",
+            default_value=True,
+        ),
+        "label": GraphQLArgument(GraphQLString, description="Unique name"),
+        "initialCount": GraphQLArgument(
+            GraphQLInt,
+            description="Number of items to return immediately",
+            default_value=0,
+        ),
+    },
+    description="Directs the executor to stream plural fields"
+    " when the `if` argument is true or undefined.",
+)
+
+INCREMENTAL_DIRECTIVES = {"defer", "stream"}
+
+Deferred = Tuple[Optional[str], SelectionSetNode]
+
+
+@dataclass
+class IncrementalResult:
+    """A payload of an incremental response
+
+    The first payload holds the initial `data`. The following ones hold the
+    `data` of a deferred fragment, or the `items` of a streamed list, found at
+    `path`. `has_next` is false for the last payload.
+    """
+
+    data: Optional[Dict[str, Any]] = None
+    errors: Optional[List[GraphQLError]] = None
+    path: Optional[List[Union[str, int]]] = None
+    label: Optional[str] = None
+    items: Optional[List[Any]] = None
+    has_next: bool = False
+    extensions: Optional[Dict[str, Any]] = None
+
+    @property
+    def formatted(self) -> Dict[str, Any]:
+        response: Dict[str, Any] = {}
+        if self.items is not None:
+            response["items"] = self.items
+        else:
+            response["data"] = self.data
+        if self.errors is not None:
+            response["errors"] = [error.formatted for error in self.errors]
+        if self.path is not None:
+            response["path"] = self.path
+        if self.label is not None:
+            response["label"] = self.label
+        if self.extensions:
+            response["extensions"] = self.extensions
+        response["hasNext"] = self.has_next
+        return response
+
+
+def uses_incremental(document: DocumentNode) -> bool:
+    """Whether `document` uses the `@defer` or `@stream` directives"""
+    nodes: List[Node] = list(document.definitions)
+    while nodes:
+        node = nodes.pop()
+        for directive in getattr(node, "directives", None) or ():
+            if directive.name.value in INCREMENTAL_DIRECTIVES:
+                return True
+        selection_set = getattr(node, "selection_set", None)
+        if selection_set is not None:
+            nodes.extend(selection_set.selections)
+    return False
+
+
+def sorted_errors(errors: List[GraphQLError]) -> Optional[List[GraphQLError]]:
+    if not errors:
+        return None
+    return sorted(
+        errors,
+        key=lambda error: (error.locations or [], error.path or [], error.message),
+    )
+
+
+class IncrementalState:
+    """Payloads of the deferred fragments and streams of a single operation"""
+
+    def __init__(self):
+        self.queue: "asyncio.Queue[IncrementalResult]" = asyncio.Queue()
+        self.pending = 0
+        self.tasks: List["asyncio.Future[None]"] = []
+
+    @property
+    def has_next(self) -> bool:
+        return self.pending > 0 or not self.queue.empty()
+
+    def start(self, coroutine: Coroutine[Any, Any, None]) -> None:
+        self.pending += 1
+        self.tasks.append(asyncio.ensure_future(coroutine))
+
+    def put(self, payload: IncrementalResult, done: bool = True) -> None:
+        if done:
+            self.pending -= 1
+        self.queue.put_nowait(payload)
+
+    def cancel(self) -> None:
+        for task in self.tasks:
+            if not task.done():
+                task.cancel()
+
+
+async def flag_last(items: List[Any]) -> AsyncIterator[Tuple[Any, bool]]:
+    last = len(items) - 1
+    for index, item in enumerate(items):
+        yield item, index == last
+
+
+async def flag_last_async(
+    first: Any, iterator: AsyncIterator[Any]
+) -> AsyncIterator[Tuple[Any, bool]]:
+    """`first` then the items of `iterator`, reading one ahead to flag the last"""
+    current = first
+    try:
+        while True:
+            try:
+                following = await iterator.__anext__()
+            except StopAsyncIteration:
+                yield current, True
+                return
+            except Exception:
+                yield current, False
+                raise
+            yield current, False
+            current = following
+    finally:
+        await aclose(iterator)
+
+
+class IncrementalExecutionContext(TGQLExecutionContext):
+    """Executes `@defer` fragments and `@stream` lists after the initial payload
+
+    Deferred fragments are left out while collecting fields and executed
+    concurrently, each with its own errors. Streamed lists complete their first
+    `initialCount` items and deliver the others one by one.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.state = IncrementalState()
+        self.collecting: List[Deferred] = []
+        self.deferred: Dict[Tuple[GraphQLObjectType, int], List[Deferred]] = {}
+
+    def child(self) -> "IncrementalExecutionContext":
+        child = copy(self)
+        child.errors = []
+        child.collecting = []
+        return child
+
+    def directive_arguments(
+        self, directive: GraphQLDirective, node: SelectionNode
+    ) -> Optional[Dict[str, Any]]:
+        if self.operation.operation is OperationType.MUTATION:
+            return None
+        arguments = get_directive_values(directive, node, self.variable_values)
+        if not arguments or not arguments["if"]:
+            return None
+        return arguments
+
+    def collect_fields(
+        self,
+        runtime_type: GraphQLObjectType,
+        selection_set: SelectionSetNode,
+        fields: Dict[str, List[FieldNode]],
+        visited_fragment_names: Set[str],
+    ) -> Dict[str, List[FieldNode]]:
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                if not self.should_include_node(selection):
+                    continue
+                name = get_field_entry_key(selection)
+                fields.setdefault(name, []).append(selection)
+            elif isinstance(selection, InlineFragmentNode):
+                if not self.should_include_node(
+                    selection
+                ) or not self.does_fragment_condition_match(selection, runtime_type):
+                    continue
+                defer = self.directive_arguments(GraphQLDeferDirective, selection)
+                if defer is not None:
+                    self.collecting.append(
+                        (defer.get("label"), selection.selection_set)
+                    )
+                    continue
+                self.collect_fields(
+                    runtime_type,
+                    selection.selection_set,
+                    fields,
+                    visited_fragment_names,
+                )
+            elif isinstance(selection, FragmentSpreadNode):
+                name = selection.name.value
+                if name in visited_fragment_names or not self.should_include_node(
+                    selection
+                ):
+                    continue
+                visited_fragment_names.add(name)
+                fragment = self.fragments.get(name)
+                if not fragment or not self.does_fragment_condition_match(
+                    fragment, runtime_type
+                ):
+                    continue
+                defer = self.directive_arguments(GraphQLDeferDirective, selection)
+                if defer is not None:
+                    self.collecting.append((defer.get("label"), fragment.selection_set))
+                    continue
+                self.collect_fields(
+                    runtime_type, fragment.selection_set, fields, visited_fragment_names
+                )
+        return fields
+
+    def collect_subfields(
+        self, return_type: GraphQLObjectType, field_nodes: List[FieldNode]
+    ) -> Dict[str, List[FieldNode]]:
+        key = return_type, id(field_nodes)
+        if key in self._subfields_cache:
+            return self._subfields_cache[key]
+        collecting, self.collecting = self.collecting, []
+        try:
+            fields = super().collect_subfields(return_type, field_nodes)
+            if self.collecting:
+                self.deferred[key] = self.collecting
+        finally:
+            self.collecting = collecting
+        return fields
+
+    def collect_and_execute_subfields(
+        self,
+        return_type: GraphQLObjectType,
+        field_nodes: List[FieldNode],
+        path: Path,
+        result: Any,
+    ):
+        fields = self.collect_subfields(return_type, field_nodes)
+        for label, selection_set in self.deferred.get(
+            (return_type, id(field_nodes)), ()
+        ):
+            self.defer(return_type, result, path, label, selection_set)
+        return self.execute_fields(return_type, result, path, fields)
+
+    def execute_operation(
+        self, operation: OperationDefinitionNode, root_value: Any
+    ) -> Any:
+        self.collecting = []
+        result = super().execute_operation(operation, root_value)
+        root_type = get_operation_root_type(self.schema, operation)
+        deferred, self.collecting = self.collecting, []
+        for label, selection_set in deferred:
+            self.defer(root_type, root_value, None, label, selection_set)
+        return result
+
+    def defer(
+        self,
+        parent_type: GraphQLObjectType,
+        source: Any,
+        path: Optional[Path],
+        label: Optional[str],
+        selection_set: SelectionSetNode,
+    ) -> None:
+        child = self.child()
+        fields = child.collect_fields(parent_type, selection_set, {}, set())
+        nested, child.collecting = child.collecting, []
+        for nested_label, nested_selection_set in nested:
+            child.defer(parent_type, source, path, nested_label, nested_selection_set)
+
+        async def run():
+            data = None
+            try:
+                data = child.execute_fields(parent_type, source, path, fields)
+                if child.is_awaitable(data):
+                    data = await data
+            except GraphQLError as error:
+                child.errors.append(error)
+                data = None
+            finally:
+                payload = IncrementalResult(
+                    data=data,
+                    errors=sorted_errors(child.errors),
+                    path=path.as_list() if path else [],
+                    label=label,
+                )
+                self.state.put(payload)
+
+        self.state.start(run())
+
+    def complete_list_value(
+        self,
+        return_type: GraphQLList[GraphQLOutputType],
+        field_nodes: List[FieldNode],
+        info: GraphQLResolveInfo,
+        path: Path,
+        result: Any,
+    ):
+        stream = None
+        if isinstance(path.key, str):
+            stream = self.directive_arguments(GraphQLStreamDirective, field_nodes[0])
+        if stream is None or isinstance(result, str):
+            return super().complete_list_value(
+                return_type, field_nodes, info, path, result
+            )
+        initial_count = stream.get("initialCount") or 0
+        if initial_count < 0:
+            raise GraphQLError("initialCount must be a non-negative integer")
+        if is_async_iterable(result):
+            return self.complete_async_stream(
+                return_type, field_nodes, info, path, result, initial_count, stream
+            )
+        if not isinstance(result, Iterable):
+            return super().complete_list_value(
+                return_type, field_nodes, info, path, result
+            )
+        items = list(result)
+        completed = super().complete_list_value(
+            return_type, field_nodes, info, path, items[:initial_count]
+        )
+        if len(items) > initial_count:
+            self.stream(
+                return_type.of_type,
+                field_nodes,
+                info,
+                path,
+                flag_last(items[initial_count:]),
+                initial_count,
+                stream.get("label"),
+            )
+        return completed
+
+    async def complete_async_stream(
+        self,
+        return_type: GraphQLList[GraphQLOutputType],
+        field_nodes: List[FieldNode],
+        info: GraphQLResolveInfo,
+        path: Path,
+        result: AsyncIterable[Any],
+        initial_count: int,
+        stream: Dict[str, Any],
+    ) -> List[Any]:
+        """Complete the first items of an async iterable and stream the others"""
+        iterator = result.__aiter__()
+        items: List[Any] = []
+        try:
+            while len(items) <= initial_count:
+                items.append(await iterator.__anext__())
+        except StopAsyncIteration:
+            pass
+        except BaseException:
+            await aclose(iterator)
+            raise
+        if len(items) > initial_count:
+            self.stream(
+                return_type.of_type,
+                field_nodes,
+                info,
+                path,
+                flag_last_async(items.pop(), iterator),
+                initial_count,
+                stream.get("label"),
+            )
+        completed = super().complete_list_value(
+            return_type, field_nodes, info, path, items
+        )
+        if self.is_awaitable(completed):
+            completed = await completed
+        return completed
+
+    def stream(
+        self,
+        item_type: GraphQLOutputType,
+        field_nodes: List[FieldNode],
+        info: GraphQLResolveInfo,
+        path: Path,
+        items: AsyncIterator[Tuple[Any, bool]],
+        offset: int,
+        label: Optional[str],
+    ) -> None:
+        """Deliver `items`, flagged when last, in a payload each"""
+
+        async def run():
+            index = -1
+            try:
+                async for item, last in items:
+                    index += 1
+                    await asyncio.sleep(0)
+                    child = self.child()
+                    item_path = path.add_key(offset + index)
+                    value = None
+                    try:
+                        value = child.complete_value_catching_error(
+                            item_type, field_nodes, info, item_path, item
+                        )
+                        if child.is_awaitable(value):
+                            value = await value
+                    except GraphQLError as error:
+                        child.errors.append(error)
+                        value = None
+                    finally:
+                        payload = IncrementalResult(
+                            items=[value],
+                            errors=sorted_errors(child.errors),
+                            path=item_path.as_list(),
+                            label=label,
+                        )
+                        self.state.put(payload, done=last)
+            except Exception as error:
+                # the iterable failed: end the stream with its error and no item
+                item_path = path.add_key(offset + index + 1)
+                payload = IncrementalResult(
+                    items=[],
+                    errors=[located_error(error, field_nodes, item_path.as_list())],
+                    path=item_path.as_list(),
+                    label=label,
+                )
+                self.state.put(payload)
+
+        self.state.start(run())
+
+    async def payloads(
+        self, data: Any, extensions: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[IncrementalResult]:
+        """The initial payload of `data` followed by every deferred payload"""
+        try:
+            if self.is_awaitable(data):
+                data = await data
+            yield IncrementalResult(
+                data=data,
+                errors=sorted_errors(self.errors),
+                has_next=self.state.has_next,
+                extensions=extensions,
+            )
+            while self.state.has_next:
+                payload = await self.state.queue.get()
+                payload.has_next = self.state.has_next
+                yield payload
+        finally:
+            self.state.cancel()
+
+
+async def multipart(
+    payloads: AsyncIterator[IncrementalResult], boundary: str = "-"
+) -> AsyncIterator[bytes]:
+    """Encode `payloads` as the parts of a `multipart/mixed` response"""
+    delimiter = f"\r\n--{boundary}".encode()
+    yield delimiter + b"\r\n"
+    async for payload in payloads:
+        yield b"Content-Type: application/json; charset=utf-8\r\n\r\n"
+        yield dumps(payload.formatted)
+        yield delimiter + (b"\r\n" if payload.has_next else b"--\r\n")
@@ -0,0 +1,293 @@
+import logging
+from bisect import bisect_left
+from collections import deque
+from hashlib import sha256
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from graphql import (
+    FloatValueNode,
+    GraphQLError,
+    IntValueNode,
+    OperationDefinitionNode,
+    StringValueNode,
+    Visitor,
+    parse,
+    print_ast,
+    visit,
+)
+
+from .cache import LRUCache
+from .tracing import Trace
+
+__all__ = ("Histogram", "Metrics", "OperationKey", "normalize_query")
+
+logger = logging.getLogger(__name__)
+
+# Prometheus default buckets, in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class Histogram:
+    """Counts of observations by upper bound, with their sum
+
+    Observations are recorded on the event loop thread, so updating a few
+    integers needs no lock.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> Iterator[Tuple[str, int]]:
+        """`(le, count)` pairs of the Prometheus buckets, ending with `+Inf`"""
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            yield format_value(bound), total
+        yield "+Inf", self.count
+
+
+class OperationKey(NamedTuple):
+    name: str
+    fingerprint: str
+
+
+# The operations recorded once `max_operations` distinct ones are tracked
+OTHER_OPERATION = OperationKey("other", "other")
+
+
+class LiteralRemover(Visitor):
+    def leave_int_value(self, node, *_):
+        return IntValueNode(value="0")
+
+    def leave_float_value(self, node, *_):
+        return FloatValueNode(value="0")
+
+    def leave_string_value(self, node, *_):
+        return StringValueNode(value="")
+
+
+def normalize_query(query: str) -> Tuple[str, Optional[str]]:
+    """`query` without literal values or formatting, and its operation name"""
+    try:
+        document = parse(query, no_location=True)
+    except GraphQLError:
+        return " ".join(query.split()), None
+    name = None
+    for definition in document.definitions:
+        if isinstance(definition, OperationDefinitionNode) and definition.name:
+            name = definition.name.value
+            break
+    normalized = print_ast(visit(document, LiteralRemover()))
+    return " ".join(normalized.split()), name
+
+
+def variables_shape(value: Any) -> Any:
+    """The structure and types of `value`, without its data"""
+    if isinstance(value, dict):
+        return {key: variables_shape(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [variables_shape(value[0])] if value else []
+    return type(value).__name__
+
+
+def format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else f"{int(value)}.0"
+
+
+def format_labels(labels: Dict[str, str]) -> str:
+    escaped = (
+        (name, value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n"))
+        for name, value in labels.items()
+    )
+    return ",".join(f'{name}="{value}"' for name, value in escaped)
+
+
+class Metrics:
+    """Latency histograms and error counters, recorded from traces
+
+    Pass it as the `sink` of a `typegql.tracing.Tracer`. Resolver durations are
+    kept by parent type and field, and operation durations by operation name and
+    fingerprint, the hash of the query without literals or formatting.
+
+    Operations taking at least `slow_threshold` seconds are logged with their
+    normalized query, the shape of their variables and the time spent in each
+    field. The last `max_slow` are kept in `slow`.
+
+    At most `max_operations` operations are tracked, later ones are recorded
+    under the `other` operation, so clients sending arbitrary queries can not
+    grow the metrics without bound.
+    """
+
+    def __init__(
+        self,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        slow_threshold: Optional[float] = 1.0,
+        max_slow: int = 100,
+        max_operations: int = 1000,
+        namespace: str = "typegql",
+    ):
+        self.buckets = buckets
+        self.slow_threshold = slow_threshold
+        self.namespace = namespace
+        self.max_operations = max_operations
+        self.fields: Dict[Tuple[str, str], Histogram] = {}
+        self.field_errors: Dict[Tuple[str, str], int] = {}
+        self.operations: Dict[OperationKey, Histogram] = {}
+        self.operation_errors: Dict[OperationKey, int] = {}
+        self.slow: Deque[Dict[str, Any]] = deque(maxlen=max_slow)
+        self.queries: LRUCache[Tuple[str, OperationKey]] = LRUCache(max_operations)
+
+    def __call__(self, trace: Trace) -> None:
+        self.record(trace)
+
+    def operation(self, trace: Trace) -> Tuple[str, OperationKey]:
+        query = trace.query or ""
+        cached = self.queries.get((query, trace.operation_name))
+        if cached is not None:
+            return cached
+        normalized, name = normalize_query(query)
+        fingerprint = sha256(normalized.encode()).hexdigest()[:16]
+        key = OperationKey(trace.operation_name or name or "anonymous", fingerprint)
+        self.queries.set((query, trace.operation_name), (normalized, key))
+        return normalized, key
+
+    def record(self, trace: Trace) -> None:
+        fields = self.fields
+        for timing in trace.resolvers:
+            info = timing.info
+            field_key = info.parent_type.name, info.field_name
+            histogram = fields.get(field_key)
+            if histogram is None:
+                histogram = fields[field_key] = Histogram(self.buckets)
+            histogram.observe(timing.duration / 1e9)
+            if timing.failed:
+                self.field_errors[field_key] = self.field_errors.get(field_key, 0) + 1
+
+        normalized, key = self.operation(trace)
+        histogram = self.operations.get(key)
+        if histogram is None and len(self.operations) >= self.max_operations:
+            histogram = self.operations.get(OTHER_OPERATION)
+            key = OTHER_OPERATION
+        if histogram is None:
+            histogram = self.operations[key] = Histogram(self.buckets)
+        duration = trace.duration / 1e9
+        histogram.observe(duration)
+        if trace.errors:
+            self.operation_errors[key] = self.operation_errors.get(key, 0) + 1
+        if self.slow_threshold is not None and duration >= self.slow_threshold:
+            self.log_slow(trace, normalized, key, duration)
+
+    def log_slow(
+        self, trace: Trace, normalized: str, key: OperationKey, duration: float
+    ) -> None:
+        calls: Dict[str, int] = {}
+        totals: Dict[str, float] = {}
+        for timing in trace.resolvers:
+            name = f"{timing.parent_type}.{timing.field_name}"
+            calls[name] = calls.get(name, 0) + 1
+            totals[name] = totals.get(name, 0.0) + timing.duration / 1e9
+        fields = [
+            {"field": name, "calls": calls[name], "duration": totals[name]}
+            for name in sorted(totals, key=totals.__getitem__, reverse=True)
+        ]
+        entry = {
+            "operation": key.name,
+            "fingerprint": key.fingerprint,
+            "duration": duration,
+            "query": normalized,
+            "variables": variables_shape(trace.variables or {}),
+            "errors": len(trace.errors or ()),
+            "fields": fields,
+        }
+        self.slow.append(entry)
+        logger.warning(
+            "Slow operation %s (%s) took %.3fs",
+            key.name,
+            key.fingerprint,
+            duration,
+            extra={"operation": entry},
+        )
+
+    def export(self) -> str:
+        """The metrics in the Prometheus text exposition format"""
+        lines: List[str] = []
+        self.export_histograms(
+            lines,
+            "field_duration_seconds",
+            "Resolver duration by parent type and field",
+            ("type", "field"),
+            self.fields,
+        )
+        self.export_counters(
+            lines,
+            "field_errors_total",
+            "Failed resolver calls by parent type and field",
+            ("type", "field"),
+            self.field_errors,
+        )
+        self.export_histograms(
+            lines,
+            "operation_duration_seconds",
+            "Operation duration by name and fingerprint",
+            OperationKey._fields,
+            self.operations,
+        )
+        self.export_counters(
+            lines,
+            "operation_errors_total",
+            "Operations returning errors by name and fingerprint",
+            OperationKey._fields,
+            self.operation_errors,
+        )
+        return "\n".join(lines) + "\n"
+
+    def export_histograms(
+        self,
+        lines: List[str],
+        name: str,
+        description: str,
+        label_names: Tuple[str, ...],
+        histograms: Dict[Any, Histogram],
+    ) -> None:
+        metric = f"{self.namespace}_{name}"
+        lines.append(f"# HELP {metric} {description}")
+        lines.append(f"# TYPE {metric} histogram")
+        for key, histogram in histograms.items():
+            labels = format_labels(dict(zip(label_names, key)))
+            for bound, count in histogram.cumulative():
+                lines.append(f'{metric}_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f"{metric}_sum{{{labels}}} {histogram.sum}")
+            lines.append(f"{metric}_count{{{labels}}} {histogram.count}")
+
+    def export_counters(
+        self,
+        lines: List[str],
+        name: str,
+        description: str,
+        label_names: Tuple[str, ...],
+        counters: Dict[Any, int],
+    ) -> None:
+        metric = f"{self.namespace}_{name}"
+        lines.append(f"# HELP {metric} {description}")
+        lines.append(f"# TYPE {metric} counter")
+        for key, count in counters.items():
+            labels = format_labels(dict(zip(label_names, key)))
+            lines.append(f"{metric}{{{labels}}} {count}")
@@ -0,0 +1,196 @@
+import base64
+import binascii
+import json
+from abc import ABCMeta, abstractmethod
+from bisect import bisect_left, bisect_right
+from typing import (
+    AbstractSet,
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+from graphql import GraphQLError
+
+__all__ = (
+    "InvalidPagination",
+    "KeysetSource",
+    "SequenceSource",
+    "decode_cursor",
+    "encode_cursor",
+    "paginate",
+)
+
+T = TypeVar("T")
+Key = Tuple[Any, ...]
+
+
+class InvalidPagination(GraphQLError):
+    def __init__(self, message: str):
+        super().__init__(message, extensions={"code": "INVALID_PAGINATION"})
+
+
+class KeysetSource(Generic[T], metaclass=ABCMeta):
+    """Rows ordered by a unique sort key, fetched by key range
+
+    With a database, `fetch` is a query such as
+    `WHERE (created, id) > :after ORDER BY created, id LIMIT :limit`,
+    served by an index on the sort key whatever the position of the page.
+    """
+
+    @abstractmethod
+    def key(self, item: T) -> Key:
+        """The sort key of `item`, a tuple of JSON values unique to the row"""
+
+    @abstractmethod
+    async def fetch(
+        self,
+        after: Optional[Key],
+        before: Optional[Key],
+        limit: Optional[int],
+        reverse: bool,
+    ) -> Sequence[T]:
+        """At most `limit` rows with keys between `after` and `before`, excluded
+
+        Rows are in ascending key order, or descending from `before` when
+        `reverse` is true. Keys that can not be compared to the sort keys
+        raise `InvalidPagination`.
+        """
+
+
+class SequenceSource(KeysetSource[T]):
+    """Keyset pagination over rows held in memory"""
+
+    def __init__(self, items: Iterable[T], key: Callable[[T], Key]):
+        self.sort_key = key
+        self.items = sorted(items, key=key)
+        self.keys = [key(item) for item in self.items]
+
+    def key(self, item: T) -> Key:
+        return self.sort_key(item)
+
+    async def fetch(
+        self,
+        after: Optional[Key],
+        before: Optional[Key],
+        limit: Optional[int],
+        reverse: bool,
+    ) -> Sequence[T]:
+        try:
+            start = 0 if after is None else bisect_right(self.keys, after)
+            end = len(self.keys) if before is None else bisect_left(self.keys, before)
+        except TypeError:  # a key of other types than the sort keys
+            raise InvalidPagination("Invalid cursor")
+        if limit is not None and reverse:
+            start = max(start, end - limit)
+        elif limit is not None:
+            end = min(end, start + limit)
+        items = self.items[start:end]
+        return items[::-1] if reverse else items
+
+
+def encode_cursor(key: Key) -> str:
+    """An opaque cursor holding the sort key `key`"""
+    data = json.dumps(list(key), separators=(",", ":"))
+    return base64.urlsafe_b64encode(data.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Key:
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, binascii.Error):
+        raise InvalidPagination(f"Invalid cursor {cursor!r}")
+    if not isinstance(key, list):
+        raise InvalidPagination(f"Invalid cursor {cursor!r}")
+    return tuple(key)
+
+
+def page_size(
+    name: str, value: Optional[int], max_page_size: Optional[int]
+) -> Optional[int]:
+    if value is not None and value < 0:
+        raise InvalidPagination(f"`{name}` must be a non-negative integer")
+    if max_page_size is None:
+        return value
+    return max_page_size if value is None else min(value, max_page_size)
+
+
+async def follows(source: KeysetSource[T], key: Optional[Key]) -> bool:
+    """Whether `source` has rows after `key`, or any row when `key` is `None`"""
+    return bool(await source.fetch(key, None, 1, False))
+
+
+async def paginate(
+    source: KeysetSource[T],
+    first: Optional[int] = None,
+    last: Optional[int] = None,
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    max_page_size: Optional[int] = None,
+    fields: Optional[AbstractSet[str]] = None,
+) -> Dict[str, Any]:
+    """The relay connection of a page of `source`, with its edges and page info
+
+    Only one row more than the page is fetched, to tell whether there is a
+    next page, or a previous one when paginating backwards with `last`.
+    With `before`, one more row is fetched past the page when needed to tell
+    whether there is a next page. With `after`, a previous page is assumed.
+    When both `first` and `last` are given, the last rows of the first page
+    are returned. `max_page_size` caps the page, and applies when neither
+    `first` nor `last` is given. No row is fetched when the selected
+    connection `fields` include neither `edges` nor `page_info`.
+    The cursors of an empty page, such as one past the last row, are `None`.
+    """
+    after_key = None if after is None else decode_cursor(after)
+    before_key = None if before is None else decode_cursor(before)
+    items: List[T]
+    if fields is not None and not fields & {"edges", "page_info"}:
+        return {"edges": [], "page_info": None}
+    if last is not None and first is None:
+        limit = page_size("last", last, max_page_size)
+        rows = await source.fetch(
+            after_key, before_key, None if limit is None else limit + 1, True
+        )
+        has_previous = limit is not None and len(rows) > limit
+        items = list(rows[:limit])
+        items.reverse()
+        has_next = before_key is not None and await follows(
+            source, source.key(items[-1]) if items else after_key
+        )
+    else:
+        limit = page_size("first", first, max_page_size)
+        rows = await source.fetch(
+            after_key, before_key, None if limit is None else limit + 1, False
+        )
+        has_next = limit is not None and len(rows) > limit
+        items = list(rows[:limit])
+        if before_key is not None and not has_next:
+            has_next = await follows(
+                source, source.key(items[-1]) if items else after_key
+            )
+        has_previous = after_key is not None
+        count = page_size("last", last, None)
+        if count is not None and len(items) > count:
+            start = len(items) - count
+            items = items[start:]
+            has_previous = True
+
+    edges = [
+        {"node": item, "cursor": encode_cursor(source.key(item))} for item in items
+    ]
+    return {
+        "edges": edges,
+        "page_info": {
+            "start_cursor": edges[0]["cursor"] if edges else None,
+            "end_cursor": edges[-1]["cursor"] if edges else None,
+            "has_next_page": has_next,
+            "has_previous_page": has_previous,
+        },
+    }
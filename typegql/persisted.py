@@ -0,0 +1,116 @@
+import asyncio
+import hashlib
+import os
+import re
+import tempfile
+from abc import ABCMeta, abstractmethod
+from typing import Optional
+
+from graphql import GraphQLError
+
+from .cache import LRUCache
+
+__all__ = (
+    "FileQueryStore",
+    "MemoryQueryStore",
+    "PersistedQueryMismatch",
+    "PersistedQueryNotFound",
+    "QueryStore",
+    "query_hash",
+)
+
+HASH_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+def query_hash(query: str) -> str:
+    return hashlib.sha256(query.encode()).hexdigest()
+
+
+class PersistedQueryNotFound(GraphQLError):
+    def __init__(self):
+        super().__init__(
+            "PersistedQueryNotFound", extensions={"code": "PERSISTED_QUERY_NOT_FOUND"},
+        )
+
+
+class PersistedQueryMismatch(GraphQLError):
+    def __init__(self):
+        super().__init__(
+            "provided sha does not match query",
+            extensions={"code": "PERSISTED_QUERY_HASH_MISMATCH"},
+        )
+
+
+class QueryStore(metaclass=ABCMeta):
+    """Maps SHA-256 hashes to the text of registered queries"""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        pass
+
+    @abstractmethod
+    def set(self, key: str, query: str) -> None:
+        pass
+
+    async def register(self, key: str, query: str) -> None:
+        """`set` from a coroutine. Stores doing blocking I/O override it to run off the loop"""
+        self.set(key, query)
+
+
+class MemoryQueryStore(QueryStore):
+    def __init__(self, maxsize: Optional[int] = 1024):
+        self.queries: LRUCache[str] = LRUCache(maxsize)
+
+    def get(self, key: str) -> Optional[str]:
+        return self.queries.get(key)
+
+    def set(self, key: str, query: str) -> None:
+        self.queries.set(key, query)
+
+
+class FileQueryStore(MemoryQueryStore):
+    """Keeps registered queries in `directory`, one `<hash>.graphql` file each"""
+
+    def __init__(self, directory: str, maxsize: Optional[int] = 1024):
+        super().__init__(maxsize)
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.graphql")
+
+    def get(self, key: str) -> Optional[str]:
+        query = super().get(key)
+        if query is not None or not HASH_PATTERN.match(key):
+            return query
+        try:
+            with open(self.path(key), encoding="utf-8") as f:
+                query = f.read()
+        except FileNotFoundError:
+            return None
+        super().set(key, query)
+        return query
+
+    def set(self, key: str, query: str) -> None:
+        if not HASH_PATTERN.match(key):
+            raise ValueError(f"Invalid query hash {key!r}")
+        super().set(key, query)
+        self.write(key, query)
+
+    async def register(self, key: str, query: str) -> None:
+        if not HASH_PATTERN.match(key):
+            raise ValueError(f"Invalid query hash {key!r}")
+        super().set(key, query)
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, self.write, key, query)
+
+    def write(self, key: str, query: str) -> None:
+        """Write the file of `query` atomically"""
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(query)
+            os.replace(tmp, self.path(key))
+        except BaseException:
+            os.unlink(tmp)
+            raise
@@ -1,21 +1,41 @@
-import inspect
+import asyncio
 import logging
-from dataclasses import is_dataclass
-from inspect import isawaitable, isclass
-from typing import Any, Callable, Dict, Optional, Type
+from functools import partial
+from inspect import isawaitable
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Type,
+    Union,
+    cast,
+)
 
 from graphql import (
+    DocumentNode,
+    ExecutionResult,
+    GraphQLDirective,
+    GraphQLError,
     GraphQLObjectType,
     GraphQLResolveInfo,
     GraphQLSchema,
-    OperationType,
-    graphql,
+    create_source_event_stream,
+    execute,
+    is_object_type,
     parse,
+    specified_directives,
+    validate,
+    validate_schema,
 )
-from graphql import subscribe as gql_subscribe
-from graphql import validate_schema
 from graphql.execution import ExecutionContext, Middleware
-from graphql.pyutils import camel_to_snake
+from graphql.subscription.map_async_iterator import MapAsyncIterator
 
 from .builder import (
     Builder,
@@ -25,14 +45,45 @@ from .builder import (
     GraphQLObjectTypeMap,
     GraphQLScalarMap,
 )
-from .builder.utils import is_connection
-from .execution import TGQLExecutionContext
+from .builder.resolvers import resolve_field
+from .cache import LRUCache
+from .compiler import CompiledQuery
+from .cost import CostAnalyzer
+from .execution import (
+    MAX_BUFFERED_ITEMS,
+    TGQLExecutionContext,
+    TGQLExecutionResult,
+    with_resolver,
+)
+from .executors import Executors
+from .incremental import (
+    GraphQLDeferDirective,
+    GraphQLStreamDirective,
+    IncrementalExecutionContext,
+    IncrementalResult,
+    uses_incremental,
+)
+from .persisted import (
+    MemoryQueryStore,
+    PersistedQueryMismatch,
+    PersistedQueryNotFound,
+    QueryStore,
+    query_hash,
+)
 from .pubsub import pubsub
+from .snapshot import PathLike, load_snapshot, save_snapshot
+from .tracing import Trace, Tracer, execute_traced
 
 logger = logging.getLogger(__name__)
 ResolverType = Callable[[Any, GraphQLResolveInfo, Dict[str, Any]], Any]
 
 
+class ParsedDocument(NamedTuple):
+    document: Optional[DocumentNode]
+    errors: Optional[List[GraphQLError]]
+    incremental: bool = False
+
+
 class Schema(GraphQLSchema):
     def __init__(
         self,
@@ -45,9 +96,26 @@ class Schema(GraphQLSchema):
         query_types: Optional[GraphQLObjectTypeMap] = None,
         mutation_types: Optional[GraphQLInputObjectTypeMap] = None,
         camelcase=True,
+        document_cache_size: Optional[int] = 512,
+        query_store: Optional[QueryStore] = None,
+        max_depth: Optional[int] = None,
+        max_cost: Optional[int] = None,
+        executor: Optional[str] = None,
+        executors: Optional[Executors] = None,
+        tracer: Optional[Tracer] = None,
+        snapshot: Optional[PathLike] = None,
+        max_buffered_items: int = MAX_BUFFERED_ITEMS,
     ):
         super().__init__()
+        if max_buffered_items < 1:
+            raise ValueError("max_buffered_items must be a positive integer")
         self.camelcase = camelcase
+        self.documents: LRUCache[ParsedDocument] = LRUCache(document_cache_size)
+        self.query_store = query_store or MemoryQueryStore()
+        self.executors = executors or Executors()
+        self.tracer = tracer
+        # Items of async iterable lists completed concurrently
+        self.max_buffered_items = max_buffered_items
         builder = Builder(
             self.camelcase,
             scalars=scalars,
@@ -55,68 +123,122 @@ class Schema(GraphQLSchema):
             interfaces=interfaces,
             query_types=query_types,
             mutation_types=mutation_types,
+            executor=executor,
         )
-        query_gql, mutation_gql, subscription_gql = None, None, None
         if query:
             self.query = query
-            fields = builder.query_fields(query)
+        if mutation:
+            self.mutation = mutation
+        if subscription:
+            self.subscription = subscription
+        directives = [
+            *specified_directives,
+            GraphQLDeferDirective,
+            GraphQLStreamDirective,
+        ]
+        options = {
+            "roots": [query, mutation, subscription],
+            "camelcase": camelcase,
+            "executor": executor,
+            "scalars": sorted(builder.scalars),
+            "enums": sorted(builder.enums),
+            "interfaces": sorted(builder.interfaces),
+        }
+        restored = None
+        if snapshot is not None:
+            restored = load_snapshot(snapshot, builder, options, interfaces)
+        self.from_snapshot = restored is not None
+        if restored is not None:
+            super().__init__(
+                restored.query,
+                restored.mutation,
+                restored.subscription,
+                types=restored.types,
+                directives=directives,
+                assume_valid=True,
+            )
+            self.names = restored.names
+            self.sources = restored.sources
+            pools = restored.pools
+        else:
+            self.build(builder, query, mutation, subscription, directives)
+            self.names = builder.names
+            self.sources = builder.sources
+            self.names.freeze()
+            pools = builder.pools
+            if snapshot is not None:
+                try:
+                    save_snapshot(snapshot, self, builder, options)
+                except (OSError, TypeError) as error:
+                    logger.warning("Can not save the schema snapshot: %s", error)
+        # Fields and build time of every type built, empty when restored
+        self.build_stats = builder.stats
+        self.cost = CostAnalyzer(self, max_depth, max_cost, document_cache_size)
+        if "process" in pools:
+            self.executors.warm_up()
+
+    def build(
+        self,
+        builder: Builder,
+        query: Optional[Type],
+        mutation: Optional[Type],
+        subscription: Optional[Type],
+        directives: List[GraphQLDirective],
+    ) -> None:
+        """Build the types of the schema from its root classes"""
+        query_gql, mutation_gql, subscription_gql = None, None, None
+        roots = {"Query": query, "Mutation": mutation, "subscription": subscription}
+        builder.sources.update(
+            (name, root) for name, root in roots.items() if root is not None
+        )
+        if query:
+            fields = builder.timed(
+                "Query", partial(builder.query_fields, query, "Query")
+            )
             query_gql = GraphQLObjectType("Query", fields=fields,)
 
         if mutation:
-            self.mutation = mutation
-            mutation_fields = builder.query_fields(mutation)
+            mutation_fields = builder.timed(
+                "Mutation", partial(builder.query_fields, mutation, "Mutation")
+            )
             mutation_gql = GraphQLObjectType("Mutation", fields=mutation_fields)
 
         if subscription:
-            self.subscription = subscription
-            subscription_fields = builder.query_fields(subscription)
+            subscription_fields = builder.timed(
+                "subscription",
+                partial(builder.query_fields, subscription, "subscription"),
+            )
             subscription_gql = GraphQLObjectType(
                 "subscription", fields=subscription_fields
             )
 
-        super().__init__(query_gql, mutation_gql, subscription_gql)
+        super().__init__(
+            query_gql, mutation_gql, subscription_gql, directives=directives
+        )
         errors = validate_schema(self)
         if errors:
             raise errors[0]
 
+    def cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """Statistics of the global resolver caches, by `Type.field`"""
+        stats = {}
+        for graphql_type in self.type_map.values():
+            if not is_object_type(graphql_type):
+                continue
+            for name, field in cast(GraphQLObjectType, graphql_type).fields.items():
+                cache = getattr(field.resolve, "cache", None)
+                if cache is not None:
+                    stats[f"{graphql_type.name}.{name}"] = cache.stats()
+        return stats
+
     def get_field_name(self, info: GraphQLResolveInfo):
         field_name = info.field_name
         if self.camelcase:
-            field_name = camel_to_snake(field_name)
+            field_name = self.names.fields.to_python(info.parent_type.name, field_name)
         return field_name
 
     def _field_resolver(self, source: Any, info: GraphQLResolveInfo, **kwargs):
-        field_name = self.get_field_name(info)
-
-        if info.operation.operation == OperationType.MUTATION and isclass(
-            source.__class__
-        ):
-            mutation = getattr(source, f"mutate_{field_name}", None)
-            if mutation:
-                return mutation(info, **kwargs)
-
-        if is_dataclass(source.__class__):
-            field = source.__dataclass_fields__.get(field_name)
-
-            if is_connection(field.type):
-                func = getattr(field.type, "resolve", None)
-                if func and inspect.ismethod(func):
-                    return func(
-                        source, field_name, field.type.__args__[0], info, **kwargs
-                    )
-                else:
-                    logger.error(f"Expected {func} to be a method. Ignoring")
-
-        value = (
-            source.get(field_name)
-            if isinstance(source, dict)
-            else getattr(
-                source, f"resolve_{field_name}", getattr(source, field_name, None)
-            )
-        )
-        if callable(value):
-            return value(info, **kwargs)
-        return value
+        return resolve_field(source, info, self.get_field_name(info), kwargs)
 
     async def _subscription_field_resolver(
         self, source: Any, info: GraphQLResolveInfo, **kwargs
@@ -135,7 +257,7 @@ class Schema(GraphQLSchema):
 
     async def run(
         self,
-        query: str,
+        query: Optional[str] = None,
         root: Any = None,
         resolver: ResolverType = None,
         operation: str = None,
@@ -143,24 +265,235 @@ class Schema(GraphQLSchema):
         variables: Dict[str, Any] = None,
         middleware: Middleware = None,
         execution_context_class: Type[ExecutionContext] = TGQLExecutionContext,
+        query_hash: Optional[str] = None,
     ):
+        register = bool(query_hash and query)
+        try:
+            if query_hash:
+                query = self.persisted_query(query_hash, query)
+            elif query is None:
+                raise GraphQLError("Must provide a query or its hash")
+        except GraphQLError as error:
+            return ExecutionResult(data=None, errors=[error])
         query = query.strip()
         if query.startswith("mutation") and not root:
             root = self.mutation()
         elif not root:
             root = self.query()
-        result = await graphql(
+        trace = self.tracer.sample(query, operation, variables) if self.tracer else None
+        document, errors, incremental = self.parse_document(query, trace)
+        if errors or not document:
+            return self.traced(trace, ExecutionResult(data=None, errors=errors))
+        if register:
+            try:
+                await self.query_store.register(cast(str, query_hash), query)
+            except Exception as error:
+                logger.warning("Can not register the persisted query: %s", error)
+        cost = self.cost.analyze(query, document, operation, variables)
+        extensions = {"cost": cost._asdict()}
+        errors = self.cost.validate(cost)
+        if errors:
+            return self.traced(trace, TGQLExecutionResult(None, errors, extensions))
+        if context is None:
+            context = {}
+        if incremental:
+            if trace is not None:
+                cast(Tracer, self.tracer).finish(trace)
+            return self.run_incremental(
+                document,
+                root,
+                resolver,
+                operation,
+                context,
+                variables,
+                middleware,
+                extensions,
+            )
+        middleware = with_resolver(resolver, middleware)
+        if trace is not None:
+            trace.begin("execution")
+            result = execute_traced(
+                trace,
+                self,
+                document,
+                root,
+                context,
+                variables,
+                operation,
+                self._field_resolver,
+                middleware,
+                execution_context_class,
+            )
+        else:
+            result = execute(
+                self,
+                document,
+                root_value=root,
+                context_value=context,
+                variable_values=variables,
+                operation_name=operation,
+                field_resolver=self._field_resolver,
+                middleware=middleware,
+                execution_context_class=execution_context_class,
+            )
+        if isawaitable(result):
+            result = await cast(Awaitable[ExecutionResult], result)
+        data, errors = cast(ExecutionResult, result)
+        return self.traced(trace, TGQLExecutionResult(data, errors, extensions))
+
+    def traced(
+        self, trace: Optional[Trace], result: ExecutionResult
+    ) -> ExecutionResult:
+        """Finish `trace`, adding it to the extensions of `result`"""
+        if trace is None:
+            return result
+        tracing = cast(Tracer, self.tracer).finish(trace, result.errors)
+        if tracing is None:
+            return result
+        extensions = dict(getattr(result, "extensions", None) or {}, tracing=tracing)
+        return TGQLExecutionResult(result.data, result.errors, extensions)
+
+    def run_incremental(
+        self,
+        document: DocumentNode,
+        root: Any,
+        resolver: Optional[ResolverType],
+        operation: Optional[str],
+        context: Any,
+        variables: Optional[Dict[str, Any]],
+        middleware: Optional[Middleware],
+        extensions: Optional[Dict[str, Any]] = None,
+    ) -> Union[ExecutionResult, AsyncIterator[IncrementalResult]]:
+        """Execute a document using `@defer` or `@stream`
+
+        Returns an async iterator of `IncrementalResult` payloads, the first one
+        holding the initial data, or an `ExecutionResult` if the operation can
+        not be executed.
+        """
+        context = IncrementalExecutionContext.build(
+            self,
+            document,
+            root,
+            context,
+            variables,
+            operation,
+            self._field_resolver,
+            middleware=with_resolver(resolver, middleware),
+        )
+        if isinstance(context, list):
+            return ExecutionResult(data=None, errors=context)
+        data = context.execute_operation(context.operation, root)
+        return context.payloads(data, extensions)
+
+    async def run_batch(
+        self,
+        operations: Sequence[Mapping[str, Any]],
+        root: Any = None,
+        resolver: ResolverType = None,
+        context: Any = None,
+        middleware: Middleware = None,
+        max_concurrency: Optional[int] = 10,
+    ) -> List[ExecutionResult]:
+        """Run a batch of operations sharing one context, returning results in order
+
+        Operations are dicts with a `query`, `variables` and `operationName`,
+        and an optional `extensions.persistedQuery.sha256Hash`, as sent in
+        batched HTTP requests. Data loaders and request scoped caches are shared
+        by the whole batch, of which at most `max_concurrency` run at once.
+        """
+        if context is None:
+            context = {}
+        semaphore = asyncio.Semaphore(max_concurrency or len(operations) or 1)
+
+        async def run(operation: Mapping[str, Any]) -> ExecutionResult:
+            extensions = operation.get("extensions") or {}
+            persisted = extensions.get("persistedQuery") or {}
+            async with semaphore:
+                return await self.run(
+                    operation.get("query"),
+                    root=root,
+                    resolver=resolver,
+                    operation=operation.get("operationName"),
+                    context=context,
+                    variables=operation.get("variables"),
+                    middleware=middleware,
+                    query_hash=persisted.get("sha256Hash"),
+                )
+
+        return list(await asyncio.gather(*[run(op) for op in operations]))
+
+    def compile(
+        self,
+        query: str,
+        operation_name: Optional[str] = None,
+        resolver: ResolverType = None,
+    ) -> CompiledQuery:
+        """Compile a query for repeated execution
+
+        The returned coroutine function accepts `root`, `context` and `variables`
+        and yields the same `ExecutionResult` as `Schema.run` does. `@defer` and
+        `@stream` are ignored, their selections are part of the result.
+        """
+        document, errors, _ = self.parse_document(query.strip())
+        if errors or not document:
+            raise cast(List[GraphQLError], errors)[0]
+        operation = CompiledQuery(
             self,
-            query,
-            root_value=root,
-            field_resolver=resolver or self._field_resolver,
-            operation_name=operation,
-            context_value=context,
-            variable_values=variables,
-            middleware=middleware,
-            execution_context_class=execution_context_class,
+            document,
+            operation_name,
+            field_resolver=self._field_resolver,
+            cost=self.cost,
+            resolver=resolver,
+        )
+        operation.root_factory = (
+            self.mutation if operation.serial else self.query  # type: ignore
         )
-        return result
+        return operation
+
+    def persisted_query(self, key: str, query: Optional[str] = None) -> str:
+        """Look up a persisted query by its SHA-256 hash
+
+        When `query` is sent along with its hash, the pair is checked and
+        returned so it gets registered once it parses and validates.
+        """
+        if query is None:
+            query = self.query_store.get(key)
+            if query is None:
+                raise PersistedQueryNotFound()
+        elif query_hash(query) != key:
+            raise PersistedQueryMismatch()
+        return query
+
+    def parse_document(
+        self, query: str, trace: Optional[Trace] = None
+    ) -> ParsedDocument:
+        """Parse and validate `query`, reusing the result for known documents
+
+        A `trace` records the time spent parsing and validating, or looking up
+        the cached document.
+        """
+        if trace is not None:
+            trace.begin("parsing")
+        parsed = self.documents.get(query)
+        if parsed is not None:
+            if trace is not None:
+                trace.end_phase()
+            return parsed
+        try:
+            document = parse(query)
+        except GraphQLError as error:
+            parsed = ParsedDocument(None, [error])
+        else:
+            if trace is not None:
+                trace.begin("validation")
+            errors = validate(self, document)
+            parsed = ParsedDocument(
+                document, errors or None, not errors and uses_incremental(document)
+            )
+        self.documents.set(query, parsed)
+        if trace is not None:
+            trace.end_phase()
+        return parsed
 
     async def subscribe(
         self,
@@ -176,14 +509,31 @@ class Schema(GraphQLSchema):
             root = self.subscription()
 
         document = parse(query)
-        result = await gql_subscribe(
-            self,
-            document,
-            root,
-            context,
-            variables,
-            operation,
-            resolver or self._field_resolver,
-            subscription_resolver or self._subscription_field_resolver,
-        )
-        return result
+        subscribe_resolver = subscription_resolver or self._subscription_field_resolver
+        try:
+            stream = await create_source_event_stream(
+                self, document, root, context, variables, operation, subscribe_resolver,
+            )
+        except GraphQLError as error:
+            return ExecutionResult(data=None, errors=[error])
+        if isinstance(stream, ExecutionResult):
+            return stream
+        middleware = with_resolver(resolver, None)
+
+        async def respond(payload: Any) -> ExecutionResult:
+            result = execute(
+                self,
+                document,
+                payload,
+                context,
+                variables,
+                operation,
+                self._field_resolver,
+                middleware=middleware,
+                execution_context_class=TGQLExecutionContext,
+            )
+            if isawaitable(result):
+                result = await cast(Awaitable[ExecutionResult], result)
+            return cast(ExecutionResult, result)
+
+        return MapAsyncIterator(stream, respond)
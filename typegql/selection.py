@@ -0,0 +1,309 @@
+from dataclasses import fields as dataclass_fields
+from dataclasses import is_dataclass
+from functools import lru_cache
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Hashable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+from graphql import (
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    GraphQLIncludeDirective,
+    GraphQLNamedType,
+    GraphQLResolveInfo,
+    GraphQLSchema,
+    GraphQLSkipDirective,
+    InlineFragmentNode,
+    SelectionNode,
+    SelectionSetNode,
+    get_named_type,
+    is_abstract_type,
+    is_composite_type,
+    is_object_type,
+)
+from graphql.execution.values import get_directive_values
+from graphql.utilities import do_types_overlap
+
+from .builder.names import to_python
+from .compiler import directive_variables
+
+__all__ = ("Lazy", "Projection", "info_fields", "selected_fields")
+
+T = TypeVar("T")
+
+# The attribute of the first field node holding the selections computed below it
+CACHE_ATTRIBUTE = "typegql_selections"
+
+SelectedFields = Dict[str, List[Tuple[GraphQLNamedType, FieldNode]]]
+
+
+class Lazy:
+    """A field value computed only if the field is selected and resolved
+
+    `func` is called with `args` and `kwargs` when the field completes, and
+    may return an awaitable. Unlike a coroutine object, an unselected value
+    is simply dropped, so connections can return an expensive `total_count`
+    without running its query when clients do not ask for it.
+    """
+
+    __slots__ = ("func", "args", "kwargs")
+
+    def __init__(self, func: Callable[..., Any], *args: Any, **kwargs: Any):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+    def __call__(self, info: Optional[GraphQLResolveInfo] = None, **arguments: Any):
+        return self.func(*self.args, **self.kwargs)
+
+
+@lru_cache(maxsize=None)
+def attributes(source: Type[Any]) -> Mapping[str, str]:
+    """Dataclass attributes of `source` by the python name they are exposed as"""
+    if not is_dataclass(source):
+        return {}
+    return {
+        field.metadata.get("alias", field.name): field.name
+        for field in dataclass_fields(source)
+    }
+
+
+def included(node: SelectionNode, variables: Dict[str, Any]) -> bool:
+    if not node.directives:
+        return True
+    skip = get_directive_values(GraphQLSkipDirective, node, variables)
+    if skip is not None and skip["if"] is True:
+        return False
+    include = get_directive_values(GraphQLIncludeDirective, node, variables)
+    return include is None or include["if"] is not False
+
+
+def fragment_type(
+    schema: GraphQLSchema, fragment: Any, parent_type: GraphQLNamedType,
+) -> Optional[GraphQLNamedType]:
+    """The type selecting the fields of `fragment`, if it applies to `parent_type`"""
+    condition = fragment.type_condition
+    if condition is None:
+        return parent_type
+    condition_type = schema.get_type(condition.name.value)
+    if condition_type is None or condition_type is parent_type:
+        return condition_type
+    if is_object_type(parent_type):
+        if is_abstract_type(condition_type) and schema.is_sub_type(
+            condition_type, parent_type  # type: ignore
+        ):
+            return parent_type
+        return None
+    if do_types_overlap(schema, condition_type, parent_type):  # type: ignore
+        return condition_type
+    return None
+
+
+def collect_selection(
+    schema: GraphQLSchema,
+    parent_type: GraphQLNamedType,
+    selection_set: SelectionSetNode,
+    fragments: Mapping[str, FragmentDefinitionNode],
+    variables: Dict[str, Any],
+    fields: SelectedFields,
+    visited: Set[str],
+) -> SelectedFields:
+    """The field nodes of `selection_set` by dataclass attribute name
+
+    Fragments are merged and `@skip` / `@include` applied. Below an abstract
+    type, the fields of every possible type are collected, each with the type
+    defining it.
+    """
+    names = getattr(schema, "names", None)
+    source = getattr(schema, "sources", {}).get(parent_type.name)
+    aliases = attributes(source) if source is not None else {}
+    for selection in selection_set.selections:
+        if not included(selection, variables):
+            continue
+        if isinstance(selection, FieldNode):
+            name = selection.name.value
+            if name.startswith("__"):
+                continue
+            if names is not None:
+                name = names.fields.to_python(parent_type.name, name)
+            else:
+                name = to_python(name)
+            name = aliases.get(name, name)
+            fields.setdefault(name, []).append((parent_type, selection))
+            continue
+        fragment: Any = selection
+        if isinstance(selection, FragmentSpreadNode):
+            fragment_name = selection.name.value
+            if fragment_name in visited:
+                continue
+            visited.add(fragment_name)
+            fragment = fragments.get(fragment_name)
+            if fragment is None:
+                continue
+        elif not isinstance(selection, InlineFragmentNode):
+            continue
+        selecting = fragment_type(schema, fragment, parent_type)
+        if selecting is not None:
+            collect_selection(
+                schema,
+                selecting,
+                fragment.selection_set,
+                fragments,
+                variables,
+                fields,
+                visited,
+            )
+    return fields
+
+
+def merged_selection(
+    info: GraphQLResolveInfo, parent_type: GraphQLNamedType, field_nodes: List[Any],
+) -> SelectedFields:
+    """The fields selected below all of `field_nodes`, of type `parent_type`"""
+    fields: SelectedFields = {}
+    visited: Set[str] = set()
+    for node in field_nodes:
+        if node.selection_set is not None:
+            collect_selection(
+                info.schema,
+                parent_type,
+                node.selection_set,
+                info.fragments,
+                info.variable_values,
+                fields,
+                visited,
+            )
+    return fields
+
+
+def cached_selection(
+    info: GraphQLResolveInfo, kind: str, build: Callable[[GraphQLResolveInfo], T]
+) -> T:
+    """The value `build` computes from the selection of `info`, cached
+
+    Values are kept on the first field node, so they live as long as the
+    parsed document, and are keyed by the values of the variables `@skip`
+    and `@include` depend on.
+    """
+    nodes = info.field_nodes
+    cache: Dict[Hashable, Any] = vars(nodes[0]).setdefault(CACHE_ATTRIBUTE, {})
+    key = (kind, info.schema, get_named_type(info.return_type), *map(id, nodes[1:]))
+    entry: Optional[Tuple[Tuple[str, ...], Dict[Tuple[Any, ...], T]]] = cache.get(key)
+    if entry is None:
+        used: Set[str] = set()
+        for node in nodes:
+            directive_variables(node, used)
+        for fragment in info.fragments.values():
+            directive_variables(fragment, used)
+        values: Dict[Tuple[Any, ...], T] = {}
+        entry = cache[key] = (tuple(sorted(used)), values)
+    variables, values = entry
+    signature = tuple(info.variable_values.get(name) for name in variables)
+    try:
+        return values[signature]
+    except KeyError:
+        value = values[signature] = build(info)
+    except TypeError:  # unhashable variable values
+        value = build(info)
+    return value
+
+
+def selected_fields(info: GraphQLResolveInfo) -> FrozenSet[str]:
+    """Dataclass attributes of the fields selected below the resolved field
+
+    A connection resolver can skip counting rows when `total_count` is not
+    selected, or fetching them when neither `edges` nor `page_info` is.
+    The result is cached with the parsed query, computing it is nearly free.
+    """
+    return cached_selection(info, "fields", build_selected_fields)
+
+
+def build_selected_fields(info: GraphQLResolveInfo) -> FrozenSet[str]:
+    return frozenset(
+        merged_selection(info, get_named_type(info.return_type), info.field_nodes)
+    )
+
+
+class Projection(Mapping[str, "Projection"]):
+    """The selection below a field, as a tree of dataclass attribute names
+
+    Every selected field maps to the projection of its own selection, empty
+    for scalars, so `"author" in projection` tells a resolver to join the
+    authors and `projection["author"].keys()` which of their columns to read.
+    """
+
+    __slots__ = ("fields",)
+
+    def __init__(self, fields: Optional[Dict[str, "Projection"]] = None):
+        self.fields = fields or {}
+
+    def __getitem__(self, name: str) -> "Projection":
+        return self.fields[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.fields)
+
+    def __len__(self) -> int:
+        return len(self.fields)
+
+    def __repr__(self) -> str:
+        return f"Projection({self.fields!r})"
+
+    def paths(self) -> Iterator[Tuple[str, ...]]:
+        """The path of every selected leaf field, such as `("author", "name")`"""
+        for name, projection in self.fields.items():
+            if not projection:
+                yield (name,)
+            for path in projection.paths():
+                yield (name, *path)
+
+
+def project(
+    info: GraphQLResolveInfo, selections: List[Tuple[GraphQLNamedType, FieldNode]]
+) -> Projection:
+    """The projection of the merged selection of fields, with their parent type"""
+    fields: SelectedFields = {}
+    visited: Set[str] = set()
+    for parent_type, node in selections:
+        field = getattr(parent_type, "fields", {}).get(node.name.value)
+        if field is None or node.selection_set is None:
+            continue
+        field_type = get_named_type(field.type)
+        if is_composite_type(field_type):
+            collect_selection(
+                info.schema,
+                field_type,
+                node.selection_set,
+                info.fragments,
+                info.variable_values,
+                fields,
+                visited,
+            )
+    return Projection({name: project(info, nodes) for name, nodes in fields.items()})
+
+
+def build_projection(info: GraphQLResolveInfo) -> Projection:
+    return project(info, [(info.parent_type, node) for node in info.field_nodes])
+
+
+def info_fields(info: GraphQLResolveInfo) -> Projection:
+    """The projection of the selection below the field being resolved
+
+    Fragments are merged, `@skip` / `@include` applied and GraphQL names,
+    camel cased or aliased, mapped back to dataclass attributes. Like
+    `selected_fields`, it is cached on the parsed query.
+    """
+    return cached_selection(info, "projection", build_projection)
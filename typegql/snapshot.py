@@ -0,0 +1,355 @@
+import importlib
+import inspect
+import json
+import logging
+import os
+from enum import Enum
+from hashlib import sha256
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Set,
+    Type,
+    Union,
+    cast,
+    get_type_hints,
+)
+
+from graphql import (
+    GraphQLEnumType,
+    GraphQLInputObjectType,
+    GraphQLInterfaceType,
+    GraphQLList,
+    GraphQLNamedType,
+    GraphQLNonNull,
+    GraphQLObjectType,
+    GraphQLSchema,
+    GraphQLType,
+    build_ast_schema,
+    is_introspection_type,
+    parse,
+    print_schema,
+)
+
+from .builder import Builder
+from .builder.base import GraphQLInterfaceMap, input_loader
+from .builder.names import NameMap, NameScope
+from .builder.resolvers import build_resolver
+from .builder.types import EnumType
+from .builder.utils import is_connection, is_optional
+
+__all__ = ("Snapshot", "fingerprint", "load_snapshot", "save_snapshot")
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+
+class Snapshot(NamedTuple):
+    """GraphQL types restored from a snapshot, bound to their python classes"""
+
+    query: Optional[GraphQLObjectType]
+    mutation: Optional[GraphQLObjectType]
+    subscription: Optional[GraphQLObjectType]
+    types: List[GraphQLNamedType]
+    names: NameMap
+    pools: Set[str]
+    sources: Dict[str, Type[Any]]
+
+
+def class_path(source: Type[Any]) -> str:
+    return f"{source.__module__}:{source.__qualname__}"
+
+
+def import_class(path: str) -> Type[Any]:
+    module_name, qualname = path.split(":")
+    value: Any = importlib.import_module(module_name)
+    for name in qualname.split("."):
+        value = getattr(value, name)
+    return value
+
+
+def describe(value: Any) -> Any:
+    """A JSON representation of `value`, stable across processes"""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, Enum):
+        return f"{type(value).__qualname__}.{value.name}"
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [describe(item) for item in value]
+        return sorted(items, key=repr) if isinstance(value, (set, frozenset)) else items
+    if isinstance(value, Mapping):
+        return sorted([str(key), describe(item)] for key, item in value.items())
+    if inspect.isclass(value) or inspect.isroutine(value):
+        module = getattr(value, "__module__", None)
+        return f"{module}.{getattr(value, '__qualname__', repr(value))}"
+    if getattr(value, "__module__", None) == "typing":
+        return repr(value)
+    attributes = getattr(value, "__dict__", None)
+    if attributes is not None:
+        return [type(value).__qualname__, describe(attributes)]
+    return type(value).__qualname__
+
+
+def describe_class(source: Type[Any]) -> Any:
+    description: Dict[str, Any] = {
+        "bases": [class_path(base) for base in source.__mro__[1:]],
+        "doc": source.__doc__,
+    }
+    if issubclass(source, Enum):
+        description["members"] = describe(
+            {name: member.value for name, member in source.__members__.items()}
+        )
+        return description
+    dataclass_fields = getattr(source, "__dataclass_fields__", {})
+    description["fields"] = [
+        [
+            field.name,
+            field.type if isinstance(field.type, str) else describe(field.type),
+            describe(field.metadata),
+            repr(field.default) if isinstance(field.default, (str, int)) else None,
+            type(field.default).__name__,
+            type(field.default_factory).__name__,  # type: ignore
+        ]
+        for field in dataclass_fields.values()
+    ]
+    description["methods"] = [
+        [name, type(inspect.getattr_static(source, name)).__name__]
+        for name in dir(source)
+        if name.startswith(("resolve_", "mutate_", "load"))
+    ]
+    return description
+
+
+def fingerprint(sources: Iterable[Type[Any]], options: Mapping[str, Any]) -> str:
+    """Hash of the definition of `sources` and the options of the schema"""
+    digest = sha256(json.dumps(describe(options)).encode())
+    for source in sorted(set(sources), key=class_path):
+        digest.update(class_path(source).encode())
+        digest.update(json.dumps(describe_class(source)).encode())
+    return digest.hexdigest()
+
+
+def dump_names(scope: NameScope) -> List[Any]:
+    return [
+        [list(key) if isinstance(key, tuple) else key, dict(names)]
+        for key, names in scope.python.items()
+    ]
+
+
+def load_names(scope: NameScope, data: List[Any]) -> None:
+    for key, names in data:
+        key = tuple(key) if isinstance(key, list) else key
+        for graphql_name, python_name in names.items():
+            scope.add(key, graphql_name, python_name)
+
+
+def snapshot_data(
+    schema: GraphQLSchema, builder: Builder, options: Mapping[str, Any]
+) -> Dict[str, Any]:
+    """The snapshot of a schema built by `builder`"""
+    fields: Dict[str, Dict[str, Any]] = {}
+    sources: Set[Type[Any]] = set(builder.sources.values())
+    for type_name, bindings in builder.bindings.items():
+        graphql_type = schema.type_map.get(type_name)
+        if not isinstance(graphql_type, GraphQLObjectType):
+            continue
+        type_fields = fields[type_name] = {}
+        for field_name, (source, build_type) in bindings.items():
+            field = build_type.field
+            sources.add(source)
+            type_fields[field_name] = {
+                "source": class_path(source),
+                "attribute": field.name,
+                "name": field.metadata.get("alias", field.name),
+                "connection": is_connection(build_type.source),
+                "extensions": graphql_type.fields[field_name].extensions,
+            }
+    for source in sources:
+        if "<locals>" in source.__qualname__:
+            raise TypeError(f"Can not snapshot the local class {source.__qualname__}")
+    return {
+        "version": SNAPSHOT_VERSION,
+        "fingerprint": fingerprint(sources, options),
+        "classes": sorted(class_path(source) for source in sources),
+        "sdl": print_schema(schema),
+        "fields": fields,
+        "sources": {
+            name: class_path(source) for name, source in builder.sources.items()
+        },
+        "names": {
+            "fields": dump_names(builder.names.fields),
+            "arguments": dump_names(builder.names.arguments),
+            "inputs": dump_names(builder.names.inputs),
+        },
+    }
+
+
+def save_snapshot(
+    path: PathLike, schema: GraphQLSchema, builder: Builder, options: Mapping[str, Any]
+) -> None:
+    """Write the snapshot of `schema` to `path`, replacing it atomically"""
+    data = snapshot_data(schema, builder, options)
+    path = Path(path)
+    temporary = path.with_name(f".{path.name}.{os.getpid()}")
+    output = temporary.open("w")
+    try:
+        with output:
+            json.dump(data, output, separators=(",", ":"))
+        os.replace(temporary, path)
+    except BaseException:
+        temporary.unlink()
+        raise
+
+
+def read_snapshot(path: PathLike, options: Mapping[str, Any]) -> Optional[Dict]:
+    """The snapshot at `path`, or `None` if missing or stale"""
+    try:
+        with open(path) as snapshot:
+            data = json.load(snapshot)
+    except FileNotFoundError:
+        return None
+    except ValueError:
+        logger.warning("Ignoring the invalid schema snapshot %s", path)
+        return None
+    if data.get("version") != SNAPSHOT_VERSION:
+        return None
+    try:
+        sources = [import_class(path) for path in data["classes"]]
+    except (ImportError, AttributeError):
+        return None
+    if fingerprint(sources, options) != data["fingerprint"]:
+        return None
+    return data
+
+
+def replace_types(
+    graphql_type: GraphQLType, replacements: Mapping[str, GraphQLNamedType]
+) -> Any:
+    if isinstance(graphql_type, GraphQLNonNull):
+        return GraphQLNonNull(replace_types(graphql_type.of_type, replacements))
+    if isinstance(graphql_type, GraphQLList):
+        return GraphQLList(replace_types(graphql_type.of_type, replacements))
+    name = cast(GraphQLNamedType, graphql_type).name
+    return replacements.get(name, graphql_type)
+
+
+def load_snapshot(
+    path: PathLike,
+    builder: Builder,
+    options: Mapping[str, Any],
+    interfaces: Optional[GraphQLInterfaceMap] = None,
+) -> Optional[Snapshot]:
+    """Restore the types of the snapshot at `path`, unless it is missing or stale
+
+    Scalars and enums are replaced with those of `builder`, resolvers and
+    input loaders are rebuilt from the python classes, without evaluating
+    their type hints. The restored types are not validated again.
+    """
+    data = read_snapshot(path, options)
+    if data is None:
+        return None
+    built = build_ast_schema(
+        parse(data["sdl"], no_location=True), assume_valid=True, assume_valid_sdl=True
+    )
+    names = NameMap()
+    load_names(names.fields, data["names"]["fields"])
+    load_names(names.arguments, data["names"]["arguments"])
+    load_names(names.inputs, data["names"]["inputs"])
+    names.freeze()
+
+    replacements: Dict[str, GraphQLNamedType] = {}
+    for scalar in builder.scalars.values():
+        if scalar.name in built.type_map:
+            replacements[scalar.name] = scalar
+    sources = {name: import_class(path) for name, path in data["sources"].items()}
+    for name, graphql_type in built.type_map.items():
+        if isinstance(graphql_type, GraphQLEnumType) and not is_introspection_type(
+            graphql_type
+        ):
+            replacements[name] = builder.enums.get(name) or EnumType(
+                name, sources[name]
+            )
+
+    pools: Set[str] = set()
+    types: List[GraphQLNamedType] = []
+    for name, graphql_type in built.type_map.items():
+        if is_introspection_type(graphql_type):
+            continue
+        if name in replacements:
+            types.append(replacements[name])
+            continue
+        types.append(graphql_type)
+        if isinstance(graphql_type, (GraphQLObjectType, GraphQLInterfaceType)):
+            for field in graphql_type.fields.values():
+                field.type = replace_types(field.type, replacements)
+                for argument in field.args.values():
+                    argument.type = replace_types(argument.type, replacements)
+        if isinstance(graphql_type, GraphQLInputObjectType):
+            for input_field in graphql_type.fields.values():
+                input_field.type = replace_types(input_field.type, replacements)
+            input_names = names.inputs.get(name) if builder.camelcase else None
+            loader = input_loader(sources[name], input_names)
+            if loader is not None:
+                graphql_type.out_type = loader  # type: ignore
+        if isinstance(graphql_type, GraphQLInterfaceType) and interfaces:
+            interface = interfaces.get(name)
+            if interface is not None:
+                graphql_type.resolve_type = interface.resolve_type
+        if isinstance(graphql_type, GraphQLObjectType):
+            pools.update(
+                bind_fields(graphql_type, data["fields"].get(name, {}), builder)
+            )
+    return Snapshot(
+        built.query_type,
+        built.mutation_type,
+        built.subscription_type,
+        types,
+        names,
+        pools,
+        sources,
+    )
+
+
+def bind_fields(
+    graphql_type: GraphQLObjectType, bindings: Dict[str, Any], builder: Builder
+) -> Set[str]:
+    """Rebuild the resolvers of `graphql_type`, returning the pools they use"""
+    pools = set()
+    hints: Dict[str, Dict[str, Any]] = {}
+    for field_name, binding in bindings.items():
+        field = graphql_type.fields[field_name]
+        source = import_class(binding["source"])
+        attribute = binding["attribute"]
+        dataclass_field = source.__dataclass_fields__[attribute]
+        field_type: Any = None
+        if binding["connection"]:
+            if binding["source"] not in hints:
+                hints[binding["source"]] = get_type_hints(source)
+            field_type = hints[binding["source"]].get(attribute, dataclass_field.type)
+            if is_optional(field_type):
+                field_type = field_type.__args__[0]
+        field.resolve = build_resolver(
+            source,
+            field_type,
+            attribute,
+            binding["name"],
+            dataclass_field.metadata,
+            builder.executor,
+        )
+        extensions = binding["extensions"]
+        if extensions and "multipliers" in extensions:
+            extensions["multipliers"] = tuple(extensions["multipliers"])
+        field.extensions = extensions
+        pool = getattr(field.resolve, "executor", None)
+        if pool is not None:
+            pools.add(pool)
+    return pools
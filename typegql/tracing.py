@@ -0,0 +1,276 @@
+from datetime import datetime, timezone
+from functools import lru_cache
+from inspect import isawaitable
+from random import random
+from time import perf_counter_ns, time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+    cast,
+)
+
+from graphql import (
+    DocumentNode,
+    ExecutionContext,
+    ExecutionResult,
+    FieldNode,
+    GraphQLError,
+    GraphQLField,
+    GraphQLFieldResolver,
+    GraphQLResolveInfo,
+    GraphQLSchema,
+)
+from graphql.execution import Middleware
+from graphql.pyutils import AwaitableOrValue
+
+__all__ = ("ResolverTiming", "Trace", "Tracer", "TracingExecutionContext")
+
+
+class ResolverTiming(NamedTuple):
+    """A resolver call, with offsets in nanoseconds from the start of its trace"""
+
+    info: GraphQLResolveInfo
+    start_offset: int
+    duration: int
+    failed: bool
+
+    @property
+    def path(self) -> List[Union[str, int]]:
+        return self.info.path.as_list()
+
+    @property
+    def parent_type(self) -> str:
+        return self.info.parent_type.name
+
+    @property
+    def field_name(self) -> str:
+        return self.info.field_name
+
+    @property
+    def return_type(self) -> str:
+        return str(self.info.return_type)
+
+    @property
+    def formatted(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "parentType": self.parent_type,
+            "fieldName": self.field_name,
+            "returnType": self.return_type,
+            "startOffset": self.start_offset,
+            "duration": self.duration,
+        }
+
+
+def iso_time(timestamp: float) -> str:
+    moment = datetime.fromtimestamp(timestamp, timezone.utc)
+    return moment.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+class Trace:
+    """Timings of the phases and resolvers of one operation
+
+    Times are kept in nanoseconds from `perf_counter_ns`, and offsets are relative
+    to the start of the trace. `formatted` is the Apollo tracing format.
+    """
+
+    def __init__(
+        self,
+        query: Optional[str] = None,
+        operation_name: Optional[str] = None,
+        variables: Optional[Dict[str, Any]] = None,
+    ):
+        self.query = query
+        self.operation_name = operation_name
+        self.variables = variables
+        self.start_time = time()
+        self.start = perf_counter_ns()
+        self.end: Optional[int] = None
+        self.phases: Dict[str, Tuple[int, int]] = {}
+        self.phase: Optional[str] = None
+        self.phase_start = 0
+        self.resolvers: List[ResolverTiming] = []
+        self.errors: Optional[List[GraphQLError]] = None
+
+    @property
+    def duration(self) -> int:
+        end = self.end if self.end is not None else perf_counter_ns()
+        return end - self.start
+
+    def begin(self, phase: str) -> None:
+        """Start timing `phase`, ending the current phase if any"""
+        now = perf_counter_ns()
+        self.end_phase(now)
+        self.phase, self.phase_start = phase, now
+
+    def end_phase(self, now: Optional[int] = None) -> None:
+        if self.phase is None:
+            return
+        if now is None:
+            now = perf_counter_ns()
+        self.phases[self.phase] = self.phase_start - self.start, now - self.phase_start
+        self.phase = None
+
+    def record(
+        self, info: GraphQLResolveInfo, start: int, end: int, failed: bool = False
+    ) -> None:
+        self.resolvers.append(
+            ResolverTiming(info, start - self.start, end - start, failed)
+        )
+
+    def stop(self, errors: Optional[List[GraphQLError]] = None) -> None:
+        now = perf_counter_ns()
+        self.end_phase(now)
+        self.end = now
+        self.errors = errors
+
+    def timing(self, phase: str) -> Dict[str, int]:
+        start_offset, duration = self.phases.get(phase, (0, 0))
+        return {"startOffset": start_offset, "duration": duration}
+
+    @property
+    def formatted(self) -> Dict[str, Any]:
+        duration = self.duration
+        execution: Dict[str, Any] = self.timing("execution")
+        execution["resolvers"] = [resolver.formatted for resolver in self.resolvers]
+        return {
+            "version": 1,
+            "startTime": iso_time(self.start_time),
+            "endTime": iso_time(self.start_time + duration / 1e9),
+            "duration": duration,
+            "parsing": self.timing("parsing"),
+            "validation": self.timing("validation"),
+            "execution": execution,
+        }
+
+
+class Tracer:
+    """Traces a sample of the operations run by a schema
+
+    `sample_rate` is the share of operations traced, the others only cost a call
+    to `random()`. Finished traces are attached to the response under
+    `extensions.tracing` when `extension` is true, and passed to `sink`, which
+    runs on the event loop and should be cheap, such as a metrics registry.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = 1.0,
+        sink: Optional[Callable[[Trace], Any]] = None,
+        extension: bool = True,
+    ):
+        self.sample_rate = sample_rate
+        self.sink = sink
+        self.extension = extension
+
+    def sample(
+        self,
+        query: Optional[str] = None,
+        operation_name: Optional[str] = None,
+        variables: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Trace]:
+        if self.sample_rate < 1.0 and random() >= self.sample_rate:
+            return None
+        return Trace(query, operation_name, variables)
+
+    def finish(
+        self, trace: Trace, errors: Optional[List[GraphQLError]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Stop `trace`, returning the extensions entry of the response if any"""
+        trace.stop(errors)
+        if self.sink is not None:
+            self.sink(trace)
+        return trace.formatted if self.extension else None
+
+
+class TracingExecutionContext(ExecutionContext):
+    """Records the timing of every resolver call in `trace`"""
+
+    trace: Trace
+
+    def resolve_field_value_or_error(
+        self,
+        field_def: GraphQLField,
+        field_nodes: List[FieldNode],
+        resolve_fn: GraphQLFieldResolver,
+        source: Any,
+        info: GraphQLResolveInfo,
+    ) -> Union[Exception, Any]:
+        trace = self.trace
+        start = perf_counter_ns()
+        result = super().resolve_field_value_or_error(
+            field_def, field_nodes, resolve_fn, source, info
+        )
+        if isawaitable(result):
+
+            async def await_result():
+                failed = True
+                try:
+                    value = await result
+                    failed = isinstance(value, Exception)
+                    return value
+                finally:
+                    trace.record(info, start, perf_counter_ns(), failed)
+
+            return await_result()
+        trace.record(info, start, perf_counter_ns(), isinstance(result, Exception))
+        return result
+
+
+@lru_cache(maxsize=None)
+def traced_context(
+    execution_context_class: Type[ExecutionContext],
+) -> Type[TracingExecutionContext]:
+    """`execution_context_class` recording the timing of resolvers"""
+    if issubclass(execution_context_class, TracingExecutionContext):
+        return execution_context_class
+    return type(
+        f"Tracing{execution_context_class.__name__}",
+        (TracingExecutionContext, execution_context_class),
+        {},
+    )
+
+
+def execute_traced(
+    trace: Trace,
+    schema: GraphQLSchema,
+    document: DocumentNode,
+    root_value: Any = None,
+    context_value: Any = None,
+    variable_values: Optional[Dict[str, Any]] = None,
+    operation_name: Optional[str] = None,
+    field_resolver: Optional[GraphQLFieldResolver] = None,
+    middleware: Optional[Middleware] = None,
+    execution_context_class: Type[ExecutionContext] = ExecutionContext,
+) -> AwaitableOrValue[ExecutionResult]:
+    """`graphql.execute`, recording resolver timings in `trace`"""
+    context = traced_context(execution_context_class).build(  # type: ignore
+        schema,
+        document,
+        root_value,
+        context_value,
+        variable_values,
+        operation_name,
+        field_resolver,
+        middleware=middleware,
+    )
+    if isinstance(context, list):
+        return ExecutionResult(data=None, errors=context)
+    context = cast(TracingExecutionContext, context)
+    context.trace = trace
+    data = context.execute_operation(context.operation, root_value)
+    if context.is_awaitable(data):
+        exe_context = context
+
+        async def await_data():
+            return exe_context.build_response(await data)
+
+        return await_data()
+    return context.build_response(data)